@@ -2,13 +2,13 @@ import json, math
 
 import OpenGL.GL as gl
 
+from robot.collision       import load_proxies
 from robot.common          import Bindings, Timer
 from robot.mech            import Serial, Simulation
 from robot.mech            import tool
 from spatial.euler         import Axes, Order
-from spatial               import Mesh, Transform, Quaternion, Vector3
+from spatial               import Transform, Quaternion, Vector3
 from robot.traj.linear_os  import LinearOS
-from robot.visual.filetypes.stl.stl_parser import STLParser
 from robot.visual.opengl.buffer            import Buffer
 from robot.visual.opengl.uniform_buffer    import Mapping, UniformBuffer
 
@@ -20,24 +20,36 @@ if __name__ == "__main__":
   with Timer('Initialize Window') as t:
     window = vis.Window(750, 750, "robotpy")
 
+  # Mesh files load in the background while everything else is set up, each is only waited on where it is first used
+  loader = vis.MeshLoader()
+  frame_meshes = loader.submit('./robot/visual/meshes/frame.stl')
+
+  with open('./robot/mech/robots/abb_irb_120.json') as json_file:
+    serial_dictionary = json.load(json_file)
+
+  # All levels of detail of the robot meshes share one buffer (the renderer picks a level per robot from its size on screen)
+  # Level 0 is the original mesh so the Links use it instead of reading the file a second time
+  serial_lods = loader.submit_lods(f'./robot/mech/robots/meshes/{serial_dictionary["mesh_file"]}')
+
+  welder = tool.load('./robot/mech/tools/welder.json', loader)
+
   with Timer('Load Robot and Construct Mesh') as t:
-    with open('./robot/mech/robots/abb_irb_120.json') as json_file:
-      serial_dictionary = json.load(json_file)
+    meshes = vis.lazy_meshes(lambda: [chain.levels[0] for chain in serial_lods.result()], len(serial_dictionary['links']))
 
-      if 'mesh_file' in serial_dictionary.keys():
-        meshes = Mesh.from_file(vis.STLParser(), f'./robot/mech/robots/meshes/{serial_dictionary["mesh_file"]}')
+    proxies = None
+    if 'proxy_file' in serial_dictionary.keys():
+      proxies = load_proxies(f'./robot/mech/robots/meshes/{serial_dictionary["proxy_file"]}')
 
-      serials = [Serial.from_dict_meshes(serial_dictionary, meshes or []) for _ in range(2)]
+    serials = [Serial.from_dict_meshes(serial_dictionary, meshes, proxies) for _ in range(2)]
 
   sim = Simulation()
   sim.entities.append(serials[0])
   sim.entities.append(serials[1])
 
-  serial_buffer = Buffer.from_meshes(meshes)
-
-  p = STLParser()
-  mesh = Mesh.from_file(p, './robot/visual/meshes/frame.stl')
-  frame_buffer = Buffer.from_meshes(mesh)
+  serial_buffer = Buffer.from_mesh_lods(serial_lods.result())
+  frame_buffer  = Buffer.from_meshes(frame_meshes.result())
+  tool_buffer   = Buffer.from_meshes_indexed([welder.mesh])
+  loader.close()
 
   triangle_buffer = Buffer.from_points([
     Vector3( 0.5, -0.33, 0),
@@ -54,18 +66,19 @@ if __name__ == "__main__":
     Vector3( 0.5,  0.5,  0,)
   ])
 
-  welder = tool.load('./robot/mech/tools/welder.json')
-  tool_buffer = Buffer.from_mesh(welder.mesh)
-
   camera = vis.Camera(Vector3(0, -1250, 375), Vector3(0, 0, 350), Vector3(0, 0, 1))
   light = vis.AmbientLight(Vector3(0, -750, 350), Vector3(1, 1, 1), 0.3)
   renderer = vis.Renderer(camera, light)
 
+  # All robots share the buffer and draw in one instanced call
   renderer.register_entity_type(
-    name         = 'serial',
-    buffer       = serial_buffer,
-    per_instance = pif.serial,
-    add_children = pif.serial_add_children
+    name           = 'serial',
+    shader_name    = 'serial_instanced',
+    buffer         = serial_buffer,
+    per_instance   = pif.serial,
+    add_children   = pif.serial_add_children,
+    pack_instances = pif.serial_instances,
+    cull           = True
   )
 
   renderer.register_entity_type(
@@ -79,27 +92,31 @@ if __name__ == "__main__":
     name         = 'com',
     buffer       = Buffer.Procedural(4),
     per_instance = pif.com,
-    draw_mode    = gl.GL_TRIANGLE_STRIP
+    draw_mode    = gl.GL_TRIANGLE_STRIP,
+    transparent  = True
   )
 
   renderer.register_entity_type(
     name         = 'triangle',
     shader_name  = 'billboard',
     buffer       = triangle_buffer,
-    per_instance = pif.triangle
+    per_instance = pif.triangle,
+    transparent  = True
   )
 
   renderer.register_entity_type(
     name         = 'grid',
     buffer       = grid_buffer,
-    per_instance = pif.grid
+    per_instance = pif.grid,
+    transparent  = True
   )
 
   renderer.register_entity_type(
     name         = 'tool',
     shader_name  = 'serial',
     buffer       = tool_buffer,
-    per_instance = pif.tool
+    per_instance = pif.tool,
+    cull         = True
   )
 
   trajectory_buffer = Buffer.from_points([
@@ -0,0 +1,7 @@
+from .bvh        import BVH
+from .clearance  import SphereClearance
+from .continuous import Contact, ContinuousChecker, joint_path, motion_radii
+from .distance   import Distance, DistanceQuery, MeshObstacle, capsule_witness, gjk
+from .occupancy  import GridClearance, OccupancyGrid, sphere_cover
+from .proxy      import Capsule, OrientedBox, Proxy, ProxyClearance, ProxyCollider, fit_proxies, load_proxies, save_proxies
+from .sdf        import FieldCache, LazyField, SignedDistanceField, load_fields, save_fields
@@ -0,0 +1,159 @@
+import heapq
+
+import numpy as np
+
+from .proxy import EPSILON, segment_closest_points
+
+def point_triangle_closest(points: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+  """Return the closest points on (..., 3, 3) triangles to (..., 3) points."""
+  a, b, c = triangles[..., 0, :], triangles[..., 1, :], triangles[..., 2, :]
+
+  normal = np.cross(b - a, c - a)
+  area   = np.einsum('...i,...i', normal, normal)
+  safe_area = np.where(area > EPSILON, area, 1)
+
+  # Project onto the triangle plane and check barycentric coordinates
+  projected = points - (np.einsum('...i,...i', points - a, normal) / safe_area)[..., np.newaxis] * normal
+
+  u = np.einsum('...i,...i', np.cross(c - b, projected - b), normal) / safe_area
+  v = np.einsum('...i,...i', np.cross(a - c, projected - c), normal) / safe_area
+  inside = (area > EPSILON) & (u >= 0) & (v >= 0) & (u + v <= 1)
+
+  # Otherwise the closest point lies on an edge
+  candidates = np.stack([
+    segment_closest_points(start, end, points, points)[0]
+    for start, end in ((a, b), (b, c), (c, a))
+  ])
+
+  distances = np.linalg.norm(candidates - points, axis=-1)
+  on_edge = np.take_along_axis(candidates, distances.argmin(axis=0)[np.newaxis, ..., np.newaxis], axis=0)[0]
+
+  return np.where(inside[..., np.newaxis], projected, on_edge)
+
+def segment_triangle_closest(start: np.ndarray, end: np.ndarray, triangles: np.ndarray):
+  """Return closest points (on the segment, on the triangles) between one segment and (T, 3, 3) triangles."""
+  count = len(triangles)
+  starts = np.broadcast_to(start, (count, 3))
+  ends   = np.broadcast_to(end, (count, 3))
+
+  candidates = []
+
+  # Segment end points against the triangle faces
+  for point in (starts, ends):
+    candidates.append((point, point_triangle_closest(point, triangles)))
+
+  # Segment against the triangle edges
+  for index in range(3):
+    edge_start, edge_end = triangles[:, index], triangles[:, (index + 1) % 3]
+    candidates.append(segment_closest_points(starts, ends, edge_start, edge_end))
+
+  # The segment may pass through a triangle
+  direction = ends - starts
+  edge_1, edge_2 = triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]
+  p = np.cross(direction, edge_2)
+  determinant = np.einsum('ij,ij->i', edge_1, p)
+  valid = np.abs(determinant) > EPSILON
+  inverse = np.where(valid, 1 / np.where(valid, determinant, 1), 0)
+  s = starts - triangles[:, 0]
+  q = np.cross(s, edge_1)
+  u = np.einsum('ij,ij->i', s, p) * inverse
+  v = np.einsum('ij,ij->i', direction, q) * inverse
+  t = np.einsum('ij,ij->i', edge_2, q) * inverse
+  crosses = valid & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0) & (t <= 1)
+  crossing = starts + np.clip(t, 0, 1)[:, np.newaxis] * direction
+  candidates.append((np.where(crosses[:, np.newaxis], crossing, starts), np.where(crosses[:, np.newaxis], crossing, np.inf)))
+
+  on_segment  = np.stack([first for first, _ in candidates])
+  on_triangle = np.stack([second for _, second in candidates])
+
+  with np.errstate(invalid='ignore'):
+    distances = np.linalg.norm(on_segment - on_triangle, axis=-1)
+
+  best = np.nanargmin(np.where(np.isnan(distances), np.inf, distances), axis=0)
+  rows = np.arange(count)
+
+  return on_segment[best, rows], on_triangle[best, rows]
+
+class BVH:
+  """Bounding volume hierarchy (axis aligned boxes, median splits) over an (F, 3, 3) triangle array."""
+  def __init__(self, triangles: np.ndarray, leaf_size: int = 16) -> None:
+    self.leaf_size = leaf_size
+
+    # Node arrays: bounds, children (-1 for leaves) and triangle ranges into the reordered triangle array
+    self.lower    = []
+    self.upper    = []
+    self.children = []
+    self.ranges   = []
+
+    order = np.arange(len(triangles))
+    centroids = triangles.mean(axis=1)
+
+    if len(triangles):
+      self.build(triangles, centroids, order, 0, len(triangles))
+
+    self.triangles = triangles[order]
+    self.lower     = np.array(self.lower).reshape(-1, 3)
+    self.upper     = np.array(self.upper).reshape(-1, 3)
+
+  def build(self, triangles: np.ndarray, centroids: np.ndarray, order: np.ndarray, start: int, end: int) -> int:
+    node = len(self.lower)
+
+    points = triangles[order[start:end]].reshape(-1, 3)
+    self.lower.append(points.min(axis=0))
+    self.upper.append(points.max(axis=0))
+    self.children.append((-1, -1))
+    self.ranges.append((start, end))
+
+    if end - start <= self.leaf_size:
+      return node
+
+    # Split at the median centroid along the longest axis
+    extents = np.ptp(centroids[order[start:end]], axis=0)
+    axis = int(extents.argmax())
+
+    middle = (start + end) // 2
+    segment = order[start:end]
+    order[start:end] = segment[np.argsort(centroids[segment, axis], kind='stable')]
+
+    left  = self.build(triangles, centroids, order, start, middle)
+    right = self.build(triangles, centroids, order, middle, end)
+    self.children[node] = (left, right)
+
+    return node
+
+  def segment_distance(self, start: np.ndarray, end: np.ndarray):
+    """Return (distance, point on segment, point on mesh) for the closest triangle to a segment.
+
+    Nodes are visited closest first and pruned with a box-to-box lower bound.
+    """
+    if len(self.lower) == 0:
+      return np.inf, start, None
+
+    segment_lower, segment_upper = np.minimum(start, end), np.maximum(start, end)
+
+    def lower_bound(node):
+      gap = np.maximum(np.maximum(self.lower[node] - segment_upper, segment_lower - self.upper[node]), 0)
+      return float(np.linalg.norm(gap))
+
+    best = (np.inf, start, None)
+    heap = [(lower_bound(0), 0)]
+
+    while heap:
+      bound, node = heapq.heappop(heap)
+      if bound >= best[0]:
+        break
+
+      left, right = self.children[node]
+      if left < 0:
+        first, last = self.ranges[node]
+        on_segment, on_mesh = segment_triangle_closest(start, end, self.triangles[first:last])
+
+        distances = np.linalg.norm(on_segment - on_mesh, axis=1)
+        index = int(distances.argmin())
+        if distances[index] < best[0]:
+          best = (float(distances[index]), on_segment[index], on_mesh[index])
+      else:
+        for child in (left, right):
+          heapq.heappush(heap, (lower_bound(child), child))
+
+    return best
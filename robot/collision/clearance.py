@@ -0,0 +1,40 @@
+import numpy as np
+
+from typing import Iterable
+
+from spatial   import AABB
+from .geometry import aabb_bounds, bounding_sphere, mesh_triangles, point_box_distance, transform_points
+
+class SphereClearance:
+  """Conservative clearance between Serial components and static obstacle boxes.
+
+  Each component (Link or Tool) is bounded by a single sphere in its local frame.
+  Components without geometry are given infinite clearance.
+  """
+  def __init__(self, components: Iterable, obstacles: Iterable[AABB]) -> None:
+    spheres = [bounding_sphere(mesh_triangles(component.mesh)) for component in components]
+
+    self.has_geometry = np.array([sphere is not None for sphere in spheres])
+    self.centers      = np.array([sphere[0] if sphere else np.zeros(3) for sphere in spheres])
+    self.radii        = np.array([sphere[1] if sphere else 0.0 for sphere in spheres])
+
+    bounds = [aabb_bounds(obstacle) for obstacle in obstacles]
+    self.lower = np.array([lower for lower, _ in bounds]).reshape(-1, 3)
+    self.upper = np.array([upper for _, upper in bounds]).reshape(-1, 3)
+
+  def __call__(self, matrices: np.ndarray) -> np.ndarray:
+    """Return the clearance of each component given (C, 4, 4) component world matrices."""
+    clearance = np.full(len(self.radii), np.inf)
+
+    if len(self.lower) == 0:
+      return clearance
+
+    centers = np.array([
+      transform_points(matrix, center)
+      for matrix, center in zip(matrices, self.centers)
+    ])
+
+    distances = point_box_distance(centers, self.lower, self.upper).min(axis=1) - self.radii
+    clearance[self.has_geometry] = distances[self.has_geometry]
+
+    return clearance
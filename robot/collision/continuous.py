@@ -0,0 +1,149 @@
+import numpy as np
+
+from collections import namedtuple
+from typing      import Callable, Optional, Tuple
+
+from robot.traj.exceptions import EmptyTrajectoryError
+from .geometry             import mesh_triangles
+
+Contact = namedtuple('Contact', 'time component clearance')
+
+def joint_path(trajectory, times = None) -> Tuple[np.ndarray, np.ndarray]:
+  """Return (times, angles) waypoint arrays for a trajectory.
+
+  Trajectories (e.g., LinearJS, LinearOS) provide their own waypoints.
+  Otherwise `trajectory` is taken as an (N, J) array of joint angles; `times` defaults to the waypoint index.
+  """
+  if hasattr(trajectory, 'waypoints'):
+    times, angles = trajectory.waypoints()
+  else:
+    angles = np.asarray(trajectory, dtype=float)
+    times  = np.arange(len(angles), dtype=float) if times is None else np.asarray(times, dtype=float)
+
+  assert len(times) == len(angles), 'Trajectory must provide one time per set of joint angles'
+
+  return times, angles
+
+def motion_radii(serial: 'Serial') -> np.ndarray:
+  """Return a (C, J) array bounding how far each Serial component can move per radian of each joint.
+
+  A point on component `c` moves at most `radii[c] @ abs(delta_angles)` when the joints are linearly interpolated.
+  The bound only uses the DH chain: the distance from joint j's origin to component c's origin is bounded by the
+  sum of the link offsets in between, plus the furthest mesh vertex from the component's own origin.
+  """
+  offsets = np.hypot(serial.dh[:, 1], serial.dh[:, 3])
+  number_of_joints = len(offsets)
+
+  radii = np.zeros((len(serial.components), number_of_joints))
+  for index, component in enumerate(serial.components):
+    vertices = mesh_triangles(component.mesh).reshape(-1, 3)
+    local_radius = np.linalg.norm(vertices, axis=1).max() if len(vertices) else 0.0
+
+    # The Tool moves with the last Link
+    link_index = min(index, number_of_joints)
+
+    for joint_index in range(link_index):
+      radii[index, joint_index] = offsets[joint_index:link_index].sum() + local_radius
+
+  return radii
+
+class ContinuousChecker:
+  """Continuous collision checker for joint space trajectories using conservative advancement.
+
+  Waypoints are linearly interpolated in joint space. A segment is certified collision free when, for every
+  component, the clearances at both ends sum to more than the component's motion bound over the segment.
+  Otherwise the segment is bisected until the motion bound drops below `tolerance`.
+
+  `clearance` maps (C, 4, 4) component world matrices to (C,) clearances (e.g., SphereClearance).
+  """
+  def __init__(self, serial: 'Serial', clearance: Callable[[np.ndarray], np.ndarray], tolerance: float = 0.5) -> None:
+    self.serial     = serial
+    self.clearance  = clearance
+    self.tolerance  = tolerance
+    self.components = serial.components
+    self.radii      = motion_radii(serial)
+
+    self.stats = {
+      'evaluations': 0,
+      'certified':   0
+    }
+
+  def clearance_at(self, angles: np.ndarray) -> np.ndarray:
+    """Return the clearance of each component for the provided joint angles."""
+    self.stats['evaluations'] += 1
+
+    matrices = self.serial.matrices_at(angles)
+    if self.serial.tool is not None:
+      # The Tool frame coincides with the last Link frame
+      matrices = np.concatenate((matrices, matrices[-1:]))
+
+    return self.clearance(matrices)
+
+  def first_contact(self, trajectory, times = None) -> Optional[Contact]:
+    """Return the first Contact along the trajectory. Return None if the trajectory is certified collision free.
+
+    Raise EmptyTrajectoryError for trajectories without waypoints (nothing can be certified).
+    """
+    times, angles = joint_path(trajectory, times)
+
+    if len(angles) == 0:
+      raise EmptyTrajectoryError
+
+    start_clearance = self.clearance_at(angles[0])
+    for index in range(len(angles) - 1):
+      end_clearance = self.clearance_at(angles[index + 1])
+
+      contact = self.check_segment(
+        (times[index],     angles[index],     start_clearance),
+        (times[index + 1], angles[index + 1], end_clearance)
+      )
+
+      if contact is not None:
+        return contact
+
+      start_clearance = end_clearance
+
+    if start_clearance.min() <= 0:
+      return self.contact(times[-1], start_clearance)
+
+    return None
+
+  def is_free(self, trajectory, times = None) -> bool:
+    """Return True if the trajectory is certified collision free."""
+    return self.first_contact(trajectory, times) is None
+
+  def check_segment(self, start: tuple, end: tuple) -> Optional[Contact]:
+    """Return the first Contact between two (time, angles, clearance) samples. Return None if certified free."""
+    # Segments are processed depth first, earliest half first, so the first contact found is the earliest
+    stack = [(start, end)]
+
+    while stack:
+      (t_a, q_a, d_a), (t_b, q_b, d_b) = stack.pop()
+
+      if d_a.min() <= 0:
+        return self.contact(t_a, d_a)
+
+      bound = self.radii @ np.abs(q_b - q_a)
+
+      uncertified = (d_a + d_b) <= bound
+      if not uncertified.any():
+        self.stats['certified'] += 1
+        continue
+
+      if bound[uncertified].max() <= self.tolerance:
+        # The component may come within `tolerance` of contact somewhere on this (tiny) segment
+        return self.contact(t_a, np.where(uncertified, np.minimum(d_a, d_b), np.inf))
+
+      t_m = (t_a + t_b) / 2
+      q_m = (q_a + q_b) / 2
+      middle = (t_m, q_m, self.clearance_at(q_m))
+
+      stack.append((middle, (t_b, q_b, d_b)))
+      stack.append(((t_a, q_a, d_a), middle))
+
+    return None
+
+  def contact(self, time: float, clearance: np.ndarray) -> Contact:
+    index = int(np.argmin(clearance))
+
+    return Contact(float(time), self.components[index], float(clearance[index]))
@@ -0,0 +1,201 @@
+import itertools
+
+import numpy as np
+
+from collections import namedtuple
+from typing      import Iterable, Optional
+
+from robot.mech.kinematics import transform_matrix
+from .bvh                  import BVH
+from .geometry             import transform_points_batch
+from .proxy                import EPSILON, Capsule, OrientedBox, Proxy, ProxyCollider, segment_closest_points
+
+# Minimum distance between two objects and a witness point on each (in world space)
+Distance = namedtuple('Distance', 'distance first second')
+
+def box_corners(box: OrientedBox) -> np.ndarray:
+  """Return the (8, 3) corners of an OrientedBox."""
+  signs = np.array(list(itertools.product((-1, 1), repeat=3)))
+
+  return box.center + (signs * box.half_extents) @ box.axes
+
+def capsule_witness(first: Capsule, second: Capsule) -> Distance:
+  """Return the Distance between capsules (negative when overlapping). Capsules may be batched (..., 3)."""
+  on_first, on_second = segment_closest_points(first.start, first.end, second.start, second.end)
+
+  between = on_second - on_first
+  length  = np.linalg.norm(between, axis=-1)
+  direction = between / np.where(length > EPSILON, length, 1)[..., np.newaxis]
+
+  first_radius  = np.asarray(first.radius)[..., np.newaxis]
+  second_radius = np.asarray(second.radius)[..., np.newaxis]
+
+  return Distance(
+    length - first.radius - second.radius,
+    on_first + first_radius * direction,
+    on_second - second_radius * direction
+  )
+
+def closest_on_simplex(simplex: np.ndarray):
+  """Return the point of minimum norm on a simplex of up to four points and its barycentric weights."""
+  best_point, best_weights = None, None
+
+  for size in range(1, len(simplex) + 1):
+    for subset in itertools.combinations(range(len(simplex)), size):
+      vertices = simplex[list(subset)]
+
+      if size == 1:
+        weights = np.ones(1)
+      else:
+        edges = (vertices[1:] - vertices[0]).T
+        rest, *_ = np.linalg.lstsq(edges, -vertices[0], rcond=None)
+        weights = np.concatenate(([1 - rest.sum()], rest))
+
+      if np.any(weights < -EPSILON):
+        continue
+
+      point = weights @ vertices
+      if best_point is None or point @ point < best_point @ best_point:
+        best_point = point
+        best_weights = np.zeros(len(simplex))
+        best_weights[list(subset)] = weights
+
+  return best_point, best_weights
+
+def gjk(first: np.ndarray, second: np.ndarray, tolerance: float = 1e-6, max_iterations: int = 64) -> Distance:
+  """Return the Distance between the convex hulls of two (N, 3) point sets (Gilbert-Johnson-Keerthi).
+
+  Intersecting hulls have a distance of 0 (penetration depth is not computed).
+  """
+  first_support  = first[0]
+  second_support = second[0]
+
+  first_simplex  = first_support[np.newaxis]
+  second_simplex = second_support[np.newaxis]
+  weights = np.ones(1)
+
+  v = first_support - second_support
+  for _ in range(max_iterations):
+    if v @ v <= EPSILON:
+      break
+
+    # Support point of the Minkowski difference (first - second) in direction -v
+    first_support  = first[np.argmax(first @ -v)]
+    second_support = second[np.argmax(second @ v)]
+    w = first_support - second_support
+
+    if v @ v - v @ w <= tolerance * (v @ v):
+      break
+
+    first_simplex  = np.vstack((first_simplex, first_support))
+    second_simplex = np.vstack((second_simplex, second_support))
+
+    v, weights = closest_on_simplex(first_simplex - second_simplex)
+
+    # Drop vertices that do not support the closest point
+    keep = weights > EPSILON
+    first_simplex, second_simplex, weights = first_simplex[keep], second_simplex[keep], weights[keep]
+
+  return Distance(float(np.linalg.norm(v)), weights @ first_simplex, weights @ second_simplex)
+
+class MeshObstacle:
+  """Static triangle mesh (in world space) accelerated with a BVH for distance queries."""
+  def __init__(self, triangles: np.ndarray, leaf_size: int = 16) -> None:
+    self.bvh = BVH(np.asarray(triangles, dtype=float), leaf_size)
+
+  def capsule_distance(self, capsule: Capsule) -> Distance:
+    """Return the Distance between a capsule and the mesh surface."""
+    distance, on_segment, on_mesh = self.bvh.segment_distance(capsule.start, capsule.end)
+    if on_mesh is None:
+      return Distance(np.inf, None, None)
+
+    direction = (on_mesh - on_segment) / distance if distance > EPSILON else np.zeros(3)
+
+    return Distance(distance - capsule.radius, on_segment + capsule.radius * direction, on_mesh)
+
+class DistanceQuery(ProxyCollider):
+  """Minimum distance queries between Serial components and static obstacles using collision proxies.
+
+  Component world matrices default to the component's `to_world` transform (as maintained by Serial).
+  """
+  def matrix(self, component, matrix: Optional[np.ndarray]) -> np.ndarray:
+    return matrix if matrix is not None else transform_matrix(component.to_world)
+
+  def world_proxy(self, component, matrix: np.ndarray = None) -> Optional[Proxy]:
+    proxy = self.proxy(component)
+
+    return proxy.transform(self.matrix(component, matrix)) if proxy else None
+
+  def between(self, first, second, first_matrix: np.ndarray = None, second_matrix: np.ndarray = None, shape: str = 'capsule') -> Distance:
+    """Return the Distance between two components' proxies.
+
+    `shape` selects the capsule (closed form) or the oriented box (GJK) proxies. Both never overestimate the
+    distance between the meshes, so the larger of the two is the tighter bound.
+    """
+    first_proxy  = self.world_proxy(first, first_matrix)
+    second_proxy = self.world_proxy(second, second_matrix)
+
+    if first_proxy is None or second_proxy is None:
+      return Distance(np.inf, None, None)
+
+    if shape == 'box':
+      return gjk(box_corners(first_proxy.box), box_corners(second_proxy.box))
+
+    distance = capsule_witness(first_proxy.capsule, second_proxy.capsule)
+
+    return Distance(float(distance.distance), distance.first, distance.second)
+
+  def to_mesh(self, component, obstacle: MeshObstacle, matrix: np.ndarray = None) -> Distance:
+    """Return the Distance between a component's capsule proxy and a static mesh obstacle."""
+    proxy = self.world_proxy(component, matrix)
+    if proxy is None:
+      return Distance(np.inf, None, None)
+
+    return obstacle.capsule_distance(proxy.capsule)
+
+  def batch(self, serial: 'Serial', angles: np.ndarray, obstacles: Iterable[Proxy]) -> Distance:
+    """Return the Distance from every Serial component to the nearest obstacle for many sets of joint angles.
+
+    `angles` has shape (N, J). Obstacles are world space Proxies. The result holds (N, C) distances and
+    (N, C, 3) witness points, computed with capsules in a single vectorized pass.
+    """
+    matrices = serial.matrices_at(angles)
+    if serial.tool is not None:
+      matrices = np.concatenate((matrices, matrices[:, -1:]), axis=1)
+
+    proxies = [self.proxy(component) for component in serial.components]
+    present = np.array([proxy is not None for proxy in proxies])
+
+    def local(attribute):
+      return np.array([getattr(proxy.capsule, attribute) if proxy else np.zeros(3) for proxy in proxies])
+
+    starts = transform_points_batch(matrices, local('start'))
+    ends   = transform_points_batch(matrices, local('end'))
+    radii  = np.array([proxy.capsule.radius if proxy else 0.0 for proxy in proxies])
+
+    obstacles = list(obstacles)
+    count, components = starts.shape[:2]
+    if not obstacles:
+      return Distance(np.full((count, components), np.inf), starts, np.full(starts.shape, np.nan))
+
+    obstacle_capsule = Capsule(
+      np.array([obstacle.capsule.start for obstacle in obstacles]),
+      np.array([obstacle.capsule.end for obstacle in obstacles]),
+      np.array([obstacle.capsule.radius for obstacle in obstacles])
+    )
+
+    # Broadcast to (N, C, M) pairs
+    distance = capsule_witness(
+      Capsule(starts[:, :, np.newaxis], ends[:, :, np.newaxis], radii[:, np.newaxis]),
+      obstacle_capsule
+    )
+
+    nearest = distance.distance.argmin(axis=2)[..., np.newaxis]
+    distances = np.take_along_axis(distance.distance, nearest, axis=2)[..., 0]
+    distances[:, ~present] = np.inf
+
+    return Distance(
+      distances,
+      np.take_along_axis(distance.first, nearest[..., np.newaxis], axis=2)[:, :, 0],
+      np.take_along_axis(distance.second, nearest[..., np.newaxis], axis=2)[:, :, 0]
+    )
@@ -0,0 +1,51 @@
+import numpy as np
+
+from typing import Optional, Tuple
+
+from spatial import AABB, Mesh
+
+def mesh_triangles(mesh: Mesh) -> np.ndarray:
+  """Return a (F, 3, 3) array of the Mesh's facet vertices."""
+  if hasattr(mesh, 'triangles'):
+    # Array backed meshes (see robot.visual.filetypes.array_mesh) already store them
+    return np.asarray(mesh.triangles, dtype=float).reshape(-1, 3, 3)
+
+  triangles = [[vertex.xyz for vertex in facet.vertices] for facet in mesh.facets]
+
+  return np.array(triangles, dtype=float).reshape(-1, 3, 3)
+
+def aabb_bounds(aabb: AABB) -> Tuple[np.ndarray, np.ndarray]:
+  """Return the lower and upper corners of an AABB as arrays."""
+  corners = np.array([corner.xyz for corner in aabb.corners], dtype=float)
+
+  return corners.min(axis=0), corners.max(axis=0)
+
+def transform_points(matrix: np.ndarray, points: np.ndarray) -> np.ndarray:
+  """Apply a (4, 4) homogeneous matrix to an (..., 3) array of points."""
+  return points @ matrix[:3, :3].T + matrix[:3, 3]
+
+def transform_points_batch(matrices: np.ndarray, points: np.ndarray) -> np.ndarray:
+  """Apply (..., C, 4, 4) matrices to (C, 3) points, one point per matrix."""
+  return np.einsum('...ij,...j->...i', matrices[..., :3, :3], points) + matrices[..., :3, 3]
+
+def bounding_sphere(points: np.ndarray) -> Optional[Tuple[np.ndarray, float]]:
+  """Return the (center, radius) of a sphere enclosing all points. Return None if there are no points.
+
+  The sphere is centered on the points' bounding box, which is not minimal but is cheap and stable.
+  """
+  points = points.reshape(-1, 3)
+  if len(points) == 0:
+    return None
+
+  center = (points.min(axis=0) + points.max(axis=0)) / 2
+  radius = np.linalg.norm(points - center, axis=1).max()
+
+  return center, float(radius)
+
+def point_box_distance(points: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+  """Return distances from (N, 3) points to (M, 3) boxes as an (N, M) array. Points inside a box are 0."""
+  points = points[:, np.newaxis, :]
+
+  outside = np.maximum(np.maximum(lower - points, points - upper), 0)
+
+  return np.linalg.norm(outside, axis=-1)
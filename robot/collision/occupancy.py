@@ -0,0 +1,298 @@
+import math
+
+import numpy as np
+
+from typing import Iterable, Optional
+
+from spatial   import Mesh
+from .geometry import mesh_triangles, point_box_distance, transform_points
+
+def sample_triangles(triangles: np.ndarray, spacing: float) -> np.ndarray:
+  """Return points covering (F, 3, 3) triangles with at most `spacing` between neighbouring samples."""
+  edges = np.linalg.norm(triangles - np.roll(triangles, 1, axis=1), axis=2).max(axis=1)
+  divisions = np.maximum(np.ceil(edges / spacing), 1).astype(int)
+
+  samples = []
+  # Triangles with the same number of divisions share one barycentric pattern
+  for count in np.unique(divisions):
+    i, j = np.meshgrid(np.arange(count + 1), np.arange(count + 1), indexing='ij')
+    keep = (i + j) <= count
+    weights = np.stack((count - i[keep] - j[keep], i[keep], j[keep]), axis=1) / count
+
+    samples.append(np.einsum('pk,tkd->tpd', weights, triangles[divisions == count]).reshape(-1, 3))
+
+  return np.concatenate(samples) if samples else np.zeros((0, 3))
+
+def label_components(empty: np.ndarray) -> np.ndarray:
+  """Return a flat array labelling each voxel with the smallest flat index of its 6-connected component of empty voxels.
+
+  Union-find over all neighbouring empty pairs at once: every root hooks onto the smallest root it touches, then the
+  trees are compressed by pointer jumping. Pairs already in one component are dropped, so each round only visits the
+  remaining boundaries between components.
+  """
+  index_type = np.int32 if empty.size < 2 ** 31 else np.int64
+  parent = np.arange(empty.size, dtype=index_type)
+
+  flat = empty.ravel()
+  strides = np.cumprod((1,) + empty.shape[:0:-1])[::-1]
+
+  pairs = []
+  for axis, stride in enumerate(strides):
+    # Voxels whose neighbour along the axis exists (i.e., not on the last layer)
+    inner = np.ones(empty.shape, dtype=bool)
+    inner[(slice(None),) * axis + (-1,)] = False
+
+    voxels = np.flatnonzero(inner.ravel() & flat).astype(index_type)
+    voxels = voxels[flat[voxels + stride]]
+    pairs.append((voxels, voxels + index_type(stride)))
+
+  first  = np.concatenate([first for first, _ in pairs])
+  second = np.concatenate([second for _, second in pairs])
+
+  while len(first):
+    first_root, second_root = parent[first], parent[second]
+
+    joined = first_root != second_root
+    first, second = first[joined], second[joined]
+    first_root, second_root = first_root[joined], second_root[joined]
+
+    # Hooking the larger root onto the smaller one can never create a cycle
+    np.minimum.at(parent, np.maximum(first_root, second_root), np.minimum(first_root, second_root))
+
+    while True:
+      grandparent = parent[parent]
+      if np.array_equal(grandparent, parent):
+        break
+
+      parent = grandparent
+
+  return parent
+
+def fill_interior(surface: np.ndarray) -> np.ndarray:
+  """Return the surface voxels plus every voxel not reachable from the grid boundary (i.e., enclosed volumes)."""
+  empty = ~surface
+  labels = label_components(empty).reshape(surface.shape)
+
+  boundary = np.zeros_like(surface)
+  boundary[[0, -1], :, :] = True
+  boundary[:, [0, -1], :] = True
+  boundary[:, :, [0, -1]] = True
+
+  # Empty components touching the boundary are outside of every closed volume
+  exterior = np.isin(labels, labels[boundary & empty]) & empty
+
+  return ~exterior
+
+def lower_envelope(squared: np.ndarray) -> np.ndarray:
+  """Return the 1-D squared distance transform along the last axis of (R, L) squared distances (in voxel units).
+
+  Felzenszwalb and Huttenlocher's lower envelope of parabolas rooted at every finite sample, run on all rows at once:
+  the loops are over the L samples and each one is vectorized over the rows, so a pass is O(R L).
+  """
+  rows, length = squared.shape
+  row_indices = np.arange(rows)
+
+  # Per row: roots of the envelope's parabolas, the boundaries between them, and the index of the last parabola
+  roots      = np.zeros((rows, length), dtype=int)
+  boundaries = np.full((rows, length + 1), np.inf)
+  last       = np.full(rows, -1)
+
+  def intersection(candidates, sample):
+    root = roots[candidates, last[candidates]]
+    return ((squared[candidates, sample] + sample ** 2) - (squared[candidates, root] + root ** 2)) / (2 * (sample - root))
+
+  for sample in range(length):
+    finite = np.isfinite(squared[:, sample])
+
+    # Remove the parabolas that the new one hides (the first parabola's boundary is -inf so it is never removed)
+    candidates = row_indices[finite & (last >= 0)]
+    while len(candidates):
+      hidden = intersection(candidates, sample) <= boundaries[candidates, last[candidates]]
+      candidates = candidates[hidden]
+      last[candidates] -= 1
+
+    first = row_indices[finite & (last < 0)]
+    later = row_indices[finite & (last >= 0)]
+
+    roots[first, 0] = sample
+    boundaries[first, 0] = -np.inf
+    last[first] = 0
+
+    crossing = intersection(later, sample)
+    last[later] += 1
+    roots[later, last[later]] = sample
+    boundaries[later, last[later]] = crossing
+    boundaries[later, last[later] + 1] = np.inf
+
+  # The parabola covering each sample is the number of boundaries (after the first) below it
+  # Offsetting every row by more than its range lets one searchsorted find them for all rows
+  span = length + 2
+  offsets = (row_indices * span)[:, np.newaxis]
+
+  valid = np.arange(length) < last[:, np.newaxis]
+  upper = np.where(valid, np.clip(boundaries[:, 1:], -1, length), length) + offsets
+  covering = np.searchsorted(upper.ravel(), (np.arange(length) + offsets).ravel()).reshape(rows, length) - row_indices[:, np.newaxis] * length
+
+  covering = np.minimum(covering, np.maximum(last, 0)[:, np.newaxis])
+  root = np.take_along_axis(roots, covering, axis=1)
+  result = (np.arange(length) - root) ** 2 + np.take_along_axis(squared, root, axis=1)
+
+  return np.where((last >= 0)[:, np.newaxis], result, np.inf)
+
+def distance_transform(occupied: np.ndarray, voxel_size: float) -> np.ndarray:
+  """Return the exact Euclidean distance from every voxel center to the nearest occupied voxel center.
+
+  Separable squared distance transform: one linear time lower envelope pass per axis (see lower_envelope).
+  """
+  squared = np.where(occupied, 0.0, np.inf)
+
+  for axis in range(3):
+    squared = np.moveaxis(squared, axis, -1)
+    shape = squared.shape
+
+    squared = np.moveaxis(lower_envelope(squared.reshape(-1, shape[-1])).reshape(shape), -1, axis)
+
+  return np.sqrt(squared) * voxel_size
+
+class OccupancyGrid:
+  """Bit-packed voxel occupancy grid of static geometry with a distance field for sphere queries.
+
+  Voxel (i, j, k) spans origin + voxel_size * [i, i + 1) (and likewise for j and k).
+  """
+  def __init__(self, origin: np.ndarray, voxel_size: float, shape: tuple, bits: np.ndarray, distances: np.ndarray = None) -> None:
+    self.origin     = np.asarray(origin, dtype=float)
+    self.voxel_size = float(voxel_size)
+    self.shape      = tuple(int(size) for size in shape)
+    self.bits       = bits
+    self.distances  = distances
+
+  @classmethod
+  def from_triangles(cls, triangles: np.ndarray, voxel_size: float, fill: bool = True, padding: int = 2, distances: bool = True) -> 'OccupancyGrid':
+    """Rasterize world space (F, 3, 3) triangles.
+
+    Surfaces are rasterized by sampling each triangle at half the voxel size. Closed volumes are filled when `fill`
+    is set. The distance field (needed for sphere queries) is computed when `distances` is set.
+    """
+    points = triangles.reshape(-1, 3)
+    origin = points.min(axis=0) - padding * voxel_size
+    shape  = np.ceil((points.max(axis=0) - origin) / voxel_size).astype(int) + padding
+
+    occupied = np.zeros(shape, dtype=bool)
+    samples = sample_triangles(triangles, voxel_size / 2)
+    indices = np.clip(np.floor((samples - origin) / voxel_size).astype(int), 0, shape - 1)
+    occupied[tuple(indices.T)] = True
+
+    if fill:
+      occupied = fill_interior(occupied)
+
+    field = distance_transform(occupied, voxel_size).astype(np.float32) if distances else None
+
+    return cls(origin, voxel_size, shape, np.packbits(occupied, axis=None), field)
+
+  @classmethod
+  def from_meshes(cls, meshes: Iterable[Mesh], voxel_size: float, **kwargs) -> 'OccupancyGrid':
+    triangles = np.concatenate([mesh_triangles(mesh) for mesh in meshes])
+
+    return cls.from_triangles(triangles, voxel_size, **kwargs)
+
+  @classmethod
+  def from_file(cls, file_path: str, voxel_size: float, **kwargs) -> 'OccupancyGrid':
+    """Voxelize all meshes of a scene file (parsed with STLParser)."""
+    from robot.visual.filetypes.stl.stl_parser import STLParser
+
+    return cls.from_meshes(Mesh.from_file(STLParser(), file_path), voxel_size, **kwargs)
+
+  @classmethod
+  def load(cls, file_path: str) -> 'OccupancyGrid':
+    with np.load(file_path) as data:
+      distances = data['distances'] if 'distances' in data.files else None
+
+      return cls(data['origin'], data['voxel_size'], data['shape'], data['bits'], distances)
+
+  def save(self, file_path: str) -> None:
+    arrays = {
+      'origin':     self.origin,
+      'voxel_size': self.voxel_size,
+      'shape':      np.array(self.shape),
+      'bits':       self.bits
+    }
+
+    if self.distances is not None:
+      arrays['distances'] = self.distances
+
+    np.savez_compressed(file_path, **arrays)
+
+  @property
+  def occupied(self) -> np.ndarray:
+    """Return the unpacked boolean occupancy array."""
+    count = math.prod(self.shape)
+
+    return np.unpackbits(self.bits, count=count).astype(bool).reshape(self.shape)
+
+  def indices(self, points: np.ndarray):
+    """Return voxel indices of (N, 3) points and whether they are inside the grid."""
+    indices = np.floor((np.asarray(points, dtype=float) - self.origin) / self.voxel_size).astype(int)
+    inside  = np.all((indices >= 0) & (indices < self.shape), axis=-1)
+
+    return np.where(inside[..., np.newaxis], indices, 0), inside
+
+  def contains(self, points: np.ndarray) -> np.ndarray:
+    """Return True for every (N, 3) point inside an occupied voxel (read directly from the packed bits)."""
+    indices, inside = self.indices(points)
+
+    flat = np.ravel_multi_index(tuple(np.moveaxis(indices, -1, 0)), self.shape)
+    bits = (self.bits[flat >> 3] >> (7 - (flat & 7))) & 1
+
+    return inside & (bits == 1)
+
+  def clearance(self, centers: np.ndarray, radii: np.ndarray = 0) -> np.ndarray:
+    """Return a lower bound on the distance between (N, 3) spheres and the occupied geometry.
+
+    Voxel centers are up to half a voxel diagonal away from the geometry (and from the query point),
+    so a full voxel diagonal is subtracted. Points outside the grid use their distance to the grid bounds.
+    """
+    assert self.distances is not None, 'Sphere queries need a grid built with a distance field'
+
+    centers = np.asarray(centers, dtype=float)
+
+    indices, inside = self.indices(centers)
+    distances = self.distances[tuple(np.moveaxis(indices, -1, 0))] - math.sqrt(3) * self.voxel_size
+
+    upper = self.origin + np.array(self.shape) * self.voxel_size
+    outside = point_box_distance(centers.reshape(-1, 3), self.origin, upper).reshape(inside.shape)
+
+    return np.where(inside, distances, outside) - radii
+
+  def collide(self, centers: np.ndarray, radii: np.ndarray = 0) -> np.ndarray:
+    """Return True for every (N, 3) sphere that may touch the occupied geometry."""
+    return (self.clearance(centers, radii) <= 0) | self.contains(centers)
+
+def sphere_cover(triangles: np.ndarray, radius: float) -> Optional[np.ndarray]:
+  """Return (N, 3) centers of spheres with `radius` that cover a mesh surface. Return None for an empty mesh."""
+  if len(triangles) == 0:
+    return None
+
+  # Spheres circumscribing surface voxels cover the surface
+  voxel_size = 2 * radius / math.sqrt(3)
+  grid = OccupancyGrid.from_triangles(triangles, voxel_size, fill=False, padding=0, distances=False)
+
+  indices = np.argwhere(grid.occupied)
+
+  return grid.origin + (indices + 0.5) * voxel_size
+
+class GridClearance:
+  """Clearance between Serial components (covered by spheres) and an OccupancyGrid. Usable with ContinuousChecker."""
+  def __init__(self, components: Iterable, grid: OccupancyGrid, radius: float) -> None:
+    self.grid    = grid
+    self.radius  = radius
+    self.spheres = [sphere_cover(mesh_triangles(component.mesh), radius) for component in components]
+
+  def __call__(self, matrices: np.ndarray) -> np.ndarray:
+    """Return the clearance of each component given (C, 4, 4) component world matrices."""
+    clearance = np.full(len(self.spheres), np.inf)
+
+    for index, (centers, matrix) in enumerate(zip(self.spheres, matrices)):
+      if centers is not None:
+        clearance[index] = self.grid.clearance(transform_points(matrix, centers), self.radius).min()
+
+    return clearance
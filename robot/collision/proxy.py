@@ -0,0 +1,322 @@
+import json
+
+import numpy as np
+
+from collections import namedtuple
+from typing      import Iterable, List, Optional
+
+from .geometry import mesh_triangles, transform_points
+
+Capsule      = namedtuple('Capsule', 'start end radius')
+OrientedBox  = namedtuple('OrientedBox', 'center axes half_extents')
+
+EPSILON = 1e-9
+
+def principal_axes(points: np.ndarray) -> np.ndarray:
+  """Return the (3, 3) principal axes (rows, largest variance first) of a point cloud."""
+  _, vectors = np.linalg.eigh(np.cov(points, rowvar=False))
+
+  # Eigenvalues are ascending. Ensure the axes form a right-handed frame.
+  axes = vectors[:, ::-1].T.copy()
+  axes[2] = np.cross(axes[0], axes[1])
+
+  return axes
+
+def fit_capsule(points: np.ndarray) -> Capsule:
+  """Return a Capsule around the principal axis that encloses all points."""
+  center = points.mean(axis=0)
+  axis   = principal_axes(points)[0]
+
+  offsets = points - center
+  t = offsets @ axis
+  perpendicular = np.linalg.norm(offsets - np.outer(t, axis), axis=1)
+
+  radius = perpendicular.max()
+
+  # Shrink the segment as far as possible while keeping every point inside the end cap spheres
+  reach = np.sqrt(np.maximum(radius ** 2 - perpendicular ** 2, 0))
+  low, high = (t + reach).min(), (t - reach).max()
+  if low > high:
+    low = high = (low + high) / 2
+
+  return Capsule(center + low * axis, center + high * axis, float(radius))
+
+def fit_box(points: np.ndarray) -> OrientedBox:
+  """Return an OrientedBox aligned with the principal axes that encloses all points."""
+  axes = principal_axes(points)
+
+  projected = points @ axes.T
+  low, high = projected.min(axis=0), projected.max(axis=0)
+
+  return OrientedBox(((low + high) / 2) @ axes, axes, (high - low) / 2)
+
+class Proxy:
+  """Simplified collision geometry (a capsule and an oriented box) enclosing a mesh in its local frame."""
+  def __init__(self, capsule: Capsule, box: OrientedBox) -> None:
+    self.capsule = capsule
+    self.box     = box
+
+  @classmethod
+  def fit(cls, triangles: np.ndarray) -> Optional['Proxy']:
+    """Fit a Proxy to an (F, 3, 3) triangle array. Return None for an empty mesh."""
+    points = np.unique(triangles.reshape(-1, 3), axis=0)
+    if len(points) < 2:
+      return None
+
+    return cls(fit_capsule(points), fit_box(points))
+
+  @classmethod
+  def from_dict(cls, d: dict) -> 'Proxy':
+    capsule = d['capsule']
+    box     = d['box']
+
+    return cls(
+      Capsule(np.array(capsule['start']), np.array(capsule['end']), capsule['radius']),
+      OrientedBox(np.array(box['center']), np.array(box['axes']), np.array(box['half_extents']))
+    )
+
+  def to_dict(self) -> dict:
+    return {
+      'capsule': {
+        'start':  self.capsule.start.tolist(),
+        'end':    self.capsule.end.tolist(),
+        'radius': self.capsule.radius
+      },
+      'box': {
+        'center':       self.box.center.tolist(),
+        'axes':         self.box.axes.tolist(),
+        'half_extents': self.box.half_extents.tolist()
+      }
+    }
+
+  def scale(self, factor: float) -> 'Proxy':
+    """Return a Proxy uniformly scaled about the local origin."""
+    return Proxy(
+      Capsule(self.capsule.start * factor, self.capsule.end * factor, self.capsule.radius * abs(factor)),
+      OrientedBox(self.box.center * factor, self.box.axes, self.box.half_extents * abs(factor))
+    )
+
+  def transform(self, matrix: np.ndarray) -> 'Proxy':
+    """Return a Proxy moved by a rigid (4, 4) homogeneous matrix."""
+    return Proxy(
+      Capsule(transform_points(matrix, self.capsule.start), transform_points(matrix, self.capsule.end), self.capsule.radius),
+      OrientedBox(transform_points(matrix, self.box.center), self.box.axes @ matrix[:3, :3].T, self.box.half_extents)
+    )
+
+def fit_proxies(meshes: Iterable) -> List[Optional[Proxy]]:
+  """Fit one Proxy per Mesh (None for empty meshes)."""
+  return [Proxy.fit(mesh_triangles(mesh)) for mesh in meshes]
+
+def save_proxies(file_path: str, proxies: Iterable[Optional[Proxy]]) -> None:
+  with open(file_path, 'w') as file:
+    json.dump([proxy.to_dict() if proxy else None for proxy in proxies], file, indent=2)
+
+def load_proxies(file_path: str) -> List[Optional[Proxy]]:
+  with open(file_path) as file:
+    return [Proxy.from_dict(d) if d else None for d in json.load(file)]
+
+def segment_closest_points(p1: np.ndarray, q1: np.ndarray, p2: np.ndarray, q2: np.ndarray):
+  """Return the closest points between segments p1q1 and p2q2.
+
+  All arguments are (..., 3) arrays so many segment pairs can be processed at once.
+  Follows Ericson, Real-Time Collision Detection, 5.1.9.
+  """
+  d1, d2, r = q1 - p1, q2 - p2, p1 - p2
+
+  a = np.einsum('...i,...i', d1, d1)
+  e = np.einsum('...i,...i', d2, d2)
+  b = np.einsum('...i,...i', d1, d2)
+  c = np.einsum('...i,...i', d1, r)
+  f = np.einsum('...i,...i', d2, r)
+
+  safe_a = np.where(a > EPSILON, a, 1)
+  safe_e = np.where(e > EPSILON, e, 1)
+
+  denominator = a * e - b ** 2
+  s = np.where(denominator > EPSILON, (b * f - c * e) / np.where(denominator > EPSILON, denominator, 1), 0)
+  s = np.clip(np.where(e > EPSILON, s, -c / safe_a), 0, 1)
+  s = np.where(a > EPSILON, s, 0)
+
+  t = np.where(e > EPSILON, (b * s + f) / safe_e, 0)
+
+  # Recompute s when t is clamped
+  s = np.where(t < 0, np.clip(-c / safe_a, 0, 1), np.where(t > 1, np.clip((b - c) / safe_a, 0, 1), s))
+  s = np.where(a > EPSILON, s, 0)
+  t = np.clip(t, 0, 1)
+
+  return p1 + s[..., np.newaxis] * d1, p2 + t[..., np.newaxis] * d2
+
+def capsule_distance(first: Capsule, second: Capsule) -> np.ndarray:
+  """Return the distance between capsule surfaces (negative for overlapping capsules)."""
+  closest_first, closest_second = segment_closest_points(first.start, first.end, second.start, second.end)
+
+  return np.linalg.norm(closest_first - closest_second, axis=-1) - first.radius - second.radius
+
+def boxes_overlap(first: OrientedBox, second: OrientedBox) -> bool:
+  """Return True if two oriented boxes overlap (separating axis test over the 15 candidate axes)."""
+  cross_axes = np.cross(first.axes[:, np.newaxis, :], second.axes[np.newaxis, :, :]).reshape(-1, 3)
+  axes = np.concatenate((first.axes, second.axes, cross_axes))
+
+  # Ignore degenerate cross products (parallel edges)
+  axes = axes[np.linalg.norm(axes, axis=1) > EPSILON]
+
+  def radius(box):
+    return np.abs(axes @ box.axes.T) @ box.half_extents
+
+  distance = np.abs(axes @ (second.center - first.center))
+
+  return bool(np.all(distance <= radius(first) + radius(second)))
+
+def segments_cross_triangles(starts: np.ndarray, ends: np.ndarray, triangles: np.ndarray) -> bool:
+  """Return True if any segment crosses any triangle (Moller-Trumbore over all pairs)."""
+  directions = (ends - starts)[:, np.newaxis, :]
+  v0, v1, v2 = triangles[np.newaxis, :, 0], triangles[np.newaxis, :, 1], triangles[np.newaxis, :, 2]
+
+  edge_1, edge_2 = v1 - v0, v2 - v0
+  p = np.cross(directions, edge_2)
+  determinant = np.einsum('...i,...i', edge_1, p)
+
+  valid = np.abs(determinant) > EPSILON
+  inverse = np.where(valid, 1 / np.where(valid, determinant, 1), 0)
+
+  s = starts[:, np.newaxis, :] - v0
+  u = np.einsum('...i,...i', s, p) * inverse
+
+  q = np.cross(s, edge_1)
+  v = np.einsum('...i,...i', directions, q) * inverse
+  t = np.einsum('...i,...i', edge_2, q) * inverse
+
+  return bool(np.any(valid & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0) & (t <= 1)))
+
+def triangles_intersect(first: np.ndarray, second: np.ndarray, chunk_size: int = 256) -> bool:
+  """Return True if any triangle in `first` intersects any triangle in `second` (both (F, 3, 3) arrays)."""
+  def overlapping(triangles, other):
+    low, high = other.reshape(-1, 3).min(axis=0), other.reshape(-1, 3).max(axis=0)
+    keep = np.all((triangles.max(axis=1) >= low) & (triangles.min(axis=1) <= high), axis=1)
+    return triangles[keep]
+
+  # Only triangles inside the other mesh's bounding box can intersect it
+  first = overlapping(first, second)
+  if len(first) == 0:
+    return False
+
+  second = overlapping(second, first)
+  if len(second) == 0:
+    return False
+
+  def edges(triangles):
+    return triangles, np.roll(triangles, -1, axis=1)
+
+  for triangles, others in ((first, second), (second, first)):
+    starts, ends = (edge.reshape(-1, 3) for edge in edges(triangles))
+
+    for index in range(0, len(starts), chunk_size):
+      if segments_cross_triangles(starts[index:index + chunk_size], ends[index:index + chunk_size], others):
+        return True
+
+  return False
+
+class ProxyCollider:
+  """Proxy-level distance and collision queries between components (Links, Tools or anything with a `mesh`).
+
+  Queries are answered with the components' proxies. Exact mesh triangles are only tested when both the capsules
+  and the oriented boxes overlap. Components without a `proxy` attribute are fitted on first use.
+
+  With a `tolerance`, exact tests use the coarsest level of detail of components with `lods` (see
+  robot.visual.filetypes.lod) whose error is within the tolerance.
+  """
+  def __init__(self, tolerance: float = 0) -> None:
+    self.tolerance = tolerance
+    self.proxies   = {}
+    self.triangles = {}
+
+    self.stats = {
+      'queries':       0,
+      'proxy_rejects': 0,
+      'exact_tests':   0
+    }
+
+  def proxy(self, component) -> Optional[Proxy]:
+    key = id(component)
+    if key not in self.proxies:
+      self.proxies[key] = getattr(component, 'proxy', None) or Proxy.fit(self.local_triangles(component))
+
+    return self.proxies[key]
+
+  def local_triangles(self, component) -> np.ndarray:
+    key = id(component)
+    if key not in self.triangles:
+      lods = getattr(component, 'lods', None)
+      mesh = lods.select(self.tolerance) if lods is not None else component.mesh
+
+      self.triangles[key] = mesh_triangles(mesh)
+
+    return self.triangles[key]
+
+  def distance(self, first, first_matrix: np.ndarray, second, second_matrix: np.ndarray) -> float:
+    """Return a lower bound on the distance between two components (the capsule distance)."""
+    first_proxy, second_proxy = self.proxy(first), self.proxy(second)
+    if first_proxy is None or second_proxy is None:
+      return np.inf
+
+    return float(capsule_distance(
+      first_proxy.transform(first_matrix).capsule,
+      second_proxy.transform(second_matrix).capsule
+    ))
+
+  def collide(self, first, first_matrix: np.ndarray, second, second_matrix: np.ndarray) -> bool:
+    """Return True if the components' meshes intersect."""
+    self.stats['queries'] += 1
+
+    first_proxy, second_proxy = self.proxy(first), self.proxy(second)
+    if first_proxy is None or second_proxy is None:
+      return False
+
+    first_proxy  = first_proxy.transform(first_matrix)
+    second_proxy = second_proxy.transform(second_matrix)
+
+    if capsule_distance(first_proxy.capsule, second_proxy.capsule) > 0 or not boxes_overlap(first_proxy.box, second_proxy.box):
+      self.stats['proxy_rejects'] += 1
+      return False
+
+    self.stats['exact_tests'] += 1
+
+    return triangles_intersect(
+      transform_points(first_matrix,  self.local_triangles(first)),
+      transform_points(second_matrix, self.local_triangles(second))
+    )
+
+class ProxyClearance:
+  """Clearance between Serial components and static obstacles using capsule proxies.
+
+  Obstacles are Proxies in world space (e.g., `Proxy.fit` of a fixture's triangles). Usable with ContinuousChecker.
+  """
+  def __init__(self, components: Iterable, obstacles: Iterable[Proxy]) -> None:
+    collider = ProxyCollider()
+
+    self.proxies   = [collider.proxy(component) for component in components]
+    self.obstacles = list(obstacles)
+
+  def __call__(self, matrices: np.ndarray) -> np.ndarray:
+    """Return the clearance of each component given (C, 4, 4) component world matrices."""
+    clearance = np.full(len(self.proxies), np.inf)
+
+    if not self.obstacles:
+      return clearance
+
+    obstacle_starts = np.array([obstacle.capsule.start  for obstacle in self.obstacles])
+    obstacle_ends   = np.array([obstacle.capsule.end    for obstacle in self.obstacles])
+    obstacle_radii  = np.array([obstacle.capsule.radius for obstacle in self.obstacles])
+
+    for index, (proxy, matrix) in enumerate(zip(self.proxies, matrices)):
+      if proxy is None:
+        continue
+
+      distances = capsule_distance(
+        proxy.transform(matrix).capsule,
+        Capsule(obstacle_starts, obstacle_ends, obstacle_radii)
+      )
+
+      clearance[index] = distances.min()
+
+    return clearance
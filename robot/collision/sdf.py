@@ -0,0 +1,196 @@
+import hashlib, json, math, os
+
+import numpy as np
+
+from typing import Iterable, List
+
+from spatial    import Mesh
+from .geometry  import mesh_triangles, transform_points
+from .occupancy import OccupancyGrid, distance_transform
+
+class SignedDistanceField:
+  """Signed distance to a mesh sampled on a regular grid (negative inside closed volumes).
+
+  Sample (i, j, k) is taken at the voxel center origin + voxel_size * ([i, j, k] + 0.5).
+  Lookups interpolate trilinearly and are accurate to about one voxel size.
+  """
+  def __init__(self, origin: np.ndarray, voxel_size: float, values: np.ndarray) -> None:
+    self.origin     = np.asarray(origin, dtype=float)
+    self.voxel_size = float(voxel_size)
+    self.values     = values
+
+  @classmethod
+  def from_triangles(cls, triangles: np.ndarray, voxel_size: float, padding: int = 3) -> 'SignedDistanceField':
+    """Compute the field of (F, 3, 3) triangles. Open meshes have no inside, so all of their values are positive."""
+    if len(triangles) == 0:
+      # Nothing to be close to: a single infinite sample
+      return cls(np.zeros(3), voxel_size, np.full((1, 1, 1), np.inf, dtype=np.float32))
+
+    grid = OccupancyGrid.from_triangles(triangles, voxel_size, padding=padding, distances=False)
+    occupied = grid.occupied
+
+    # The surface lies between occupied and empty voxel centers (i.e., half a voxel from both)
+    outside = distance_transform(occupied, voxel_size) - voxel_size / 2
+    inside  = distance_transform(~occupied, voxel_size) - voxel_size / 2
+
+    return cls(grid.origin, voxel_size, np.where(occupied, -inside, outside).astype(np.float32))
+
+  @classmethod
+  def from_mesh(cls, mesh: Mesh, voxel_size: float, **kwargs) -> 'SignedDistanceField':
+    """Compute the field of a Mesh in its own (i.e., local) frame."""
+    return cls.from_triangles(mesh_triangles(mesh), voxel_size, **kwargs)
+
+  @property
+  def shape(self) -> tuple:
+    return self.values.shape
+
+  def __call__(self, points: np.ndarray, matrix: np.ndarray = None) -> np.ndarray:
+    """Return signed distances for (..., 3) points, first transformed by the (4, 4) `matrix` if one is given.
+
+    Points outside the grid return a lower bound from the distance to the grid's sample box.
+    """
+    points = np.asarray(points, dtype=float)
+    if matrix is not None:
+      points = transform_points(matrix, points)
+
+    if self.values.size == 1:
+      return np.full(points.shape[:-1], float(self.values.flat[0]))
+
+    shape = np.array(self.shape)
+
+    # Continuous sample coordinates (sample centers sit on integers)
+    coordinates = (points - self.origin) / self.voxel_size - 0.5
+    clamped = np.clip(coordinates, 0, shape - 1)
+
+    lower = np.minimum(np.floor(clamped).astype(int), np.maximum(shape - 2, 0))
+    fraction = clamped - lower
+    upper = np.minimum(lower + 1, shape - 1)
+
+    x = (lower[..., 0], upper[..., 0])
+    y = (lower[..., 1], upper[..., 1])
+    z = (lower[..., 2], upper[..., 2])
+    fx, fy, fz = np.moveaxis(fraction, -1, 0)
+
+    # Interpolate along x, then y, then z
+    c00 = self.values[x[0], y[0], z[0]] * (1 - fx) + self.values[x[1], y[0], z[0]] * fx
+    c10 = self.values[x[0], y[1], z[0]] * (1 - fx) + self.values[x[1], y[1], z[0]] * fx
+    c01 = self.values[x[0], y[0], z[1]] * (1 - fx) + self.values[x[1], y[0], z[1]] * fx
+    c11 = self.values[x[0], y[1], z[1]] * (1 - fx) + self.values[x[1], y[1], z[1]] * fx
+
+    values = (c00 * (1 - fy) + c10 * fy) * (1 - fz) + (c01 * (1 - fy) + c11 * fy) * fz
+
+    # The field at the nearest sample point bounds the field at an outside point (it is 1-Lipschitz)
+    offset = np.linalg.norm(coordinates - clamped, axis=-1) * self.voxel_size
+
+    return np.where(offset > 0, np.maximum(offset, values - offset), values)
+
+# Bump when the field computation changes so that cached fields are rebuilt
+FIELD_VERSION = 1
+
+def mesh_digest(meshes: Iterable[Mesh], parameters: dict) -> str:
+  """Return a hash of the meshes' triangles and the field parameters (keyed like MeshCache's source_digest)."""
+  digest = hashlib.sha256(json.dumps([FIELD_VERSION, parameters], sort_keys=True).encode())
+
+  for mesh in meshes:
+    triangles = np.ascontiguousarray(mesh_triangles(mesh), dtype=np.float32)
+    # Separate meshes so that moving triangles between them changes the hash
+    digest.update(np.int64(len(triangles)).tobytes())
+    digest.update(triangles.tobytes())
+
+  return digest.hexdigest()
+
+def save_fields(file_path: str, fields: Iterable[SignedDistanceField], source: str = None) -> None:
+  """Save signed distance fields (and optionally the digest of their source meshes) to one compressed npz file."""
+  arrays = {} if source is None else {'source': np.array(source)}
+  for index, field in enumerate(fields):
+    arrays[f'origin_{index}']     = field.origin
+    arrays[f'voxel_size_{index}'] = field.voxel_size
+    arrays[f'values_{index}']     = field.values
+
+  np.savez_compressed(file_path, **arrays)
+
+def load_fields(file_path: str) -> List[SignedDistanceField]:
+  """Load signed distance fields saved with `save_fields`."""
+  with np.load(file_path) as data:
+    count = sum(1 for name in data.files if name.startswith('values_'))
+
+    return [
+      SignedDistanceField(data[f'origin_{index}'], data[f'voxel_size_{index}'], data[f'values_{index}'])
+      for index in range(count)
+    ]
+
+class FieldCache:
+  """Signed distance fields of a list of meshes, computed on first use and cached in an npz file.
+
+  A cached file is only reused when its digest matches the meshes' triangles and the voxel size, so edited or replaced
+  meshes rebuild their fields.
+  """
+  def __init__(self, file_path: str, meshes: Iterable[Mesh], voxel_size: float) -> None:
+    self.file_path  = file_path
+    self.meshes     = list(meshes)
+    self.voxel_size = voxel_size
+    self._fields    = None
+    self._digest    = None
+
+  @property
+  def fields(self) -> List[SignedDistanceField]:
+    if self._fields is None:
+      self._fields = self._load() or self._build()
+
+    return self._fields
+
+  @property
+  def digest(self) -> str:
+    if self._digest is None:
+      self._digest = mesh_digest(self.meshes, {'voxel_size': self.voxel_size})
+
+    return self._digest
+
+  def _load(self) -> List[SignedDistanceField]:
+    if not os.path.exists(self.file_path):
+      return None
+
+    with np.load(self.file_path) as data:
+      source = str(data['source']) if 'source' in data.files else None
+
+    if source != self.digest:
+      return None
+
+    fields = load_fields(self.file_path)
+    matches = len(fields) == len(self.meshes) and all(math.isclose(field.voxel_size, self.voxel_size) for field in fields)
+
+    return fields if matches else None
+
+  def _build(self) -> List[SignedDistanceField]:
+    fields = [SignedDistanceField.from_mesh(mesh, self.voxel_size) for mesh in self.meshes]
+
+    try:
+      save_fields(self.file_path, fields, self.digest)
+    except OSError:
+      # The cache is an optimization; an unwritable model directory only costs a rebuild next time
+      pass
+
+    return fields
+
+  def __getitem__(self, index: int) -> SignedDistanceField:
+    return self.fields[index]
+
+  def __len__(self) -> int:
+    return len(self.meshes)
+
+  def lazy(self) -> List['LazyField']:
+    """Return a placeholder per mesh that loads (or computes) the fields on its first lookup."""
+    return [LazyField(self, index) for index in range(len(self))]
+
+class LazyField:
+  """Stand-in for a cached SignedDistanceField that defers loading the cache until it is first used."""
+  def __init__(self, cache: FieldCache, index: int) -> None:
+    self.cache = cache
+    self.index = index
+
+  @property
+  def field(self) -> SignedDistanceField:
+    return self.cache[self.index]
+
+  def __call__(self, points: np.ndarray, matrix: np.ndarray = None) -> np.ndarray:
+    return self.field(points, matrix)
@@ -1,6 +1,9 @@
-from typing import Union
+import numpy as np
+
+from typing import Iterable, Tuple, Union
 
 from robot.mech                         import Link, Serial, Tool
+from robot.mech.kinematics              import chain, column_major, dh_matrices, transform_matrices
 from spatial                            import Matrix4, Transform
 from robot.visual                       import Camera, Renderer
 from robot.visual.opengl.shader_program import ShaderProgram
@@ -13,6 +16,38 @@ def serial(serial: Serial, sp: ShaderProgram, color = None):
   sp.uniforms.link_colors     = [link.color for link in serial.links]
   sp.uniforms.robot_color     = color
 
+# Per robot data of the `serial_instanced` shader's storage block (std430 layout, matrices column-major)
+SERIAL_INSTANCE_DTYPE = np.dtype([
+  ('model_matrices', np.float32, (7, 4, 4)),
+  ('link_colors',    np.float32, (7, 4)),
+  ('robot_color',    np.float32, (4,))
+])
+
+def serial_instances(instances: Iterable[Tuple[Serial, dict]]) -> np.ndarray:
+  """Pack every Serial's link matrices and colors (see `serial`) for one instanced draw."""
+  data = np.zeros(len(instances), dtype=SERIAL_INSTANCE_DTYPE)
+  if len(instances) == 0:
+    return data
+
+  serials = [serial for serial, _ in instances]
+
+  dh = serials[0].dh
+  if all(np.array_equal(serial.dh, dh) for serial in serials):
+    # Robots of one model share DH parameters so all of their links are chained in one batch
+    bases = transform_matrices([serial.to_world for serial in serials])
+    matrices = chain(bases, dh_matrices(dh, np.array([serial.angles for serial in serials], dtype=float)))
+  else:
+    matrices = np.array([serial.matrices_at(serial.angles) for serial in serials])
+
+  # Column-major since GLSL matrices are column-major
+  data['model_matrices'][:, :matrices.shape[1]] = column_major(matrices).reshape(*matrices.shape)
+
+  for index, (serial, kwargs) in enumerate(instances):
+    data['link_colors'][index, :len(serial.links), :3] = [link.color or [1, 1, 1] for link in serial.links]
+    data['robot_color'][index, :3] = kwargs.get('color', None) or [1, 1, 1]
+
+  return data
+
 def serial_add_children(renderer: Renderer, serial: Serial):
   # renderer.add_many('frame', serial.links, None, scale=(15,) * len(serial.links))
   # renderer.add_many('com', serial.links, None)
@@ -0,0 +1,103 @@
+import numpy as np
+
+from typing import Iterable
+
+from spatial import Matrix4, Transform
+
+def transform_matrix(transform: Transform) -> np.ndarray:
+  """Return the 4x4 homogeneous matrix of a Transform as a (row-major) numpy array."""
+  # Matrix4 stores elements column-major so the reshaped array must be transposed
+  return np.array(Matrix4.from_transform(transform).elements, dtype=float).reshape(4, 4).T
+
+def dual_quaternions(transforms: Iterable[Transform]) -> np.ndarray:
+  """Return the (N, 8) real and dual (r, x, y, z) quaternion components of Transforms."""
+  return np.array([
+    (t.dual.r.r, t.dual.r.x, t.dual.r.y, t.dual.r.z, t.dual.d.r, t.dual.d.x, t.dual.d.y, t.dual.d.z)
+    for t in transforms
+  ], dtype=float).reshape(-1, 8)
+
+def dual_quaternion_matrices(dual_quaternions: np.ndarray) -> np.ndarray:
+  """Return the (..., 4, 4) row-major matrices of (..., 8) unit dual quaternions."""
+  w, x, y, z, dw, dx, dy, dz = np.moveaxis(dual_quaternions, -1, 0)
+
+  matrices = np.zeros(w.shape + (4, 4))
+
+  matrices[..., 0, 0] = 1 - 2 * (y * y + z * z)
+  matrices[..., 0, 1] = 2 * (x * y - w * z)
+  matrices[..., 0, 2] = 2 * (x * z + w * y)
+
+  matrices[..., 1, 0] = 2 * (x * y + w * z)
+  matrices[..., 1, 1] = 1 - 2 * (x * x + z * z)
+  matrices[..., 1, 2] = 2 * (y * z - w * x)
+
+  matrices[..., 2, 0] = 2 * (x * z - w * y)
+  matrices[..., 2, 1] = 2 * (y * z + w * x)
+  matrices[..., 2, 2] = 1 - 2 * (x * x + y * y)
+
+  # Translation is the vector part of 2 d r*
+  matrices[..., 0, 3] = 2 * (-dw * x + dx * w - dy * z + dz * y)
+  matrices[..., 1, 3] = 2 * (-dw * y + dx * z + dy * w - dz * x)
+  matrices[..., 2, 3] = 2 * (-dw * z - dx * y + dy * x + dz * w)
+
+  matrices[..., 3, 3] = 1
+
+  return matrices
+
+def transform_matrices(transforms: Iterable[Transform]) -> np.ndarray:
+  """Return the (N, 4, 4) row-major matrices of Transforms (the batched `transform_matrix`)."""
+  return dual_quaternion_matrices(dual_quaternions(transforms))
+
+def column_major(matrices: np.ndarray) -> np.ndarray:
+  """Return (..., 4, 4) row-major matrices as (..., 16) column-major float32 rows (i.e., OpenGL's layout)."""
+  matrices = np.asarray(matrices)
+
+  return np.ascontiguousarray(np.swapaxes(matrices, -1, -2), dtype=np.float32).reshape(*matrices.shape[:-2], 16)
+
+def dh_matrices(dh: np.ndarray, angles: np.ndarray) -> np.ndarray:
+  """Return the joint DH transformation matrices for a batch of joint angles.
+
+  `dh` is a (J, 4) array of (alpha, a, theta, d) rows and `angles` is a (..., J) array.
+  The result has shape (..., J, 4, 4).
+  """
+  alpha, a, theta, d = dh.T
+
+  # Same sequence as Joint.transform_at: Translate_z(d), Rotate_z(theta), Translate_x(a), Rotate_x(alpha)
+  q = theta + angles
+
+  ct, st = np.cos(q), np.sin(q)
+  ca, sa = np.cos(alpha), np.sin(alpha)
+
+  matrices = np.zeros(q.shape + (4, 4))
+
+  matrices[..., 0, 0] = ct
+  matrices[..., 0, 1] = -st * ca
+  matrices[..., 0, 2] = st * sa
+  matrices[..., 0, 3] = a * ct
+
+  matrices[..., 1, 0] = st
+  matrices[..., 1, 1] = ct * ca
+  matrices[..., 1, 2] = -ct * sa
+  matrices[..., 1, 3] = a * st
+
+  matrices[..., 2, 1] = sa
+  matrices[..., 2, 2] = ca
+  matrices[..., 2, 3] = d
+
+  matrices[..., 3, 3] = 1
+
+  return matrices
+
+def chain(base: np.ndarray, joint_matrices: np.ndarray) -> np.ndarray:
+  """Accumulate (..., J, 4, 4) joint matrices onto a (4, 4) base matrix.
+
+  The result has shape (..., J + 1, 4, 4) with the base matrix first.
+  """
+  *batch, number_of_joints, _, _ = joint_matrices.shape
+
+  matrices = np.empty((*batch, number_of_joints + 1, 4, 4))
+  matrices[..., 0, :, :] = base
+
+  for index in range(number_of_joints):
+    matrices[..., index + 1, :, :] = matrices[..., index, :, :] @ joint_matrices[..., index, :, :]
+
+  return matrices
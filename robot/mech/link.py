@@ -1,17 +1,20 @@
 import math
 
+import numpy as np
+
 from collections import namedtuple
 from typing      import Iterable, Optional
 
 from spatial       import AABB, Intersection, Mesh, Ray, Transform, Vector3
 from .joint        import Joint
+from .kinematics   import transform_matrix
 
 PhysicalProperties = namedtuple('PhysicalProperties', 'com moments volume', defaults=(None, None, None))
 
 Moments = namedtuple('Moments', 'ixx iyy izz ixy iyz ixz', defaults=(0,) * 6)
 
 class Link:
-  def __init__(self, name: str, joint: Joint, mesh: Mesh, color: Iterable[float]) -> None:
+  def __init__(self, name: str, joint: Joint, mesh: Mesh, color: Iterable[float], proxy: 'Proxy' = None, sdf: 'SignedDistanceField' = None) -> None:
     # TODO: Mass/density
     # Previous links DH frame transformation
     self.previous = Transform.Identity()
@@ -19,15 +22,32 @@ class Link:
     self.name = name
     self.mesh = mesh
     self.color = color
+    # Simplified collision geometry in the Link frame (see robot.collision.proxy)
+    self.proxy = proxy
+    # Signed distance field of the Mesh in the Link frame (see robot.collision.sdf)
+    self.sdf = sdf
+    # Optional level of detail chain of the Mesh (see robot.visual.filetypes.lod)
+    self.lods = None
 
     self._properties = PhysicalProperties()
 
   @classmethod
-  def from_dict_mesh(cls, d: dict, mesh: Mesh) -> 'Link':
+  def from_dict_mesh(cls, d: dict, mesh: Mesh, proxy: 'Proxy' = None, sdf: 'SignedDistanceField' = None) -> 'Link':
     """Construct a Link from a dictionary of parameters."""
     joint = Joint.Immovable() if d.get('joint', None) is None else Joint.from_dict(d['joint'])
 
-    return cls(d.get('name', None), joint, mesh, d.get('color', None))
+    return cls(d.get('name', None), joint, mesh, d.get('color', None), proxy, sdf)
+
+  @property
+  def previous(self) -> Transform:
+    return self._previous
+
+  @previous.setter
+  def previous(self, transform: Transform) -> None:
+    self._previous = transform
+    # Serial reassigns `previous` whenever any joint moves so this also catches changes to this Link's joint
+    self._to_link = None
+    self._aabb    = None
 
   @property
   def to_world(self) -> Transform:
@@ -37,10 +57,30 @@ class Link:
     """
     return self.previous * self.joint.transform
 
+  @property
+  def to_link(self) -> np.ndarray:
+    """Return the (cached) 4x4 matrix from world space to the Link frame."""
+    if self._to_link is None:
+      self._to_link = transform_matrix(self.to_world.inverse())
+
+    return self._to_link
+
+  def distance(self, points: np.ndarray) -> np.ndarray:
+    """Return signed distances from (..., 3) world space points to the Link Mesh (negative inside).
+
+    Requires a signed distance field (see robot.collision.sdf).
+    """
+    assert self.sdf is not None, f'Link {self.name} has no signed distance field'
+
+    return self.sdf(points, self.to_link)
+
   @property
   def aabb(self) -> AABB:
-    """Return the Link Mesh's AABB in world space."""
-    return AABB([self.to_world(corner) for corner in self.mesh.aabb.corners])
+    """Return the (cached) Link Mesh's AABB in world space."""
+    if self._aabb is None:
+      self._aabb = AABB([self.to_world(corner) for corner in self.mesh.aabb.corners])
+
+    return self._aabb
 
   @property
   def properties(self) -> PhysicalProperties:
@@ -54,6 +94,10 @@ class Link:
       volume  = self._properties.volume
     )
 
+  def set_properties(self, properties: PhysicalProperties) -> None:
+    """Use precomputed physical properties (in the Link frame) instead of calculating them from the Mesh."""
+    self._properties = properties
+
   def calculate_properties(self) -> None:
     """Calculate the center of mass, moments, and volume of the Mesh.
 
@@ -1,13 +1,25 @@
 import json
 
-from robot.mech    import Serial
-from spatial       import Mesh
-from robot.visual  import STLParser
+from robot.collision import FieldCache, load_proxies
+from robot.mech      import Serial
+from robot.visual    import MeshCache, lazy_meshes
 
 with open('./robot/mech/robots/abb_irb_120.json') as json_file:
   serial_dictionary = json.load(json_file)
 
 if 'mesh_file' in serial_dictionary.keys():
-  meshes = Mesh.from_file(STLParser(), f'./robot/mech/robots/meshes/{serial_dictionary["mesh_file"]}')
+  # Meshes are only read when something needs them (kinematics does not)
+  mesh_path = f'./robot/mech/robots/meshes/{serial_dictionary["mesh_file"]}'
+  meshes = lazy_meshes(lambda: MeshCache().load(mesh_path), len(serial_dictionary['links']))
 
-ABB_IRB_120 = Serial.from_dict_meshes(serial_dictionary, meshes or [])
+proxies = None
+if 'proxy_file' in serial_dictionary.keys():
+  proxies = load_proxies(f'./robot/mech/robots/meshes/{serial_dictionary["proxy_file"]}')
+
+fields = None
+if 'sdf_file' in serial_dictionary.keys():
+  # Distance fields are computed the first time they are used and then cached next to the model
+  sdf_path = f'./robot/mech/robots/meshes/{serial_dictionary["sdf_file"]}'
+  fields = FieldCache(sdf_path, meshes or [], serial_dictionary.get('sdf_voxel_size', 4)).lazy()
+
+ABB_IRB_120 = Serial.from_dict_meshes(serial_dictionary, meshes or [], proxies, fields)
@@ -1,13 +1,18 @@
 import itertools, math
 
+import numpy as np
+
 from typing import Iterable
 
 from spatial           import AABB, Intersection, Mesh, Ray, Transform, Vector3
 from .exceptions       import InvalidSerialDictError
+from .kinematics       import chain, dh_matrices, transform_matrix
 from .joint            import Joint
-from .link             import Link
+from .link             import Link, Moments, PhysicalProperties
 from .tool             import Tool
 
+from robot.visual.filetypes.packed_model import PackedModel
+
 class Serial:
   def __init__(self, links):
     self.links = links
@@ -18,21 +23,50 @@ class Serial:
     self.update_link_transforms()
 
   @classmethod
-  def from_dict_meshes(cls, d: dict, meshes: Iterable[Mesh]) -> 'Serial':
-    """Construct a Serial robot from provided dictionary and meshes.
+  def from_dict_meshes(cls, d: dict, meshes: Iterable[Mesh] = None, proxies: Iterable['Proxy'] = None, fields: Iterable['SignedDistanceField'] = None) -> 'Serial':
+    """Construct a Serial robot from provided dictionary and meshes (and, optionally, collision proxies and distance fields).
 
+    `d` may also be a PackedModel, which provides the dictionary, meshes, proxies, mass properties and LODs.
     If there are more Links than Meshes, the Link is provided an empty Mesh."""
+    if isinstance(d, PackedModel):
+      return cls.from_packed(d, fields)
+
     link_dictionary = d.get('links', None)
     if not link_dictionary or not isinstance(link_dictionary, (list, tuple)):
       raise InvalidSerialDictError
 
-    return cls(
-      [
-        Link.from_dict_mesh(link, mesh)
-        for link, mesh
-        in itertools.zip_longest(link_dictionary, meshes, fillvalue=Mesh())
-      ]
-    )
+    # Links without a proxy or distance field get None
+    missing = itertools.repeat(None)
+
+    links = [
+      Link.from_dict_mesh(link, mesh, proxy, field)
+      for (link, mesh), proxy, field
+      in zip(
+        itertools.zip_longest(link_dictionary, meshes or [], fillvalue=Mesh()),
+        itertools.chain(proxies or [], missing),
+        itertools.chain(fields or [], missing)
+      )
+    ]
+
+    return cls(links)
+
+  @classmethod
+  def from_packed(cls, packed: PackedModel, fields: Iterable['SignedDistanceField'] = None) -> 'Serial':
+    """Construct a Serial robot from a packed model file (see robot.visual.filetypes.packed_model)."""
+    serial = cls.from_dict_meshes(packed.model, packed.meshes(), packed.proxies(), fields)
+
+    for index, (link, properties) in enumerate(zip(serial.links, packed.properties())):
+      link.lods = packed.lods(index)
+
+      # Skip empty meshes so that they behave as they would unpacked
+      if properties['volume'] != 0:
+        link.set_properties(PhysicalProperties(
+          com     = Vector3(*properties['com'].tolist()),
+          moments = Moments(*properties['moments'].tolist()),
+          volume  = float(properties['volume'])
+        ))
+
+    return serial
 
   def checkStructure(self):
     # TODO: Check the structure of the robot to see if it is 6R with spherical wrist
@@ -51,6 +85,11 @@ class Serial:
     """Return a list of robot Joint objects."""
     return [link.joint for link in self.links[1:]]
 
+  @property
+  def components(self) -> list:
+    """Return all Links followed by the Tool (if one is attached)."""
+    return [*self.links, self.tool] if self.tool else [*self.links]
+
   @property
   def base(self) -> Link:
     """Return the robot's base Link."""
@@ -108,11 +147,7 @@ class Serial:
     if not self.aabb.intersect(ray):
       return Intersection.Miss()
 
-    components = [*self.links]
-    if self.tool:
-      components.append(self.tool)
-
-    return ray.closest_intersection(components)
+    return ray.closest_intersection(self.components)
 
   def update_link_transforms(self):
     # Walk the chain updating each link with it's previous neighbors transform
@@ -142,6 +177,21 @@ class Serial:
   def poses(self) -> list:
     return [link.to_world for link in self.links]
 
+  @property
+  def dh(self) -> np.ndarray:
+    """Return a (J, 4) array of (alpha, a, theta, d) DH parameters for the movable joints."""
+    return np.array([joint.dh for joint in self.joints], dtype=float)
+
+  def matrices_at(self, angles) -> np.ndarray:
+    """Return the world space matrices of every Link for one or many sets of joint angles.
+
+    `angles` has shape (..., J) and the result has shape (..., J + 1, 4, 4) (the base Link first).
+    Unlike `pose_at`, this does not include the Tool tip transformation.
+    """
+    angles = np.asarray(angles, dtype=float)
+
+    return chain(transform_matrix(self.to_world), dh_matrices(self.dh, angles))
+
   def upper_arm_length(self):
     return self.links[2].joint.dh.a
 
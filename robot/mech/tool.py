@@ -2,7 +2,12 @@ import json, math, os
 
 from spatial import AABB, Intersection, Mesh, Quaternion, Ray, Transform, Vector3
 from spatial.euler import Axes, Order
-from robot.visual.filetypes.stl.stl_parser import STLParser
+from robot.collision.proxy import load_proxies
+from robot.visual.filetypes.lazy_mesh    import LazyMesh
+from robot.visual.filetypes.mesh_cache   import MeshCache
+from robot.visual.filetypes.mesh_loader  import MeshSource
+from robot.visual.filetypes.packed_model import PACKED_EXTENSION, PackedModel
+from .kinematics import transform_matrix
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
@@ -23,37 +28,87 @@ def from_json(payload) -> 'Transform':
     #   Maybe we can choose a default instead of just erroring out.
     raise
 
-def load(file_path: str) -> 'Tool':
+def load(file_path: str, loader: 'MeshLoader' = None) -> 'Tool':
+  """Load a Tool from a description file.
+
+  With a MeshLoader the mesh starts loading in the background right away; otherwise it is read when first used.
+  """
+  if file_path.endswith(PACKED_EXTENSION):
+    return load_packed(file_path)
+
   with open(file_path) as json_file:
     data = json.load(json_file)
 
   mesh_transform = from_json(data['mesh']['transform'])
 
-  stl_parser = STLParser()
-  mesh, *_ = Mesh.from_file(stl_parser, f'{dir_path}/tools/meshes/{data["mesh"]["file"]}')
+  # Move the mesh onto a useful origin position if the modeler decided to include positional or rotational offsets
+  # The cache stores the mesh after scaling and transformation
+  source = MeshSource(f'{dir_path}/tools/meshes/{data["mesh"]["file"]}', data["mesh"]["scale"], mesh_transform)
 
-  mesh = mesh.scale(data["mesh"]["scale"])
+  if loader is not None:
+    load_meshes = loader.submit(source).result
+  else:
+    load_meshes = lambda: MeshCache().load(source.file_path, scale=source.scale, transform=source.transform)
 
-  # Move the mesh onto a useful origin position if the modeler decided to include positional or rotational offsets
-  mesh = mesh.transform(mesh_transform)
+  # Nothing waits on the mesh until it is first used (kinematics only needs the tip transform)
+  mesh = LazyMesh(lambda: load_meshes()[0])
+
+  proxy = None
+  if 'proxy_file' in data['mesh']:
+    proxy, *_ = load_proxies(f'{dir_path}/tools/meshes/{data["mesh"]["proxy_file"]}')
+
+    # Proxies are fit to the mesh file so they must be scaled and moved the same way as the mesh (entries may be null)
+    if proxy is not None:
+      proxy = proxy.scale(data["mesh"]["scale"]).transform(transform_matrix(mesh_transform))
 
   tip_transform = from_json(data['tip_transform'])
 
-  return Tool(data['name'], tip_transform, mesh)
+  return Tool(data['name'], tip_transform, mesh, proxy)
+
+def load_packed(file_path: str) -> 'Tool':
+  """Load a Tool from a packed model file (see robot.visual.filetypes.packed_model).
+
+  The packed mesh and proxy are already scaled and transformed so the description's mesh transform is not applied.
+  """
+  packed = PackedModel(file_path)
+  data = packed.model
+
+  (mesh, *_), (proxy, *_) = packed.meshes(), packed.proxies()
+
+  tool = Tool(data['name'], from_json(data['tip_transform']), mesh, proxy)
+  tool.lods = packed.lods(0)
+
+  return tool
 
 class Tool:
   """Attachable robot end effector."""
-  def __init__(self, name: str, tip: Transform, mesh: 'Mesh') -> None:
+  def __init__(self, name: str, tip: Transform, mesh: 'Mesh', proxy: 'Proxy' = None) -> None:
     self.name = name
     # Transformation of the tool origin to world space
     self.to_world = Transform.from_axis_angle_translation()
     self._tip = tip
     self.mesh = mesh
+    # Simplified collision geometry in the Tool frame (see robot.collision.proxy)
+    self.proxy = proxy
+    # Optional level of detail chain of the Mesh (see robot.visual.filetypes.lod)
+    self.lods = None
+
+  @property
+  def to_world(self) -> Transform:
+    return self._to_world
+
+  @to_world.setter
+  def to_world(self, transform: Transform) -> None:
+    self._to_world = transform
+    self._aabb     = None
 
   @property
   def aabb(self) -> AABB:
-    """Return the Tool's Mesh AABB in world space."""
-    return AABB([self.to_world(corner) for corner in self.mesh.aabb.corners])
+    """Return the (cached) Tool's Mesh AABB in world space."""
+    if self._aabb is None:
+      self._aabb = AABB([self.to_world(corner) for corner in self.mesh.aabb.corners])
+
+    return self._aabb
 
   @property
   def tip(self) -> Transform:
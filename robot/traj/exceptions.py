@@ -0,0 +1,11 @@
+from robot.exceptions import RobotError
+
+class UnreachableWaypointError(RobotError):
+  def __init__(self, time: float, position):
+    self.time     = time
+    self.position = position
+    super().__init__(f'No inverse kinematic solution for the path point at time {time:.3f} ({position})')
+
+class EmptyTrajectoryError(RobotError):
+  def __init__(self):
+    super().__init__('Trajectory has no waypoints')
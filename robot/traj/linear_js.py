@@ -1,3 +1,5 @@
+import numpy as np
+
 from robot.traj.trajectory_js import TrajectoryJS
 from robot.traj.utils         import interpolate
 
@@ -28,3 +30,7 @@ class LinearJS(TrajectoryJS):
     self.position = min(max(self.position, 0), 1)
 
     return [interpolate(start, end, self.position) for start, end in zip(self.starts, self.ends)]
+
+  def waypoints(self):
+    '''Return (times, angles) arrays of the joint space waypoints. Joint angles are linear between waypoints.'''
+    return np.array([0, self.duration], dtype=float), np.array([self.starts, self.ends], dtype=float)
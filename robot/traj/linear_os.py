@@ -1,7 +1,10 @@
 import math
 
+import numpy as np
+
 from robot.ik.angles          import solve_angles
 from spatial                  import Dual, Quaternion, Transform, Vector3
+from robot.traj.exceptions    import UnreachableWaypointError
 from robot.traj.segment       import ArcSegment, LinearSegment
 from robot.traj.trajectory_js import TrajectoryJS
 from robot.traj.path          import PiecewisePath
@@ -58,9 +61,9 @@ class LinearOS():
     self.path.reverse()
     self.segment_duration.reverse()
 
-  def get_closest_solution(self, solutions):
-    '''Return the closest solution (in joint space) to the current arm position.'''
-    current = self.robot.angles
+  def get_closest_solution(self, solutions, current = None):
+    '''Return the closest solution (in joint space) to the current arm position (or `current` angles, if provided).'''
+    current = current if current is not None else self.robot.angles
 
     least    = math.inf
     solution = None
@@ -105,3 +108,37 @@ class LinearOS():
     solutions = solve_angles(target, self.robot)
 
     return self.get_closest_solution(solutions)
+
+  def waypoints(self, samples_per_segment = 10):
+    '''Return (times, angles) arrays of joint space waypoints sampled along the path.
+
+    Inverse kinematic solutions are chosen closest to the previous sample (starting from the current arm position).
+    Joint angles are only linear between the returned waypoints, so `samples_per_segment` controls how closely the
+    waypoints follow the operational space path.
+
+    Raise UnreachableWaypointError if any sample has no inverse kinematic solution (skipping it would leave a joint
+    space segment across the gap which is not the path the robot runs).
+    '''
+    times  = []
+    angles = []
+
+    current    = self.robot.angles
+    start_time = 0
+    for index, duration in enumerate(self.segment_duration):
+      # Skip the first sample of every segment after the first (it is the previous segment's last sample)
+      first = 0 if index == 0 else 1
+      for t in np.linspace(0, 1, samples_per_segment + 1)[first:]:
+        world_position = self.path.evaluate(index, t)
+        target = Transform.from_orientation_translation(self.target_orientation, world_position)
+
+        solution = self.get_closest_solution(solve_angles(target, self.robot), current)
+        if solution is None:
+          raise UnreachableWaypointError(start_time + t * duration, world_position)
+
+        current = solution
+        times.append(start_time + t * duration)
+        angles.append(solution)
+
+      start_time += duration
+
+    return np.array(times, dtype=float), np.array(angles, dtype=float)
@@ -1,6 +1,12 @@
 from .ambient_light            import AmbientLight
 from .camera                   import Camera
 from .camera_controller        import CameraController, CameraSettings
+from .capture                  import FrameCapture, PNGSequence, RawVideo
+from .headless                 import HeadlessWindow
 from .renderer                 import Renderer
+from .filetypes.lazy_mesh      import LazyMesh, lazy_meshes
+from .filetypes.mesh_cache     import MeshCache
+from .filetypes.mesh_loader    import MeshLoader, MeshSource
+from .filetypes.packed_model   import PackedModel, pack_model
 from .filetypes.stl.stl_parser import STLParser
 from .window                   import Window
\ No newline at end of file
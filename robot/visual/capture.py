@@ -0,0 +1,151 @@
+import os, queue, threading
+
+import numpy as np
+
+from typing import Callable
+
+from OpenGL.GL import *
+
+from robot.common             import logger
+from .filetypes.png           import write_png
+
+class PNGSequence():
+  """Frame sink writing numbered PNG files into a directory."""
+  def __init__(self, directory: str, prefix: str = 'frame') -> None:
+    os.makedirs(directory, exist_ok=True)
+
+    self.directory = directory
+    self.prefix    = prefix
+
+  def __call__(self, pixels: np.ndarray, index: int) -> None:
+    write_png(os.path.join(self.directory, f'{self.prefix}_{index:06d}.png'), pixels)
+
+class RawVideo():
+  """Frame sink writing raw RGBA frames back to back into a binary file object (e.g., an ffmpeg process' stdin)."""
+  def __init__(self, file) -> None:
+    self.file = file
+
+  def __call__(self, pixels: np.ndarray, index: int) -> None:
+    self.file.write(pixels.tobytes())
+
+class FrameCapture():
+  """Asynchronous readback of rendered frames through a ring of pixel buffer objects.
+
+  Each frame starts a glReadPixels into the next pixel buffer and fences it. The oldest pixel buffer is only mapped
+  once its fence has signaled, so the render loop never waits on the GPU; a frame is dropped instead if every pixel buffer
+  is still busy. Finished frames are handed to a background thread which calls `sink(pixels, index)`.
+  """
+  def __init__(self, sink: Callable[[np.ndarray, int], None], ring_size: int = 3, queue_size: int = 8) -> None:
+    self.sink      = sink
+    self.ring_size = ring_size
+
+    self.size      = None
+    self.pbos      = []
+    # Pending readbacks in submission order: (pbo index, fence, frame index)
+    self.pending   = []
+    self.next_pbo  = 0
+    self.frame     = 0
+
+    self.stats = {
+      'captured': 0,
+      'dropped':  0
+    }
+
+    self.queue  = queue.Queue(queue_size)
+    self.thread = threading.Thread(target=self.write_frames, daemon=True)
+    self.thread.start()
+
+  def allocate(self, width: int, height: int) -> None:
+    """(Re)create the pixel buffers for frames of the given size."""
+    self.flush()
+    if self.pbos:
+      glDeleteBuffers(len(self.pbos), self.pbos)
+
+    self.size = (width, height)
+    self.pbos = list(np.atleast_1d(glGenBuffers(self.ring_size)))
+
+    for pbo in self.pbos:
+      glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+      glBufferData(GL_PIXEL_PACK_BUFFER, width * height * 4, None, GL_STREAM_READ)
+
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+  def capture(self, width: int, height: int) -> None:
+    """Start reading back the bound read framebuffer and collect any finished readbacks (call after drawing a frame)."""
+    if self.size != (width, height):
+      self.allocate(width, height)
+
+    self.collect()
+
+    if len(self.pending) == self.ring_size:
+      # Every pixel buffer is still in flight
+      self.stats['dropped'] += 1
+      return
+
+    pbo = self.next_pbo
+    self.next_pbo = (self.next_pbo + 1) % self.ring_size
+
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[pbo])
+    glPixelStorei(GL_PACK_ALIGNMENT, 1)
+    # With a pack buffer bound the pixels go to offset 0 of the buffer and glReadPixels returns immediately
+    glReadPixels(0, 0, width, height, GL_RGBA, GL_UNSIGNED_BYTE, 0)
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+    self.pending.append((pbo, glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0), self.frame))
+    self.frame += 1
+
+  def collect(self, wait: bool = False) -> None:
+    """Read the finished pixel buffers (in order) and queue their frames. Only `wait` blocks on the GPU."""
+    while self.pending:
+      pbo, fence, frame = self.pending[0]
+
+      status = glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, 1_000_000_000 if wait else 0)
+      if status not in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED):
+        return
+
+      self.pending.pop(0)
+      glDeleteSync(fence)
+
+      self.enqueue(self.read(pbo), frame)
+
+  def read(self, pbo: int) -> np.ndarray:
+    width, height = self.size
+
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, self.pbos[pbo])
+    pixels = np.array(glGetBufferSubData(GL_PIXEL_PACK_BUFFER, 0, width * height * 4), dtype=np.uint8)
+    glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+    # OpenGL rows start at the bottom of the image
+    return pixels.reshape(height, width, 4)[::-1]
+
+  def enqueue(self, pixels: np.ndarray, frame: int) -> None:
+    try:
+      self.queue.put_nowait((pixels, frame))
+      self.stats['captured'] += 1
+    except queue.Full:
+      # The sink is slower than the render loop
+      self.stats['dropped'] += 1
+
+  def write_frames(self) -> None:
+    while True:
+      item = self.queue.get()
+      if item is None:
+        return
+
+      try:
+        self.sink(*item)
+      except Exception as e:
+        logger.error(f'Frame capture sink failed: {e}')
+
+  def flush(self) -> None:
+    """Wait for the outstanding readbacks and queue their frames."""
+    self.collect(wait=True)
+
+  def close(self) -> None:
+    """Finish the outstanding readbacks and wait for the sink to write every queued frame."""
+    if self.size is not None:
+      self.flush()
+      glDeleteBuffers(len(self.pbos), self.pbos)
+
+    self.queue.put(None)
+    self.thread.join()
@@ -0,0 +1,110 @@
+import numpy as np
+
+from typing import Iterable, List
+
+from spatial import AABB, Facet, Matrix4, Mesh, Transform, Vector3
+
+# Binary STL facet record (50 bytes, little endian, unaligned)
+FACET_DTYPE = np.dtype([
+  ('normal',    '<f4', (3,)),
+  ('vertices',  '<f4', (3, 3)),
+  ('attribute', '<u2')
+])
+
+class ArrayMesh:
+  """Mesh backed by a structured array of FACET_DTYPE records (e.g., a view into a memory mapped file).
+
+  Array based operations (bounds, scaling, transformation) work on the records directly.
+  Anything else is forwarded to a spatial Mesh which is only constructed on first use.
+  """
+  def __init__(self, name, records: np.ndarray, color: Iterable[float] = None, bounds: tuple = None) -> None:
+    self.name    = name
+    self.records = records
+    self.color   = color
+    # Precomputed (lower, upper) corners of the vertices (e.g., from a mesh cache)
+    self.bounds  = bounds
+    self._mesh   = None
+
+  def __getattr__(self, name: str):
+    # Only called for attributes that ArrayMesh does not define itself
+    if name.startswith('_'):
+      raise AttributeError(name)
+
+    return getattr(self.mesh, name)
+
+  def __len__(self) -> int:
+    return len(self.records)
+
+  @property
+  def mesh(self) -> Mesh:
+    """Return the equivalent spatial Mesh (constructed once)."""
+    if self._mesh is None:
+      self._mesh = Mesh(self.name)
+
+      if self.color is not None:
+        self._mesh.set_color(*self.color)
+
+      for normal, vertices in zip(self.normals.tolist(), self.triangles.tolist()):
+        self._mesh.append(Facet([Vector3(*vertex) for vertex in vertices], Vector3(*normal)))
+
+    return self._mesh
+
+  @property
+  def triangles(self) -> np.ndarray:
+    """Return the (F, 3, 3) facet vertices."""
+    return self.records['vertices']
+
+  @property
+  def normals(self) -> np.ndarray:
+    """Return the (F, 3) facet normals."""
+    return self.records['normal']
+
+  @property
+  def aabb(self) -> AABB:
+    if len(self.records) == 0:
+      return AABB()
+
+    if self.bounds is None:
+      points = self.triangles.reshape(-1, 3)
+      self.bounds = (points.min(axis=0), points.max(axis=0))
+
+    lower, upper = self.bounds
+
+    return AABB([Vector3(*np.asarray(lower).tolist()), Vector3(*np.asarray(upper).tolist())])
+
+  def scale(self, factor: float) -> 'ArrayMesh':
+    """Return a copy of the mesh scaled about the origin."""
+    records = np.array(self.records)
+    records['vertices'] *= factor
+
+    return ArrayMesh(self.name, records, self.color)
+
+  def transform(self, transform: Transform) -> 'ArrayMesh':
+    """Return a copy of the mesh with the transformation applied to its vertices and normals."""
+    # Matrix4 stores elements column-major
+    matrix = np.array(Matrix4.from_transform(transform).elements, dtype=float).reshape(4, 4).T
+
+    records = np.array(self.records)
+    records['vertices'] = self.triangles @ matrix[:3, :3].T + matrix[:3, 3]
+    records['normal']   = self.normals @ matrix[:3, :3].T
+
+    return ArrayMesh(self.name, records, self.color)
+
+def split_records(records: np.ndarray) -> List[ArrayMesh]:
+  """Split FACET_DTYPE records into one ArrayMesh per run of equal attribute values.
+
+  The attribute is used as a mesh id, which allows multiple meshes to be stored in one file.
+  The meshes are views into `records` (i.e., nothing is copied).
+  """
+  attributes = records['attribute']
+
+  starts = np.concatenate(([0], np.flatnonzero(np.diff(attributes)) + 1))
+  ends   = np.append(starts[1:], len(records))
+
+  meshes = [ArrayMesh(int(attributes[start]), records[start:end]) for start, end in zip(starts, ends) if end > start]
+
+  # Facets before the first id change belong to mesh 0 even if there are none of them
+  if not meshes or meshes[0].name != 0:
+    meshes.insert(0, ArrayMesh(0, records[:0]))
+
+  return meshes
@@ -0,0 +1,67 @@
+import math
+
+import numpy as np
+
+from collections import namedtuple
+
+# Unique vertices (positions and normals, both (V, 3)) and (F, 3) triangle indices into them
+IndexedMesh = namedtuple('IndexedMesh', 'positions normals indices')
+
+def group_pairs(groups: np.ndarray):
+  """Return every ordered (first, second) pair of items that share a group id (including an item with itself)."""
+  order = np.argsort(groups, kind='stable')
+  _, starts, sizes = np.unique(groups[order], return_index=True, return_counts=True)
+
+  # Each item pairs with every item of its group
+  item_sizes = np.repeat(sizes, sizes)
+  item_starts = np.repeat(starts, sizes)
+
+  first = np.repeat(order, item_sizes)
+  offsets = np.arange(len(first)) - np.repeat(np.cumsum(item_sizes) - item_sizes, item_sizes)
+  second = order[np.repeat(item_starts, item_sizes) + offsets]
+
+  return first, second
+
+def weld(triangles: np.ndarray, tolerance: float = 1e-4, crease_angle: float = math.radians(30)) -> IndexedMesh:
+  """Deduplicate the corners of (F, 3, 3) triangles into an indexed mesh with per-vertex normals.
+
+  Corners within `tolerance` of each other (on a grid of that size) share a position. A corner's normal averages
+  (weighted by area) the normals of triangles sharing its position that are within `crease_angle` of its own
+  triangle's normal, so sharp edges stay sharp. Corners that end up with the same position and normal are merged.
+  """
+  triangles = np.asarray(triangles, dtype=float).reshape(-1, 3, 3)
+  corners = triangles.reshape(-1, 3)
+
+  if len(corners) == 0:
+    return IndexedMesh(np.zeros((0, 3), np.float32), np.zeros((0, 3), np.float32), np.zeros((0, 3), np.uint32))
+
+  _, position_ids = np.unique(np.round(corners / tolerance).astype(np.int64), axis=0, return_inverse=True)
+  position_ids = position_ids.ravel()
+
+  # Length of the cross product is twice the area, which makes it the area weighted normal
+  weighted = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+  lengths = np.linalg.norm(weighted, axis=1, keepdims=True)
+  facet_normals = np.divide(weighted, lengths, out=np.zeros_like(weighted), where=lengths > 0)
+
+  corner_facets = np.repeat(np.arange(len(triangles)), 3)
+
+  first, second = group_pairs(position_ids)
+  first_facets, second_facets = corner_facets[first], corner_facets[second]
+
+  smooth = np.einsum('ij,ij->i', facet_normals[first_facets], facet_normals[second_facets]) >= math.cos(crease_angle)
+
+  normals = np.zeros_like(corners)
+  np.add.at(normals, first[smooth], weighted[second_facets[smooth]])
+
+  lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+  normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+  # Merge corners with the same position and (nearly) the same normal
+  keys = np.column_stack((position_ids, np.round(normals * 1e4).astype(np.int64)))
+  _, unique_corners, indices = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+
+  return IndexedMesh(
+    positions = corners[unique_corners].astype(np.float32),
+    normals   = normals[unique_corners].astype(np.float32),
+    indices   = indices.ravel().reshape(-1, 3).astype(np.uint32)
+  )
@@ -0,0 +1,49 @@
+import functools
+
+from typing import Callable, List
+
+from spatial import Mesh
+
+class LazyMesh:
+  """Stand-in for a Mesh that is only loaded when it is first used (e.g., rendering, intersection, or mass properties).
+
+  Kinematics never touches a Link or Tool mesh, so users that only need kinematics never read mesh files.
+  """
+  def __init__(self, loader: Callable[[], Mesh]) -> None:
+    self._loader = loader
+    self._mesh   = None
+
+  def __getattr__(self, name: str):
+    # Only called for attributes that LazyMesh does not define itself
+    if name.startswith('_'):
+      raise AttributeError(name)
+
+    return getattr(self.mesh, name)
+
+  def __len__(self) -> int:
+    return len(self.mesh)
+
+  @property
+  def is_loaded(self) -> bool:
+    return self._mesh is not None
+
+  @property
+  def mesh(self) -> Mesh:
+    """Return the loaded mesh (loading it first if needed)."""
+    if self._mesh is None:
+      self._mesh = self._loader()
+
+    return self._mesh
+
+def lazy_meshes(loader: Callable[[], List[Mesh]], count: int) -> List[LazyMesh]:
+  """Return `count` LazyMeshes that share a single call to a loader of a list of meshes (e.g., one multi-mesh file).
+
+  A LazyMesh past the end of the loaded list is an empty Mesh.
+  """
+  load_once = functools.lru_cache(maxsize=None)(loader)
+
+  def select(index: int) -> Mesh:
+    meshes = load_once()
+    return meshes[index] if index < len(meshes) else Mesh()
+
+  return [LazyMesh(functools.partial(select, index)) for index in range(count)]
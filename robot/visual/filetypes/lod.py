@@ -0,0 +1,166 @@
+import math
+
+import numpy as np
+
+from typing import List
+
+from robot.visual.filetypes.array_mesh   import FACET_DTYPE, ArrayMesh
+from robot.visual.filetypes.indexed_mesh import IndexedMesh, weld
+
+def plane_quadrics(positions: np.ndarray, indices: np.ndarray) -> np.ndarray:
+  """Return the (F, 4, 4) area weighted plane quadrics of indexed triangles."""
+  triangles = positions[indices].astype(float)
+
+  normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+  areas = np.linalg.norm(normals, axis=1) / 2
+  normals = np.divide(normals, (2 * areas)[:, np.newaxis], out=np.zeros_like(normals), where=areas[:, np.newaxis] > 0)
+
+  planes = np.hstack((normals, -np.einsum('ij,ij->i', normals, triangles[:, 0])[:, np.newaxis]))
+
+  return areas[:, np.newaxis, np.newaxis] * np.einsum('fi,fj->fij', planes, planes)
+
+def decimate(mesh: IndexedMesh, cell_size: float) -> IndexedMesh:
+  """Simplify an indexed mesh by merging all vertices within each grid cell into one vertex.
+
+  Each cell's vertex minimizes the summed quadric error of the triangles around the merged vertices
+  (falling back to their centroid when that is ill-conditioned or leaves the cell). Triangles that
+  collapse are removed. Normals are per merged vertex (averaged from the original vertices).
+  """
+  positions = mesh.positions.astype(float)
+  if len(mesh.indices) == 0:
+    return mesh
+
+  cells, cell_of = np.unique(np.floor(positions / cell_size).astype(np.int64), axis=0, return_inverse=True)
+  cell_of = cell_of.ravel()
+
+  # Sum the face quadrics into the cells of their corners
+  face_quadrics = plane_quadrics(positions, mesh.indices)
+  quadrics = np.zeros((len(cells), 4, 4))
+  for corner in range(3):
+    np.add.at(quadrics, cell_of[mesh.indices[:, corner]], face_quadrics)
+
+  counts = np.bincount(cell_of, minlength=len(cells))[:, np.newaxis]
+  centroids = np.zeros((len(cells), 3))
+  np.add.at(centroids, cell_of, positions)
+  centroids /= counts
+
+  normals = np.zeros((len(cells), 3))
+  np.add.at(normals, cell_of, mesh.normals.astype(float))
+  lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+  normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+  # Minimize v^T Q v over v = (x, y, z, 1): A x = -b
+  A, b = quadrics[:, :3, :3], quadrics[:, :3, 3]
+  scale = np.maximum(np.abs(A).max(axis=(1, 2)), 1e-30)
+  well_conditioned = np.abs(np.linalg.det(A / scale[:, np.newaxis, np.newaxis])) > 1e-6
+
+  optimal = centroids.copy()
+  if np.any(well_conditioned):
+    optimal[well_conditioned] = np.linalg.solve(A[well_conditioned], -b[well_conditioned][..., np.newaxis])[..., 0]
+
+  lower = cells * cell_size
+  inside = np.all((optimal >= lower) & (optimal <= lower + cell_size), axis=1)
+  optimal = np.where(inside[:, np.newaxis], optimal, centroids)
+
+  # Remove collapsed triangles and duplicates (in any vertex order)
+  indices = cell_of[mesh.indices]
+  valid = (indices[:, 0] != indices[:, 1]) & (indices[:, 1] != indices[:, 2]) & (indices[:, 0] != indices[:, 2])
+  indices = indices[valid]
+  _, unique = np.unique(np.sort(indices, axis=1), axis=0, return_index=True)
+  indices = indices[np.sort(unique)]
+
+  # Drop cells that no triangle uses
+  used, remapped = np.unique(indices, return_inverse=True)
+
+  return IndexedMesh(
+    positions = optimal[used].astype(np.float32),
+    normals   = normals[used].astype(np.float32),
+    indices   = remapped.reshape(-1, 3).astype(np.uint32)
+  )
+
+def indexed_to_array_mesh(name, mesh: IndexedMesh) -> ArrayMesh:
+  """Return an ArrayMesh of an indexed mesh's triangles with facet normals."""
+  records = np.zeros(len(mesh.indices), dtype=FACET_DTYPE)
+  triangles = mesh.positions[mesh.indices]
+
+  normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+  lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+
+  records['vertices'] = triangles
+  records['normal']   = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+  return ArrayMesh(name, records)
+
+def lod_levels(errors: np.ndarray, tolerances: np.ndarray) -> np.ndarray:
+  """Return the coarsest level whose (increasing) error is within each tolerance."""
+  return np.maximum(np.searchsorted(errors, tolerances, side='right') - 1, 0)
+
+def stable_levels(errors: np.ndarray, current: np.ndarray, tolerances: np.ndarray, hysteresis: float = 0.25) -> np.ndarray:
+  """Return levels for the tolerances which only change once they leave a band around the current levels.
+
+  A coarser level is only chosen if it is within the tolerance shrunk by `hysteresis` and a finer level is only chosen
+  if the current level exceeds the tolerance grown by `hysteresis`. Objects close to a switching distance do not pop.
+  """
+  tolerances = np.asarray(tolerances, dtype=float)
+
+  # The finest and coarsest levels allowed
+  finest   = lod_levels(errors, tolerances / (1 + hysteresis))
+  coarsest = lod_levels(errors, tolerances * (1 + hysteresis))
+
+  return np.clip(current, finest, coarsest)
+
+class MeshLODs:
+  """Chain of increasingly coarse versions of a mesh. Level 0 is the original mesh.
+
+  `errors[i]` bounds how far level i's surface may be from the original (the cell diagonal).
+  """
+  def __init__(self, levels: List[ArrayMesh], errors: List[float]) -> None:
+    self.levels = levels
+    self.errors = np.asarray(errors, dtype=float)
+
+  @classmethod
+  def build(cls, mesh, levels: int = 4, reduction: float = 4, tolerance: float = 1e-4) -> 'MeshLODs':
+    """Build `levels` coarser versions of a mesh, aiming for `reduction` times fewer triangles per level."""
+    triangles = np.asarray(mesh.triangles if hasattr(mesh, 'triangles') else [
+      [[*vertex] for vertex in facet.vertices] for facet in mesh.facets
+    ], dtype=float).reshape(-1, 3, 3)
+
+    base = mesh if hasattr(mesh, 'records') else indexed_to_array_mesh(getattr(mesh, 'name', None), weld(triangles, tolerance))
+    chain, errors = [base], [0.0]
+    if len(triangles) == 0:
+      return cls(chain, errors)
+
+    indexed = weld(triangles, tolerance)
+
+    # Vertex count shrinks with the square of the cell size on a surface
+    extent = np.ptp(triangles.reshape(-1, 3), axis=0).max()
+    cell_size = extent / math.sqrt(len(indexed.positions) / reduction)
+
+    for _ in range(levels):
+      coarse = decimate(indexed, cell_size)
+      if len(coarse.indices) == 0 or len(coarse.indices) >= len(chain[-1]):
+        break
+
+      chain.append(indexed_to_array_mesh(base.name, coarse))
+      errors.append(math.sqrt(3) * cell_size)
+
+      cell_size *= math.sqrt(reduction)
+
+    return cls(chain, errors)
+
+  def __len__(self) -> int:
+    return len(self.levels)
+
+  def level(self, tolerance: float) -> int:
+    """Return the coarsest level whose error is within the tolerance."""
+    return int(lod_levels(self.errors, tolerance))
+
+  def select(self, tolerance: float) -> ArrayMesh:
+    return self.levels[self.level(tolerance)]
+
+  def screen_level(self, distance: float, pixels_per_unit: float, pixel_tolerance: float = 1) -> int:
+    """Return the coarsest level whose error projects to at most `pixel_tolerance` pixels.
+
+    `pixels_per_unit` is the projection's scale at a distance of one (e.g., viewport height / (2 tan(fov / 2))).
+    """
+    return self.level(pixel_tolerance * max(distance, 1e-9) / pixels_per_unit)
@@ -0,0 +1,176 @@
+import hashlib, json, os, shutil, tempfile
+
+import numpy as np
+
+from typing import List
+
+from robot.common                      import logger
+from spatial                           import Matrix4, Transform
+from robot.visual.filetypes.array_mesh import FACET_DTYPE, ArrayMesh
+from robot.visual.filetypes.lod        import MeshLODs
+
+# Bump when the parsers or the cache layout change so that old entries are ignored
+CACHE_VERSION = 1
+
+DEFAULT_DIRECTORY = os.environ.get('ROBOTPY_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'robotpy', 'meshes'))
+
+def source_digest(file_path: str, parameters: dict) -> str:
+  """Return a hash of the file contents and the processing parameters."""
+  digest = hashlib.sha256(json.dumps([CACHE_VERSION, parameters], sort_keys=True).encode())
+
+  with open(file_path, 'rb') as file:
+    for block in iter(lambda: file.read(2 ** 20), b''):
+      digest.update(block)
+
+  return digest.hexdigest()
+
+def default_parser(file_path: str = ''):
+  """Return a parser for the file's extension (STL unless it is a PLY file)."""
+  # Imported here since the parser modules import the array mesh modules
+  from robot.visual.filetypes.ply.ply_parser import PLYParser
+  from robot.visual.filetypes.stl.stl_parser import STLParser
+
+  return PLYParser() if file_path.lower().endswith('.ply') else STLParser()
+
+class MeshCache:
+  """Directory of parsed (and scaled and transformed) meshes stored as memory mappable arrays.
+
+  Entries are keyed by the source file's content hash and the processing parameters, so a changed
+  source file simply misses the cache. Each entry holds one `records.npy` of FACET_DTYPE records
+  (positions, normals, mesh ids) and a `meshes.json` of names, colors, facet counts, and bounds.
+  """
+  def __init__(self, directory: str = DEFAULT_DIRECTORY) -> None:
+    self.directory = directory
+    self.stats = {'hits': 0, 'misses': 0}
+
+  def entry(self, file_path: str, parameters: dict) -> str:
+    name = os.path.basename(file_path)
+
+    return os.path.join(self.directory, f'{name}.{source_digest(file_path, parameters)[:32]}')
+
+  def parameters(self, parser, scale: float, transform: Transform) -> dict:
+    """Return the processing parameters that identify a cache entry."""
+    matrix = None
+    if transform is not None:
+      # Matrix4 stores elements column-major
+      matrix = np.array(Matrix4.from_transform(transform).elements, dtype=float).reshape(4, 4).T
+
+    return {
+      'parser':    type(parser).__name__,
+      'scale':     scale,
+      'transform': None if matrix is None else np.round(matrix, 9).tolist()
+    }
+
+  def load(self, file_path: str, parser = None, scale: float = 1, transform: Transform = None) -> List[ArrayMesh]:
+    """Return the meshes in the file, scaled and then transformed, from the cache if possible."""
+    parser = parser or default_parser(file_path)
+
+    entry = self.entry(file_path, self.parameters(parser, scale, transform))
+
+    meshes = self.read(entry)
+    if meshes is not None:
+      self.stats['hits'] += 1
+      return meshes
+
+    self.stats['misses'] += 1
+
+    meshes = parser.parse(file_path)
+    if scale != 1:
+      meshes = [mesh.scale(scale) for mesh in meshes]
+    if transform is not None:
+      meshes = [mesh.transform(transform) for mesh in meshes]
+
+    self.write(entry, meshes)
+
+    return meshes
+
+  def load_lods(self, file_path: str, levels: int = 4, reduction: float = 4, parser = None, scale: float = 1, transform: Transform = None) -> List[MeshLODs]:
+    """Return the level of detail chain of every mesh in the file (see `load`), from the cache if possible."""
+    parser = parser or default_parser(file_path)
+
+    parameters = {**self.parameters(parser, scale, transform), 'levels': levels, 'reduction': reduction}
+    entry = self.entry(file_path, parameters)
+
+    flattened = self.read(entry)
+    if flattened is not None:
+      self.stats['hits'] += 1
+
+      with open(os.path.join(entry, 'lods.json')) as file:
+        errors = json.load(file)
+    else:
+      chains = [MeshLODs.build(mesh, levels, reduction) for mesh in self.load(file_path, parser, scale, transform)]
+      errors = [chain.errors.tolist() for chain in chains]
+
+      # Level 0 is also cached by `load` but storing it again keeps each entry self-contained
+      flattened = [level for chain in chains for level in chain.levels]
+      self.write(entry, flattened, {'lods.json': errors})
+
+    lods, start = [], 0
+    for chain_errors in errors:
+      lods.append(MeshLODs(flattened[start:start + len(chain_errors)], chain_errors))
+      start += len(chain_errors)
+
+    return lods
+
+  def read(self, entry: str) -> List[ArrayMesh]:
+    """Return the meshes stored in a cache entry (memory mapped). Return None if there is no entry."""
+    try:
+      with open(os.path.join(entry, 'meshes.json')) as file:
+        descriptions = json.load(file)
+
+      records = np.load(os.path.join(entry, 'records.npy'), mmap_mode='r')
+    except (OSError, ValueError):
+      return None
+
+    meshes = []
+    start = 0
+    for description in descriptions:
+      end = start + description['count']
+      bounds = None if description['bounds'] is None else tuple(np.array(corner) for corner in description['bounds'])
+
+      meshes.append(ArrayMesh(description['name'], records[start:end], description['color'], bounds))
+      start = end
+
+    return meshes
+
+  def write(self, entry: str, meshes: List[ArrayMesh], documents: dict = None) -> None:
+    """Store meshes (and any extra JSON documents by file name) in a cache entry.
+
+    Failing to write only means the next load parses again.
+    """
+    records = np.concatenate([np.asarray(mesh.records, dtype=FACET_DTYPE) for mesh in meshes]) if meshes else np.zeros(0, FACET_DTYPE)
+
+    descriptions = []
+    for mesh in meshes:
+      bounds = None
+      if len(mesh.records):
+        points = mesh.triangles.reshape(-1, 3)
+        bounds = [points.min(axis=0).tolist(), points.max(axis=0).tolist()]
+
+      descriptions.append({
+        'name':   mesh.name,
+        'color':  None if mesh.color is None else list(mesh.color),
+        'count':  len(mesh.records),
+        'bounds': bounds
+      })
+
+    temporary = None
+    try:
+      os.makedirs(self.directory, exist_ok=True)
+
+      # Write into a temporary directory and move it into place so that readers never see partial entries
+      temporary = tempfile.mkdtemp(dir=self.directory)
+      np.save(os.path.join(temporary, 'records.npy'), records)
+      for name, document in {'meshes.json': descriptions, **(documents or {})}.items():
+        with open(os.path.join(temporary, name), 'w') as file:
+          json.dump(document, file)
+
+      os.replace(temporary, entry)
+    except OSError as error:
+      logger.warn(f'Could not write mesh cache entry `{entry}`: {error}')
+      if temporary is not None:
+        shutil.rmtree(temporary, ignore_errors=True)
+
+  def clear(self) -> None:
+    """Remove every cache entry."""
+    shutil.rmtree(self.directory, ignore_errors=True)
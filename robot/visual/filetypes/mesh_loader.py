@@ -0,0 +1,68 @@
+import concurrent.futures
+
+from collections import namedtuple
+from typing      import Iterable, Iterator, List, Tuple
+
+from robot.visual.filetypes.array_mesh import ArrayMesh
+from robot.visual.filetypes.lod        import MeshLODs
+from robot.visual.filetypes.mesh_cache import DEFAULT_DIRECTORY, MeshCache
+
+# A mesh file and the processing applied to it (see MeshCache.load)
+MeshSource = namedtuple('MeshSource', 'file_path scale transform', defaults=(1, None))
+
+def load_source(cache_directory: str, source: MeshSource) -> List[ArrayMesh]:
+  """Load one source through a mesh cache (module level so that process pools can pickle it)."""
+  source = as_source(source)
+
+  return MeshCache(cache_directory).load(source.file_path, scale=source.scale, transform=source.transform)
+
+def load_source_lods(cache_directory: str, source: MeshSource) -> List[MeshLODs]:
+  """Load the level of detail chains of one source through a mesh cache (see MeshCache.load_lods)."""
+  source = as_source(source)
+
+  return MeshCache(cache_directory).load_lods(source.file_path, scale=source.scale, transform=source.transform)
+
+def as_source(source) -> MeshSource:
+  return MeshSource(source) if isinstance(source, str) else source
+
+class MeshLoader:
+  """Load many mesh files concurrently through the mesh cache.
+
+  Parsing is mostly NumPy work (and file IO) which releases the GIL, so threads are the default.
+  Each submitted source returns a Future (a handle) right away, so callers can carry on until they need the meshes.
+  """
+  def __init__(self, max_workers: int = None, processes: bool = False, cache_directory: str = DEFAULT_DIRECTORY) -> None:
+    executor_type = concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+
+    self.executor        = executor_type(max_workers)
+    self.cache_directory = cache_directory
+
+  def __enter__(self) -> 'MeshLoader':
+    return self
+
+  def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+    self.close()
+
+  def close(self, wait: bool = True) -> None:
+    self.executor.shutdown(wait=wait)
+
+  def submit(self, source) -> concurrent.futures.Future:
+    """Start loading a source (a file path or MeshSource) and return its Future."""
+    return self.executor.submit(load_source, self.cache_directory, as_source(source))
+
+  def submit_lods(self, source) -> concurrent.futures.Future:
+    """Start loading the level of detail chains of a source (a file path or MeshSource) and return its Future."""
+    return self.executor.submit(load_source_lods, self.cache_directory, as_source(source))
+
+  def load(self, sources: Iterable) -> List[List[ArrayMesh]]:
+    """Load all sources concurrently and return their meshes in order."""
+    futures = [self.submit(source) for source in sources]
+
+    return [future.result() for future in futures]
+
+  def as_completed(self, sources: Iterable) -> Iterator[Tuple[MeshSource, List[ArrayMesh]]]:
+    """Yield (source, meshes) pairs as each source finishes loading."""
+    futures = {self.submit(source): as_source(source) for source in sources}
+
+    for future in concurrent.futures.as_completed(futures):
+      yield futures[future], future.result()
@@ -0,0 +1,236 @@
+import functools, json, struct
+
+import numpy as np
+
+from typing import Iterable, List, Optional
+
+from robot.visual.filetypes.array_mesh   import ArrayMesh
+from robot.visual.filetypes.indexed_mesh import IndexedMesh, weld
+from robot.visual.filetypes.lazy_mesh    import LazyMesh
+from robot.visual.filetypes.lod          import MeshLODs, indexed_to_array_mesh
+
+PACKED_EXTENSION = '.pack'
+
+# Bump when the layout changes so that old files are rejected instead of misread
+PACKED_VERSION = 1
+
+# 8 byte magic, uint32 version and uint32 metadata length
+MAGIC  = b'RPYPACK\x00'
+HEADER = struct.Struct('<8sII')
+
+# Sections start on cache line boundaries (which also satisfies every dtype's alignment)
+ALIGNMENT = 64
+
+# One record per mesh (`valid` is 0 for meshes without a proxy)
+PROXY_DTYPE = np.dtype([
+  ('valid',        '<f8'),
+  ('start',        '<f8', (3,)),
+  ('end',          '<f8', (3,)),
+  ('radius',       '<f8'),
+  ('center',       '<f8', (3,)),
+  ('axes',         '<f8', (3, 3)),
+  ('half_extents', '<f8', (3,))
+])
+
+# Mass properties in the mesh frame (see Link.calculate_properties), moments ordered as Moments
+PROPERTIES_DTYPE = np.dtype([
+  ('volume',  '<f8'),
+  ('com',     '<f8', (3,)),
+  ('moments', '<f8', (6,))
+])
+
+def mass_properties(triangles: np.ndarray) -> np.ndarray:
+  """Return the PROPERTIES_DTYPE record of (F, 3, 3) triangles (the same sums as Link.calculate_properties)."""
+  triangles = np.asarray(triangles, dtype=float).reshape(-1, 3, 3)
+
+  # Signed tetrahedra between the origin and each facet
+  volumes = np.einsum('ij,ij->i', triangles[:, 0], np.cross(triangles[:, 1], triangles[:, 2])) / 6
+  centroids = triangles.sum(axis=1) / 4
+
+  x, y, z = centroids.T
+  properties = np.zeros((), dtype=PROPERTIES_DTYPE)
+  properties['volume'] = volumes.sum()
+  properties['moments'] = [
+    np.dot(y * y + z * z, volumes),
+    np.dot(x * x + z * z, volumes),
+    np.dot(x * x + y * y, volumes),
+    -np.dot(x * y, volumes),
+    -np.dot(y * z, volumes),
+    -np.dot(x * z, volumes)
+  ]
+
+  if properties['volume'] != 0:
+    properties['com'] = volumes @ centroids / properties['volume']
+
+  return properties
+
+def proxy_record(proxy: Optional['Proxy']) -> np.ndarray:
+  record = np.zeros((), dtype=PROXY_DTYPE)
+  if proxy is not None:
+    record['valid'] = 1
+    record['start'], record['end'], record['radius'] = proxy.capsule
+    record['center'], record['axes'], record['half_extents'] = proxy.box
+
+  return record
+
+def record_proxy(record: np.ndarray) -> Optional['Proxy']:
+  # Imported here since the collision package imports the mech package, which imports this module
+  from robot.collision.proxy import Capsule, OrientedBox, Proxy
+
+  if not record['valid']:
+    return None
+
+  return Proxy(
+    Capsule(np.array(record['start']), np.array(record['end']), float(record['radius'])),
+    OrientedBox(np.array(record['center']), np.array(record['axes']), np.array(record['half_extents']))
+  )
+
+def pack_model(file_path: str, model: dict, meshes: Iterable, proxies: Iterable[Optional['Proxy']] = None, lod_levels: int = 0, tolerance: float = 1e-4) -> None:
+  """Write a model description with its meshes (welded into vertex and index arrays), proxies, mass properties and LODs.
+
+  The meshes are stored as given, so they should already be scaled and transformed into their frames.
+  """
+  meshes = list(meshes)
+  proxies = list(proxies or [])
+  proxies += [None] * (len(meshes) - len(proxies))
+
+  arrays = []
+  def section(array: np.ndarray) -> dict:
+    arrays.append(np.ascontiguousarray(array))
+    return {'index': len(arrays) - 1}
+
+  def indexed_sections(indexed: IndexedMesh) -> dict:
+    return {name: section(array) for name, array in indexed._asdict().items()}
+
+  entries, properties = [], []
+  for mesh in meshes:
+    triangles = np.asarray(mesh.triangles if hasattr(mesh, 'triangles') else [
+      [[*vertex] for vertex in facet.vertices] for facet in mesh.facets
+    ], dtype=np.float32).reshape(-1, 3, 3)
+
+    lods = MeshLODs.build(mesh, lod_levels, tolerance=tolerance) if lod_levels else None
+    color = getattr(mesh, 'color', None)
+
+    entries.append({
+      'name':  getattr(mesh, 'name', None),
+      'color': None if color is None else [float(channel) for channel in color],
+      **indexed_sections(weld(triangles, tolerance)),
+      'lods': [] if lods is None else [
+        {'error': float(error), **indexed_sections(weld(level.triangles, tolerance))}
+        for level, error in zip(lods.levels[1:], lods.errors[1:])
+      ]
+    })
+
+    properties.append(mass_properties(triangles))
+
+  metadata = {
+    'version':    PACKED_VERSION,
+    'model':      model,
+    'meshes':     entries,
+    'proxies':    section(np.array([proxy_record(proxy) for proxy in proxies], dtype=PROXY_DTYPE)),
+    'properties': section(np.array(properties, dtype=PROPERTIES_DTYPE)),
+    'sections':   [{'dtype': np.lib.format.dtype_to_descr(array.dtype), 'shape': list(array.shape)} for array in arrays]
+  }
+
+  def aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+  # The sections follow the metadata, whose length depends on the offsets it contains
+  length = 0
+  while True:
+    offset = aligned(HEADER.size + length)
+    for description, array in zip(metadata['sections'], arrays):
+      description['offset'] = offset
+      offset = aligned(offset + array.nbytes)
+
+    encoded = json.dumps(metadata).encode('utf-8')
+    if aligned(HEADER.size + len(encoded)) == aligned(HEADER.size + length):
+      break
+
+    length = len(encoded)
+
+  with open(file_path, 'wb') as file:
+    file.write(HEADER.pack(MAGIC, PACKED_VERSION, len(encoded)))
+    file.write(encoded)
+
+    for description, array in zip(metadata['sections'], arrays):
+      file.write(bytes(description['offset'] - file.tell()))
+      file.write(array.tobytes())
+
+class PackedModel:
+  """Read-only view of a packed model file (see `pack_model`).
+
+  The whole file is one memory map: the arrays are views into it, so processes opening the same file share its pages.
+  """
+  def __init__(self, file_path: str) -> None:
+    self.file_path = file_path
+    self.buffer = np.memmap(file_path, dtype=np.uint8, mode='r')
+
+    magic, version, length = HEADER.unpack(self.buffer[:HEADER.size].tobytes())
+    if magic != MAGIC:
+      raise ValueError(f'{file_path} is not a packed model')
+    if version != PACKED_VERSION:
+      raise ValueError(f'{file_path} has packed model version {version} (expected {PACKED_VERSION})')
+
+    self.metadata = json.loads(self.buffer[HEADER.size:HEADER.size + length].tobytes())
+
+    self._meshes = {}
+
+  @property
+  def model(self) -> dict:
+    """Return the model description (e.g., a Serial or Tool dictionary)."""
+    return self.metadata['model']
+
+  def __len__(self) -> int:
+    return len(self.metadata['meshes'])
+
+  def array(self, section: dict) -> np.ndarray:
+    description = self.metadata['sections'][section['index']]
+    dtype = np.lib.format.descr_to_dtype(description['dtype'])
+
+    start = description['offset']
+    count = int(np.prod(description['shape'], dtype=np.int64))
+
+    return self.buffer[start:start + count * dtype.itemsize].view(dtype).reshape(description['shape'])
+
+  def indexed(self, index: int) -> IndexedMesh:
+    """Return a mesh's vertex and index arrays (views into the file)."""
+    entry = self.metadata['meshes'][index]
+
+    return IndexedMesh(*(self.array(entry[name]) for name in IndexedMesh._fields))
+
+  def mesh(self, index: int) -> ArrayMesh:
+    """Return a mesh's triangles (built from its arrays once)."""
+    if index not in self._meshes:
+      entry = self.metadata['meshes'][index]
+
+      mesh = indexed_to_array_mesh(entry['name'], self.indexed(index))
+      mesh.color = entry['color']
+
+      self._meshes[index] = mesh
+
+    return self._meshes[index]
+
+  def meshes(self) -> List[LazyMesh]:
+    """Return the meshes, each built from its arrays when it is first used."""
+    return [LazyMesh(functools.partial(self.mesh, index)) for index in range(len(self))]
+
+  def proxies(self) -> List[Optional['Proxy']]:
+    return [record_proxy(record) for record in self.array(self.metadata['proxies'])]
+
+  def properties(self) -> np.ndarray:
+    """Return the PROPERTIES_DTYPE records of the meshes."""
+    return self.array(self.metadata['properties'])
+
+  def lods(self, index: int) -> Optional[MeshLODs]:
+    """Return a mesh's level of detail chain (None if the file has no LODs)."""
+    entry = self.metadata['meshes'][index]
+    if not entry['lods']:
+      return None
+
+    levels = [LazyMesh(functools.partial(self.mesh, index))] + [
+      indexed_to_array_mesh(entry['name'], IndexedMesh(*(self.array(level[name]) for name in IndexedMesh._fields)))
+      for level in entry['lods']
+    ]
+
+    return MeshLODs(levels, [0.0] + [level['error'] for level in entry['lods']])
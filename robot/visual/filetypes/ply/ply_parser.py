@@ -0,0 +1,210 @@
+import os
+
+import numpy as np
+
+from collections import namedtuple
+
+from robot.common                        import Timer
+from robot.visual.exceptions             import ParserError
+from robot.visual.filetypes.array_mesh   import FACET_DTYPE, ArrayMesh
+from robot.visual.filetypes.indexed_mesh import IndexedMesh
+
+PLY_TYPES = {
+  'char':   'i1', 'int8':    'i1',
+  'uchar':  'u1', 'uint8':   'u1',
+  'short':  'i2', 'int16':   'i2',
+  'ushort': 'u2', 'uint16':  'u2',
+  'int':    'i4', 'int32':   'i4',
+  'uint':   'u4', 'uint32':  'u4',
+  'float':  'f4', 'float32': 'f4',
+  'double': 'f8', 'float64': 'f8'
+}
+
+FORMATS = {
+  'binary_little_endian': '<',
+  'binary_big_endian':    '>'
+}
+
+# Vertex data (colors are None when absent) and (F, 3) triangle indices (fan triangulated polygons)
+PLYData = namedtuple('PLYData', 'positions normals colors indices')
+
+# An element (e.g., vertex or face) of `count` items with (name, type, list count type or None) properties
+Element = namedtuple('Element', 'name count properties')
+
+class PLYParser:
+  """Binary PLY reader (vertex and face elements, with optional normals and colors) built on NumPy buffers."""
+  def __init__(self) -> None:
+    self.stats = {
+      'vertices': 0,
+      'facets':   0,
+      'elapsed':  0
+    }
+
+  def parse(self, file_path: str) -> list:
+    """Return a list with one ArrayMesh (the same structure as STLParser) of the file's faces."""
+    with Timer() as timer:
+      data = self.read(file_path)
+
+    self.stats['elapsed'] = timer.elapsed
+
+    triangles = data.positions[data.indices]
+
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+
+    records = np.empty(len(triangles), dtype=FACET_DTYPE)
+    records['normal']    = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+    records['vertices']  = triangles
+    records['attribute'] = 0
+
+    return [ArrayMesh(0, records)]
+
+  def parse_points(self, file_path: str) -> np.ndarray:
+    """Return the (N, 3) vertex positions of a file (e.g., a point cloud)."""
+    return self.read(file_path).positions
+
+  def parse_indexed(self, file_path: str) -> IndexedMesh:
+    """Return the file's shared vertices and triangle indices."""
+    data = self.read(file_path)
+
+    return IndexedMesh(data.positions, data.normals, data.indices)
+
+  def read(self, file_path: str) -> PLYData:
+    with open(file_path, 'rb') as file:
+      byte_order, elements = self.read_header(file)
+      offset = file.tell()
+
+    size = os.path.getsize(file_path)
+    buffer = np.memmap(file_path, dtype=np.uint8, mode='r', offset=offset, shape=(size - offset,)) if size > offset else np.zeros(0, np.uint8)
+
+    arrays = {}
+    position = 0
+    for element in elements:
+      arrays[element.name], position = self.read_element(buffer, position, element, byte_order)
+
+    vertices = arrays.get('vertex')
+    if vertices is None:
+      raise ParserError(0, 'PLY file has no vertex element')
+
+    def columns(names, dtype):
+      if not all(name in vertices.dtype.names for name in names):
+        return None
+
+      return np.column_stack([vertices[name] for name in names]).astype(dtype)
+
+    positions = columns(('x', 'y', 'z'), np.float32)
+    normals   = columns(('nx', 'ny', 'nz'), np.float32)
+    colors    = columns(('red', 'green', 'blue'), np.uint8)
+
+    indices = arrays.get('face', np.zeros((0, 3), np.uint32))
+
+    self.stats['vertices'] = len(positions)
+    self.stats['facets']   = len(indices)
+
+    return PLYData(positions, normals, colors, indices)
+
+  def read_header(self, file):
+    if file.readline().strip() != b'ply':
+      raise ParserError(1, 'Not a PLY file')
+
+    byte_order = None
+    elements = []
+    for line_number, line in enumerate(iter(file.readline, b''), 2):
+      words = line.decode('ascii').split()
+      if not words:
+        continue
+
+      keyword, *rest = words
+      if keyword == 'format':
+        if rest[0] not in FORMATS:
+          raise ParserError(line_number, f'Unsupported PLY format `{rest[0]}` (only binary PLY is supported)')
+        byte_order = FORMATS[rest[0]]
+      elif keyword == 'element':
+        elements.append(Element(rest[0], int(rest[1]), []))
+      elif keyword == 'property':
+        if rest[0] == 'list':
+          elements[-1].properties.append((rest[3], PLY_TYPES[rest[2]], PLY_TYPES[rest[1]]))
+        else:
+          elements[-1].properties.append((rest[1], PLY_TYPES[rest[0]], None))
+      elif keyword == 'end_header':
+        if byte_order is None:
+          raise ParserError(line_number, 'PLY header has no format')
+        return byte_order, elements
+
+    raise ParserError(0, 'PLY header has no end_header')
+
+  def read_element(self, buffer: np.ndarray, position: int, element: Element, byte_order: str):
+    """Return an element's array (a structured array, or triangle indices for faces) and the position after it."""
+    lists = [prop for prop in element.properties if prop[2] is not None]
+
+    if not lists:
+      dtype = np.dtype([(name, byte_order + type_code) for name, type_code, _ in element.properties])
+      end = position + dtype.itemsize * element.count
+
+      return buffer[position:end].view(dtype), end
+
+    if element.name != 'face' or len(lists) != 1:
+      raise ParserError(0, f'Unsupported PLY list properties in element `{element.name}`')
+
+    return self.read_faces(buffer, position, element, byte_order)
+
+  def read_faces(self, buffer: np.ndarray, position: int, element: Element, byte_order: str):
+    """Return (F, 3) triangle indices of a face element (polygons are fan triangulated) and the position after it."""
+    if element.count == 0:
+      return np.zeros((0, 3), np.uint32), position
+
+    def record_dtype(count: int) -> np.dtype:
+      # Face records are a fixed size when every face has `count` vertices
+      return np.dtype([
+        (name, byte_order + type_code) if count_type is None else
+        (name, [('count', byte_order + count_type), ('indices', byte_order + type_code, (count,))])
+        for name, type_code, count_type in element.properties
+      ])
+
+    list_index = next(index for index, prop in enumerate(element.properties) if prop[2] is not None)
+    name, type_code, count_type = element.properties[list_index]
+
+    # Faces usually all have as many vertices as the first one, which makes the element one fixed size array
+    count_offset = position + record_dtype(0).fields[name][1]
+    first_count = int(buffer[count_offset:count_offset + np.dtype(count_type).itemsize].view(byte_order + count_type)[0])
+
+    dtype = record_dtype(first_count)
+    end = position + dtype.itemsize * element.count
+    if end <= len(buffer):
+      faces = buffer[position:end].view(dtype)[name]
+      if np.all(faces['count'] == first_count):
+        return self.triangulate(faces['indices'].astype(np.int64)), end
+
+    # Mixed polygons need their records walked one at a time
+    triangles = []
+    for _ in range(element.count):
+      for _, prop_type, prop_count_type in element.properties:
+        if prop_count_type is None:
+          position += np.dtype(prop_type).itemsize
+          continue
+
+        count_size = np.dtype(prop_count_type).itemsize
+        count = int(buffer[position:position + count_size].view(byte_order + prop_count_type)[0])
+        position += count_size
+
+        index_size = np.dtype(prop_type).itemsize
+        polygon = buffer[position:position + count * index_size].view(byte_order + prop_type)
+        triangles.append(self.triangulate(polygon.astype(np.int64)[np.newaxis]))
+        position += count * index_size
+
+    return np.concatenate(triangles), position
+
+  @staticmethod
+  def triangulate(polygons: np.ndarray) -> np.ndarray:
+    """Fan triangulate (F, N) polygon indices into (F * (N - 2), 3) triangle indices."""
+    count = polygons.shape[1]
+    if count < 3:
+      return np.zeros((0, 3), np.uint32)
+
+    fan = np.stack((
+      np.repeat(polygons[:, :1], count - 2, axis=1),
+      polygons[:, 1:-1],
+      polygons[:, 2:]
+    ), axis=-1)
+
+    return fan.reshape(-1, 3).astype(np.uint32)
@@ -0,0 +1,73 @@
+import numpy as np
+
+from robot.visual.filetypes.indexed_mesh import weld
+
+class PLYWriter:
+  """Binary (little endian) PLY writer of indexed triangles or bare points."""
+  FILE_EXTENSION = '.ply'
+
+  def __init__(self, file_name: str) -> None:
+    if file_name[-4:] != self.FILE_EXTENSION:
+      file_name += self.FILE_EXTENSION
+
+    self.file_name = file_name
+
+  def write(self, meshes, tolerance: float = 1e-4) -> None:
+    """Weld meshes (ArrayMesh or Mesh) into shared vertices and write them as one indexed mesh."""
+    triangles = [
+      mesh.triangles if hasattr(mesh, 'triangles') else
+      np.array([[[*vertex] for vertex in facet.vertices] for facet in mesh.facets], dtype=np.float32).reshape(-1, 3, 3)
+      for mesh in meshes
+    ]
+
+    indexed = weld(np.concatenate(triangles) if triangles else np.zeros((0, 3, 3), np.float32), tolerance, crease_angle=np.pi)
+
+    self.write_indexed(indexed.positions, indexed.indices, indexed.normals)
+
+  def write_points(self, positions: np.ndarray, normals: np.ndarray = None, colors: np.ndarray = None) -> None:
+    self.write_indexed(positions, None, normals, colors)
+
+  def write_indexed(self, positions: np.ndarray, indices: np.ndarray = None, normals: np.ndarray = None, colors: np.ndarray = None) -> None:
+    """Write (N, 3) positions with optional (F, 3) triangle indices, (N, 3) normals and (N, 3) uint8 colors."""
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+
+    fields = [('x', '<f4'), ('y', '<f4'), ('z', '<f4')]
+    if normals is not None:
+      fields += [('nx', '<f4'), ('ny', '<f4'), ('nz', '<f4')]
+    if colors is not None:
+      fields += [('red', 'u1'), ('green', 'u1'), ('blue', 'u1')]
+
+    vertices = np.empty(len(positions), dtype=fields)
+    vertices['x'], vertices['y'], vertices['z'] = positions.T
+    if normals is not None:
+      vertices['nx'], vertices['ny'], vertices['nz'] = np.asarray(normals, dtype=np.float32).reshape(-1, 3).T
+    if colors is not None:
+      vertices['red'], vertices['green'], vertices['blue'] = np.asarray(colors, dtype=np.uint8).reshape(-1, 3).T
+
+    faces = None
+    if indices is not None:
+      faces = np.empty(len(indices), dtype=[('count', 'u1'), ('indices', '<u4', (3,))])
+      faces['count']   = 3
+      faces['indices'] = np.asarray(indices).reshape(-1, 3)
+
+    with open(self.file_name, 'wb') as file:
+      file.write(self.header(vertices.dtype, len(vertices), None if faces is None else len(faces)))
+      file.write(vertices.tobytes())
+      if faces is not None:
+        file.write(faces.tobytes())
+
+  def header(self, vertex_dtype: np.dtype, vertex_count: int, face_count: int = None) -> bytes:
+    types = {'<f4': 'float', '|u1': 'uchar'}
+
+    lines = [
+      'ply',
+      'format binary_little_endian 1.0',
+      'comment Written by robotpy, http://www.github.com/jbschwartz/robotpy',
+      f'element vertex {vertex_count}',
+      *[f'property {types[vertex_dtype[name].str]} {name}' for name in vertex_dtype.names]
+    ]
+
+    if face_count is not None:
+      lines += [f'element face {face_count}', 'property list uchar uint vertex_indices']
+
+    return '\n'.join(lines + ['end_header', '']).encode('ascii')
@@ -0,0 +1,31 @@
+import struct, zlib
+
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# PNG color types by number of channels
+COLOR_TYPES = {1: 0, 3: 2, 4: 6}
+
+def png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+  return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+def write_png(file_path: str, pixels: np.ndarray, compression: int = 6) -> None:
+  """Write (H, W), (H, W, 3) or (H, W, 4) uint8 pixels (top row first) as an 8 bit PNG."""
+  pixels = np.asarray(pixels, dtype=np.uint8)
+  if pixels.ndim == 2:
+    pixels = pixels[..., np.newaxis]
+
+  height, width, channels = pixels.shape
+
+  # Every row starts with its filter type (0 is no filtering)
+  rows = np.zeros((height, 1 + width * channels), dtype=np.uint8)
+  rows[:, 1:] = pixels.reshape(height, -1)
+
+  header = struct.pack('>IIBBBBB', width, height, 8, COLOR_TYPES[channels], 0, 0, 0)
+
+  with open(file_path, 'wb') as file:
+    file.write(PNG_SIGNATURE)
+    file.write(png_chunk(b'IHDR', header))
+    file.write(png_chunk(b'IDAT', zlib.compress(rows.tobytes(), compression)))
+    file.write(png_chunk(b'IEND', b''))
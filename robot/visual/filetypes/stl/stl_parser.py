@@ -1,12 +1,12 @@
-import enum, struct
+import enum, os, struct
 
-from .stl_type import STLType
+import numpy as np
 
-from robot.common       import Timer
-from robot.exceptions   import *
-from spatial            import Facet, Mesh, vector3
+from .stl_type import STLType
 
-Vector3 = vector3.Vector3
+from robot.common                      import Timer
+from robot.visual.exceptions           import ParserError, STLFloatError, STLNotATriangle, STLStateError, STLUnexpectedSize
+from robot.visual.filetypes.array_mesh import FACET_DTYPE, ArrayMesh, split_records
 
 @enum.unique
 class ParserState(enum.Enum):
@@ -51,6 +51,22 @@ class STLParser:
   FACET_FORMAT = '<fff fff fff fff H'
   FACET_SIZE   = struct.calcsize(FACET_FORMAT)
 
+  # 80 byte header followed by the uint32 number of facets
+  HEADER_SIZE  = 84
+
+  # Characters read at a time by the bulk ASCII parser
+  CHUNK_SIZE   = 2 ** 24
+
+  # Keywords (and words) that may appear between `solid` and `endsolid` lines
+  STRUCTURE_KEYWORDS = ('facet', 'normal', 'outer', 'loop', 'vertex', 'endloop', 'endfacet', 'color')
+
+  # Words of one facet (without numbers and the optional `loop`) and the state the state machine is in before each
+  FACET_WORDS  = ('facet', 'normal', 'outer', 'vertex', 'vertex', 'vertex', 'endloop', 'endfacet')
+  FACET_STATES = (
+    ParserState.PARSE_FACET,  ParserState.PARSE_NORMAL, ParserState.PARSE_LOOP,   ParserState.PARSE_VERTEX,
+    ParserState.PARSE_VERTEX, ParserState.PARSE_VERTEX, ParserState.PARSE_VERTEX, ParserState.PARSE_LOOP
+  )
+
   def __init__(self, compute_normals = False, warnings = False):
     self.compute_normals = compute_normals
     self.show_warnings = warnings
@@ -63,8 +79,8 @@ class STLParser:
 
     self.current = {
       'state': ParserState.PARSE_SOLID,
-      # TODO: The ASCII parser is completely broken by changes to spatial >=0.2.0.
-      'facet': None, # Facet(),
+      'mesh': None,
+      'facet': None,
       'line': 1
     }
 
@@ -102,47 +118,189 @@ class STLParser:
     # We assume that the file is well formed (and well informed)
     self.stats['facets'], = struct.unpack('<i', file.read(4))
 
-    current_mesh = Mesh(0)
+    # Read every complete facet in the file (like reading until EOF)
+    count = max(0, (os.fstat(file.fileno()).st_size - self.HEADER_SIZE) // self.FACET_SIZE)
+
+    # The records are a zero copy view of the memory mapped file
+    if count > 0:
+      records = np.memmap(file, dtype=FACET_DTYPE, mode='r', offset=self.HEADER_SIZE, shape=(count,))
+    else:
+      records = np.zeros(0, dtype=FACET_DTYPE)
+
+    # We use the attribute value to identify which mesh a facet belongs to
+    # This allows multiple meshes to be saved to one file
+
+    # This is non-standard binary STL behavior
+    # Typically the attribute is 0 but can be used to store color information
+    self.meshes.extend(split_records(records))
+
+  def parse_ascii(self, file):
+    # Warnings need to look at every line so they use the (slow) state machine
+    if self.show_warnings:
+      return self.parse_ascii_lines(file)
+
+    leftover = ''
     while True:
-      buffer = file.read(self.FACET_SIZE)
-      if not buffer:
+      chunk = file.read(self.CHUNK_SIZE)
+      text = leftover + chunk.lower()
+
+      if not chunk:
+        self.parse_ascii_text(text)
         break
 
-      *facet_floats, mesh_id = struct.unpack(self.FACET_FORMAT, buffer)
+      # Only parse up to the last complete facet (or solid); the rest waits for the next chunk
+      end = max(text.rfind('endfacet'), text.rfind('endsolid'))
+      end = text.find('\n', end) if end >= 0 else -1
 
-      normal = Vector3(*facet_floats[0:3])
-      vertices = [
-        Vector3(*facet_floats[3:6]),
-        Vector3(*facet_floats[6:9]),
-        Vector3(*facet_floats[9:12])
-      ]
+      if end < 0:
+        leftover = text
+        continue
 
-      # We use the attribute value to identify which mesh a facet belongs to
-      # This allows multiple meshes to be saved to one file
+      self.parse_ascii_text(text[:end + 1])
+      leftover = text[end + 1:]
 
-      # This is non-standard binary STL behavior
-      # Typically the attribute is 0 but can be used to store color information
-      if mesh_id != current_mesh.name:
-        self.meshes.append(current_mesh)
-        current_mesh = Mesh(mesh_id)
+    if self.current['state'] is not ParserState.PARSE_SOLID:
+      raise STLStateError(self.current['line'], self.current['state'], 'end of file')
 
-      current_mesh.append(Facet(vertices, normal))
+  def parse_ascii_text(self, text):
+    """Parse complete lines of lowercase ASCII STL text."""
+    position = 0
+    for start, end, keyword, name in self.solid_lines(text):
+      self.parse_ascii_facets(text[position:start])
 
-    self.meshes.append(current_mesh)
+      getattr(self, keyword)(name)
 
-  def parse_ascii(self, file):
+      position = end
+
+    self.parse_ascii_facets(text[position:])
+
+  def solid_lines(self, text):
+    """Yield the (start, end, keyword, name) of every `solid` and `endsolid` line in the text."""
+    # Solids are rare so searching for the word is much faster than matching every line
+    position = text.find('solid')
+    while position >= 0:
+      start = text.rfind('\n', 0, position) + 1
+      end   = text.find('\n', position)
+      end   = len(text) if end < 0 else end
+
+      prefix = text[start:position].strip()
+      if prefix in ('', 'end'):
+        yield start, end, f'{prefix}solid', text[position + len('solid'):end].strip()
+
+      position = text.find('solid', end)
+
+  def parse_ascii_facets(self, text):
+    """Parse the facets (and colors) between solid keywords in bulk."""
+    line = self.current['line']
+    self.current['line'] += text.count('\n')
+
+    tokens = np.array(text.split())
+    if len(tokens) == 0:
+      return
+
+    if self.current['state'] is not ParserState.PARSE_FACET:
+      raise STLStateError(line, self.current['state'], tokens[0])
+
+    starts = {keyword: np.flatnonzero(tokens == keyword) for keyword in ('normal', 'vertex', 'color')}
+
+    # Every normal, vertex, and color keyword is followed by three numbers
+    values = {}
+    is_number = np.zeros(len(tokens), dtype=bool)
+    for keyword, indices in starts.items():
+      components = indices[:, np.newaxis] + np.arange(1, 4)
+      if components.size and components.max() >= len(tokens):
+        raise STLUnexpectedSize(line, keyword)
+
+      try:
+        values[keyword] = tokens[components].astype(float)
+      except ValueError:
+        raise STLFloatError(line, keyword)
+
+      is_number[components.ravel()] = True
+
+    word_indices = np.flatnonzero(~is_number)
+    words = tokens[word_indices]
+    unknown = ~np.isin(words, self.STRUCTURE_KEYWORDS)
+    if unknown.any():
+      raise ParserError(line, f'Unknown keyword: {words[unknown][0]}')
+
+    # Each vertex belongs to the facet of the closest preceding normal
+    owners = np.searchsorted(starts['normal'], starts['vertex'], side='right') - 1
+    if len(owners) and owners.min() >= 0:
+      counts = np.bincount(owners, minlength=len(starts['normal']))
+      if np.any(counts != 3):
+        raise STLNotATriangle(line, counts[counts != 3][0])
+
+    self.check_facet_words(text, line, words, word_indices)
+
+    mesh = self.current['mesh']
+    mesh['normals'].append(values['normal'])
+    mesh['vertices'].append(values['vertex'].reshape(-1, 3, 3))
+
+    if len(values['color']):
+      mesh['color'] = values['color'][-1].tolist()
+
+    self.stats['facets']   += len(starts['normal'])
+    self.stats['vertices'] += len(starts['vertex'])
+
+  def check_facet_words(self, text, line, words, word_indices):
+    """Check that the words (without numbers) repeat the keywords of a facet, with colors only between facets.
+
+    Like the state machine, `loop` may be left out after `outer`.
+    """
+    is_color = words == 'color'
+    is_loop  = (words == 'loop') & np.concatenate([[False], words[:-1] == 'outer'])
+
+    is_structure = ~(is_color | is_loop)
+    structure = words[is_structure]
+
+    # Position of every word within its facet (colors take the position of the next facet word)
+    positions = (np.cumsum(is_structure) - is_structure) % len(self.FACET_WORDS)
+
+    wrong = np.zeros(len(words), dtype=bool)
+    wrong[is_structure] = structure != np.resize(self.FACET_WORDS, len(structure))
+    wrong[is_color] = positions[is_color] != 0
+
+    if wrong.any():
+      first = np.flatnonzero(wrong)[0]
+      token_line = line + self.token_line(text, word_indices[first])
+
+      raise STLStateError(token_line, self.FACET_STATES[positions[first]], words[first])
+
+    # Facets never span solid keywords so all of the facets must be complete
+    if len(structure) % len(self.FACET_WORDS):
+      raise STLStateError(self.current['line'], self.FACET_STATES[len(structure) % len(self.FACET_WORDS)], 'endsolid')
+
+  @staticmethod
+  def token_line(text, index):
+    """Return the number of lines before the whitespace separated token at an index of the text."""
+    count = 0
+    for line_number, line in enumerate(text.split('\n')):
+      count += len(line.split())
+      if count > index:
+        return line_number
+
+    return text.count('\n')
+
+  def parse_ascii_lines(self, file):
     for line in file:
-      self.consume(line.strip())
+      line = line.strip()
+      if line:
+        self.consume(line)
+
       self.current['line'] += 1
 
+    if self.current['state'] is not ParserState.PARSE_SOLID:
+      raise STLStateError(self.current['line'], self.current['state'], 'end of file')
+
   def add_warning(self, warning_type : WarningType):
     # Store the line that generated the warning to display to the user
     if isinstance(warning_type, WarningType):
       self.warnings[warning_type] = self.current['line']
 
-  def parse_components(self, keyword, components_string):
+  def parse_components(self, keyword, components_string = ''):
     try:
-      components = list(map(float, components_string.split(' ')))
+      components = list(map(float, components_string.split()))
     except ValueError:
       raise STLFloatError(self.current['line'], keyword)
 
@@ -153,7 +311,7 @@ class STLParser:
 
   def consume(self, line):
     # Ignore case
-    keyword, *rest = line.lower().split(' ', 1)
+    keyword, *rest = line.lower().split(None, 1)
 
     if keyword in self.KEYWORD_WHITELIST:
       fn = getattr(self, keyword)
@@ -167,8 +325,8 @@ class STLParser:
     fn(*rest)
 
   @check_state(ParserState.PARSE_SOLID)
-  def solid(self, name):
-    self.current['mesh'] = Mesh(name)
+  def solid(self, name = ''):
+    self.current['mesh'] = {'name': name, 'normals': [], 'vertices': [], 'color': None}
     self.current['state'] = ParserState.PARSE_FACET
 
   @check_state(ParserState.PARSE_FACET)
@@ -177,11 +335,11 @@ class STLParser:
     if self.show_warnings and not all(0.0 <= color_component <= 1 for color_component in [r, g, b]):
       self.add_warning(WarningType.INVALID_COLOR)
 
-    self.current['mesh'].set_color(r, g, b)
+    self.current['mesh']['color'] = [r, g, b]
 
   @check_state(ParserState.PARSE_FACET)
-  def facet(self, normal):
-    self.current['facet'] = Facet()
+  def facet(self, normal = ''):
+    self.current['facet'] = {'normal': None, 'vertices': []}
     self.stats['facets'] += 1
 
     # Continue processing the normal
@@ -190,13 +348,14 @@ class STLParser:
 
   @check_state(ParserState.PARSE_NORMAL)
   def normal(self, x, y, z):
-    n = Vector3(x, y, z)
+    n = np.array([x, y, z])
+    length = np.linalg.norm(n)
 
-    if self.show_warnings and not n.is_unit():
+    if self.show_warnings and not np.isclose(length, 1) and length > 0:
       self.add_warning(WarningType.NON_UNIT_NORMAL)
-      n.normalize()
+      n /= length
 
-    self.current['facet'].normal = n
+    self.current['facet']['normal'] = n
     self.current['state'] = ParserState.PARSE_LOOP
 
   @check_state(ParserState.PARSE_LOOP)
@@ -208,51 +367,54 @@ class STLParser:
 
   @check_state(ParserState.PARSE_VERTEX)
   def vertex(self, x, y, z):
-    v = Vector3(x, y, z)
-    self.current['facet'].append(v, recompute=False)
+    self.current['facet']['vertices'].append([x, y, z])
     self.stats['vertices'] += 1
 
   @check_state(ParserState.PARSE_VERTEX)
   def endloop(self):
-    facet = self.current['facet']
+    vertices = self.current['facet']['vertices']
 
-    if not facet.is_triangle():
-      raise STLNotATriangle(self.current['line'], facet.size())
+    if len(vertices) != 3:
+      raise STLNotATriangle(self.current['line'], len(vertices))
 
     self.current['state'] = ParserState.PARSE_LOOP
 
   @check_state(ParserState.PARSE_LOOP)
   def endfacet(self):
-    current_facet = self.current['facet']
+    normal   = self.current['facet']['normal']
+    vertices = np.array(self.current['facet']['vertices'])
 
-    # TODO: Switch how the ASCII parser constructs facets.
-    # Instead of appending vertices into a constructed facet
-    # Hold onto vertices and then construct the facet directly here (i.e. Facet(vertices, normal))
-    current_facet.compute_aabb()
-    current_facet.compute_edges()
+    if self.show_warnings:
+      computed = np.cross(vertices[1] - vertices[0], vertices[2] - vertices[0])
+      length = np.linalg.norm(computed)
 
-    try:
-      if self.compute_normals and self.show_warnings:
-        computed = self.current['facet'].computed_normal
-        if not vector3.almost_equal(current_facet.normal, computed, 0.0001):
-            self.add_warning(WarningType.CONFLICTING_NORMALS)
-    except DegenerateTriangleError:
-      if self.show_warnings:
+      if np.isclose(length, 0):
         self.add_warning(WarningType.DEGENERATE_TRIANGLE)
+      elif self.compute_normals and not np.allclose(normal, computed / length, atol=0.0001):
+        self.add_warning(WarningType.CONFLICTING_NORMALS)
 
-    self.current['mesh'].append(current_facet)
+    self.current['mesh']['normals'].append(normal[np.newaxis])
+    self.current['mesh']['vertices'].append(vertices[np.newaxis])
     self.current['state'] = ParserState.PARSE_FACET
 
   @check_state(ParserState.PARSE_FACET)
-  def endsolid(self, name):
+  def endsolid(self, name = ''):
+    mesh = self.current['mesh']
+
     if self.show_warnings:
-      # We know we've seen at least one valid facet if the current facet is a triangle
-      if not self.current['facet'].is_triangle():
+      if not mesh['normals']:
         self.add_warning(WarningType.EMPTY_SOLID)
 
       # Make sure the name of the endsolid call matches the opening solid call
-      if name != self.current['mesh'].name:
+      if name != mesh['name']:
         self.add_warning(WarningType.END_SOLID_NAME_MISMATCH)
 
-    self.meshes.append(self.current['mesh'])
+    records = np.zeros(sum(len(normals) for normals in mesh['normals']), dtype=FACET_DTYPE)
+    if len(records):
+      records['normal']   = np.concatenate(mesh['normals'])
+      records['vertices'] = np.concatenate(mesh['vertices'])
+    # Number the solids like binary files number their meshes
+    records['attribute'] = len(self.meshes)
+
+    self.meshes.append(ArrayMesh(mesh['name'], records, mesh['color']))
     self.current['state'] = ParserState.PARSE_SOLID
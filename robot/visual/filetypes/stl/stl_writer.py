@@ -1,7 +1,42 @@
-import ctypes, struct
+import numpy as np
 
+from robot.visual.filetypes.array_mesh     import FACET_DTYPE
 from robot.visual.filetypes.stl.stl_type import STLType
 
+# One ASCII facet (normal followed by three vertices)
+ASCII_FACET = (
+  '  facet normal %e %e %e\n'
+  '    outer loop\n'
+  '      vertex %e %e %e\n'
+  '      vertex %e %e %e\n'
+  '      vertex %e %e %e\n'
+  '    endloop\n'
+  '  endfacet\n'
+)
+
+def mesh_records(mesh, mesh_id: int = 0) -> np.ndarray:
+  """Return the FACET_DTYPE records of a Mesh with the mesh id stored in the attribute."""
+  if hasattr(mesh, 'records'):
+    records = np.array(mesh.records, dtype=FACET_DTYPE)
+  else:
+    records = np.zeros(len(mesh.facets), dtype=FACET_DTYPE)
+    records['vertices'] = [[[*vertex] for vertex in facet.vertices] for facet in mesh.facets]
+
+    # Facets without a normal get one computed from their vertices
+    triangles = records['vertices'].astype(float)
+    computed = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(computed, axis=1, keepdims=True)
+    computed = np.divide(computed, lengths, out=np.zeros_like(computed), where=lengths > 0)
+
+    records['normal'] = [
+      [*facet.normal] if facet.normal is not None else normal
+      for facet, normal in zip(mesh.facets, computed.tolist())
+    ]
+
+  records['attribute'] = mesh_id
+
+  return records
+
 class STLWriter():
   FILE_EXTENSION = '.stl'
 
@@ -13,27 +48,31 @@ class STLWriter():
     self.file_type = file_type
 
   def write(self, meshes):
+    # We use the attribute value to identify which mesh a facet belongs to (see STLParser.parse_binary)
+    tables = [mesh_records(mesh, mesh_id) for mesh_id, mesh in enumerate(meshes)]
+
     with open(self.file_name, self.file_type.write_mode()) as file:
-      file.write(self.header())
-      # Placeholder bytes for number of facets
-      file.write(bytes(4))
+      if self.file_type is STLType.BINARY:
+        self.write_binary(file, tables)
+      else:
+        self.write_ascii(file, meshes, tables)
+
+  def write_binary(self, file, tables):
+    records = np.concatenate(tables) if tables else np.zeros(0, dtype=FACET_DTYPE)
 
-      num_facets = 0
-      mesh_id = 0
-      for mesh in meshes:
-        for facet in mesh.facets:
-          normal = facet.normal if facet.normal is not None else facet.computed_normal
-          buffer = [ *normal, *facet.vertices[0], *facet.vertices[1], *facet.vertices[2], mesh_id ]
-          file.write(struct.pack('<fff fff fff fff H', *buffer))
-          num_facets += 1
+    file.write(self.header())
+    file.write(np.uint32(len(records)).tobytes())
+    file.write(records.tobytes())
 
-        mesh_id += 1
+  def write_ascii(self, file, meshes, tables):
+    for mesh, records in zip(meshes, tables):
+      values = np.hstack((records['normal'], records['vertices'].reshape(-1, 9))).ravel().tolist()
 
-      # Go back to the beginning to write the number of facets
-      file.seek(80)
-      file.write(bytes(ctypes.c_uint32(num_facets)))
+      file.write(f'solid {mesh.name}\n')
+      file.write((ASCII_FACET * len(records)) % tuple(values))
+      file.write(f'endsolid {mesh.name}\n')
 
   def header(self):
     # Header is 80 bytes long
     header = 'Written by robotpy, http://www.github.com/jbschwartz/robotpy'
-    return header.encode() + bytes(80 - len(header))
\ No newline at end of file
+    return header.encode() + bytes(80 - len(header))
@@ -0,0 +1,46 @@
+import numpy as np
+
+from typing import Iterable
+
+from spatial import AABB, Matrix4
+
+def row_major(matrix: Matrix4) -> np.ndarray:
+  """Return a Matrix4 (whose elements are column-major) as a row-major numpy array."""
+  return np.array(matrix.elements, dtype=float).reshape(4, 4).T
+
+def frustum_planes(clip_matrix: np.ndarray) -> np.ndarray:
+  """Return the (6, 4) normalized (a, b, c, d) planes of the frustum of a row-major world to clip space matrix.
+
+  The planes (left, right, bottom, top, near, far) face inwards: points inside have a x + b y + c z + d >= 0.
+  """
+  x, y, z, w = clip_matrix
+
+  planes = np.array([w + x, w - x, w + y, w - y, w + z, w - z])
+
+  return planes / np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+
+def camera_frustum(camera: 'Camera') -> np.ndarray:
+  """Return the frustum planes of a Camera's projection and view in world space."""
+  world_to_camera = row_major(Matrix4.from_transform(camera.world_to_camera))
+
+  return frustum_planes(row_major(camera.projection.matrix) @ world_to_camera)
+
+def aabb_bounds(aabbs: Iterable[AABB]) -> np.ndarray:
+  """Return the (N, 2, 3) minimum and maximum corners of AABBs."""
+  corners = np.array([[[*corner] for corner in aabb.corners] for aabb in aabbs], dtype=float).reshape(-1, 8, 3)
+
+  return np.stack([corners.min(axis=1), corners.max(axis=1)], axis=1)
+
+def visible(planes: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+  """Return a boolean mask of the (N, 2, 3) bounds which are at least partially inside the frustum planes.
+
+  A box is only rejected if it is entirely behind one plane, so boxes near frustum corners may be kept (conservative).
+  """
+  centers = bounds.mean(axis=1)
+  extents = (bounds[:, 1] - bounds[:, 0]) / 2
+
+  # Signed distance of each center to each plane and the box's largest extent along the plane normal
+  distances = centers @ planes[:, :3].T + planes[:, 3]
+  radii     = extents @ np.abs(planes[:, :3]).T
+
+  return np.all(distances + radii >= 0, axis=1)
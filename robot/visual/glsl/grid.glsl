@@ -2,7 +2,6 @@
 
 in vec3 vin_position;
 out vec4 vout_world_pos;
-out vec4 gl_Position;
 
 layout (std140) uniform Matrices
 {
@@ -22,6 +21,8 @@ void main()
 
 in vec4 vout_world_pos;
 
+out vec4 fout_color;
+
 uniform float step_size;
 uniform float minor_step_size;
 uniform vec3 in_grid_color;
@@ -56,8 +57,8 @@ void main(void)
     total = minor_color;
   }
 
-  gl_FragColor = total;
-  gl_FragColor.a = gl_FragColor.a - smoothstep(2000, 4000, length(vout_world_pos.xy));
+  fout_color = total;
+  fout_color.a = fout_color.a - smoothstep(2000, 4000, length(vout_world_pos.xy));
 
 }
 
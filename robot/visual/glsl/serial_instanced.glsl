@@ -0,0 +1,79 @@
+#if defined(VERTEX)
+
+in vec3 vin_position;
+in vec3 vin_normal;
+in int vin_mesh_index;
+
+out vec3 vout_color;
+out vec3 vout_normal;
+out vec3 frag_pos;
+
+layout (std140) uniform Matrices
+{
+  mat4 projection;
+  mat4 view;
+};
+
+// One per robot (see instance_functions.SERIAL_INSTANCE_DTYPE)
+struct Instance {
+  mat4 model_matrices[7];
+  vec4 link_colors[7];
+  // Use the link colors if w is non-zero
+  vec4 robot_color;
+};
+
+layout (std430) readonly buffer Instances
+{
+  Instance instances[];
+};
+
+// Index of the draw's first instance (gl_InstanceID starts at 0 for every draw without GLSL 4.60's gl_BaseInstance)
+uniform int base_instance;
+
+void main(void)
+{
+  Instance instance = instances[base_instance + gl_InstanceID];
+
+  if(instance.robot_color.w != 0) {
+    vout_color = instance.link_colors[vin_mesh_index].rgb;
+  } else {
+    vout_color = instance.robot_color.rgb;
+  }
+
+  mat4 model_matrix = instance.model_matrices[vin_mesh_index];
+
+  vout_normal = vec3(model_matrix * vec4(vin_normal, 0));
+  frag_pos =  vec3(model_matrix * vec4(vin_position, 1));
+  gl_Position = projection * view * model_matrix * vec4(vin_position, 1.0);
+}
+
+#elif defined(FRAGMENT)
+
+in vec3 vout_color;
+in vec3 vout_normal;
+in vec3 frag_pos;
+
+out vec4 fout_color;
+
+layout (std140) uniform Light {
+  vec3 position;
+  vec3 color;
+  float intensity;
+};
+
+void main(void)
+{
+  vec3 ambient = intensity * color;
+
+  vec3 norm = normalize(vout_normal);
+  vec3 lightDir = normalize(position - frag_pos);
+
+  float diff = max(dot(norm, lightDir), 0.1);
+  vec3 diffuse = diff * color;
+
+  vec3 result = (ambient + diffuse) * vout_color;
+
+  fout_color = vec4(result, 1.0);
+}
+
+#endif
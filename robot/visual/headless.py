@@ -0,0 +1,181 @@
+import ctypes, os
+
+import numpy as np
+
+from typing import Iterator
+
+from spatial             import Vector3
+from .filetypes.png      import write_png
+from .messaging.emitter  import emitter
+from .messaging.event    import Event
+from .opengl.framebuffer import Framebuffer
+
+# PyOpenGL chooses its platform (e.g., GLX, EGL or OSMesa) when OpenGL is first imported
+PLATFORM_VARIABLE = 'PYOPENGL_PLATFORM'
+
+# OpenGL version of the offscreen context (the shaders need 4.3 for storage buffers)
+CONTEXT_VERSION = (4, 3)
+
+class EGLContext():
+  """OpenGL context on a pbuffer surface of the default EGL display (e.g., a GPU or Mesa's llvmpipe, no X server)."""
+  def __init__(self, width: int, height: int) -> None:
+    from OpenGL import EGL
+
+    self.EGL = EGL
+
+    # Without a display server Mesa's EGL needs its surfaceless platform (other drivers ignore this)
+    if not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+      os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+    self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+    major, minor = EGL.EGLint(), EGL.EGLint()
+    if not EGL.eglInitialize(self.display, ctypes.pointer(major), ctypes.pointer(minor)):
+      raise RuntimeError('EGL initialization failed')
+
+    config_attributes = [
+      EGL.EGL_SURFACE_TYPE,    EGL.EGL_PBUFFER_BIT,
+      EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+      EGL.EGL_RED_SIZE,   8,
+      EGL.EGL_GREEN_SIZE, 8,
+      EGL.EGL_BLUE_SIZE,  8,
+      EGL.EGL_ALPHA_SIZE, 8,
+      EGL.EGL_DEPTH_SIZE, 24,
+      EGL.EGL_NONE
+    ]
+
+    config, count = EGL.EGLConfig(), EGL.EGLint()
+    if not EGL.eglChooseConfig(self.display, (EGL.EGLint * len(config_attributes))(*config_attributes), ctypes.pointer(config), 1, ctypes.pointer(count)) or count.value == 0:
+      raise RuntimeError('No EGL configuration supports offscreen OpenGL rendering')
+
+    surface_attributes = [EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE]
+    self.surface = EGL.eglCreatePbufferSurface(self.display, config, (EGL.EGLint * len(surface_attributes))(*surface_attributes))
+
+    EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+
+    context_attributes = [
+      EGL.EGL_CONTEXT_MAJOR_VERSION,       CONTEXT_VERSION[0],
+      EGL.EGL_CONTEXT_MINOR_VERSION,       CONTEXT_VERSION[1],
+      EGL.EGL_CONTEXT_OPENGL_PROFILE_MASK, EGL.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+      EGL.EGL_NONE
+    ]
+    self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, (EGL.EGLint * len(context_attributes))(*context_attributes))
+    if not self.context:
+      raise RuntimeError(f'EGL could not create an OpenGL {CONTEXT_VERSION[0]}.{CONTEXT_VERSION[1]} core context')
+
+    EGL.eglMakeCurrent(self.display, self.surface, self.surface, self.context)
+
+  def close(self) -> None:
+    EGL = self.EGL
+
+    EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+    EGL.eglDestroySurface(self.display, self.surface)
+    EGL.eglDestroyContext(self.display, self.context)
+    EGL.eglTerminate(self.display)
+
+class OSMesaContext():
+  """OpenGL context of Mesa's software renderer drawing into client memory."""
+  def __init__(self, width: int, height: int) -> None:
+    from OpenGL import GL, arrays, osmesa
+
+    self.osmesa = osmesa
+
+    attributes = [
+      osmesa.OSMESA_FORMAT,                osmesa.OSMESA_RGBA,
+      osmesa.OSMESA_DEPTH_BITS,            24,
+      osmesa.OSMESA_PROFILE,               osmesa.OSMESA_CORE_PROFILE,
+      osmesa.OSMESA_CONTEXT_MAJOR_VERSION, CONTEXT_VERSION[0],
+      osmesa.OSMESA_CONTEXT_MINOR_VERSION, CONTEXT_VERSION[1],
+      0
+    ]
+    self.context = osmesa.OSMesaCreateContextAttribs(attributes, None)
+    if not self.context:
+      raise RuntimeError(f'OSMesa could not create an OpenGL {CONTEXT_VERSION[0]}.{CONTEXT_VERSION[1]} core context')
+
+    # The default framebuffer is not read (frames are drawn to a Framebuffer) but OSMesa requires one
+    self.buffer = arrays.GLubyteArray.zeros((height, width, 4))
+    if not osmesa.OSMesaMakeCurrent(self.context, self.buffer, GL.GL_UNSIGNED_BYTE, width, height):
+      raise RuntimeError('OSMesa could not make the context current')
+
+  def close(self) -> None:
+    self.osmesa.OSMesaDestroyContext(self.context)
+
+CONTEXTS = {
+  'egl':    EGLContext,
+  'osmesa': OSMesaContext
+}
+
+@emitter
+class HeadlessWindow():
+  """Offscreen stand-in for Window which renders frames into arrays without a display.
+
+  The same Renderer, shaders and entity registrations are used: the Renderer listens to the same events.
+  PyOpenGL must use its EGL or OSMesa platform, which is only possible if PYOPENGL_PLATFORM is set to `egl` or `osmesa`
+  before OpenGL is first imported (e.g., `PYOPENGL_PLATFORM=egl python script.py`).
+  """
+  def __init__(self, width: int, height: int, samples: int = 4) -> None:
+    self.width  = width
+    self.height = height
+
+    platform = os.environ.get(PLATFORM_VARIABLE, '').lower()
+    if platform not in CONTEXTS:
+      raise RuntimeError(f'Headless rendering needs {PLATFORM_VARIABLE} set to one of {", ".join(CONTEXTS)} (got `{platform}`)')
+
+    self.context = CONTEXTS[platform](width, height)
+    self.framebuffer = Framebuffer(width, height, samples)
+    self.framebuffer.bind()
+
+    self.started = False
+
+  def __enter__(self) -> 'HeadlessWindow':
+    return self
+
+  def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+    self.close()
+
+  def ndc(self, cursor):
+    return Vector3(2 * cursor.x / self.width - 1, 1 - 2 * cursor.y / self.height)
+
+  def start(self) -> None:
+    """Provide observers the frame size and start the renderer (as Window.run does)."""
+    self.emit(Event.WINDOW_RESIZE, self.width, self.height)
+    self.emit(Event.START_RENDERER)
+
+    # Starting the renderer may have changed the framebuffer binding
+    self.framebuffer.bind()
+    self.started = True
+
+  def render(self, delta: float = 0) -> np.ndarray:
+    """Advance observers by `delta` seconds, draw one frame and return its (height, width, 4) RGBA pixels."""
+    if not self.started:
+      self.start()
+
+    self.emit(Event.UPDATE, delta = delta)
+
+    self.emit(Event.START_FRAME)
+    self.emit(Event.DRAW)
+
+    # Observers of END_FRAME (e.g., the Renderer's frame capture) read the resolved frame
+    self.framebuffer.resolve()
+    self.emit(Event.END_FRAME)
+
+    return self.framebuffer.read(resolve=False)
+
+  def frames(self, count: int, delta: float = 0) -> Iterator[np.ndarray]:
+    """Yield `count` frames which are `delta` seconds apart."""
+    for _ in range(count):
+      yield self.render(delta)
+
+  def save(self, file_path: str, delta: float = 0) -> np.ndarray:
+    """Render one frame and write it as a PNG (or a raw .npy array). Return the pixels."""
+    pixels = self.render(delta)
+
+    if file_path.endswith('.npy'):
+      np.save(file_path, pixels)
+    else:
+      write_png(file_path, pixels)
+
+    return pixels
+
+  def close(self) -> None:
+    self.framebuffer.delete()
+    self.context.close()
@@ -5,6 +5,7 @@ class Event(enum.Enum):
   START_FRAME    = enum.auto()
   UPDATE         = enum.auto()
   DRAW           = enum.auto()
+  END_FRAME      = enum.auto()
   WINDOW_RESIZE  = enum.auto()
   CURSOR         = enum.auto()
   DRAG           = enum.auto()
@@ -1,12 +1,15 @@
+import math
+
 import numpy as np
 
 from copy   import deepcopy
 from ctypes import c_void_p
 from typing import Iterable
 
-from robot.common    import logger
-from spatial         import Mesh, Vector3
-from .shader_program import ShaderProgram
+from robot.common                        import logger
+from robot.visual.filetypes.indexed_mesh import weld
+from spatial                             import Mesh, Vector3
+from .shader_program                     import ShaderProgram
 
 from OpenGL.GL import *
 
@@ -18,24 +21,73 @@ MESH_BUFFER_ATTRS = {
 
 ATTRIBI_TYPES = (GL_BYTE, GL_UNSIGNED_BYTE, GL_SHORT, GL_UNSIGNED_SHORT, GL_INT, GL_UNSIGNED_INT)
 
+# Interleaved vertex position and normal floats followed by the mesh index
+MESH_BUFFER_DTYPE = np.dtype([('', np.float32, 6), ('', np.int32)])
+
+def get_triangles(mesh: Mesh) -> np.ndarray:
+  """Return the (F, 3, 3) facet vertices of a Mesh."""
+  if hasattr(mesh, 'triangles'):
+    return np.asarray(mesh.triangles)
+
+  return np.array([[[*vertex] for vertex in facet.vertices] for facet in mesh.facets], dtype=np.float32).reshape(-1, 3, 3)
+
+def get_normals(mesh: Mesh) -> np.ndarray:
+  """Return the (F, 3) facet normals of a Mesh."""
+  if hasattr(mesh, 'normals'):
+    return np.asarray(mesh.normals)
+
+  return np.array([[*facet.normal] for facet in mesh.facets], dtype=np.float32).reshape(-1, 3)
+
+def fill_buffer_data(data: np.ndarray, triangles: np.ndarray, normals: np.ndarray, index: int = 0) -> None:
+  """Fill a MESH_BUFFER_DTYPE array (three elements per facet) from (F, 3, 3) triangles and (F, 3) normals."""
+  vertices = data['f0'].reshape(-1, 3, 6)
+
+  vertices[..., :3] = triangles
+  # Every vertex of a facet gets the facet normal
+  vertices[..., 3:] = normals[:, np.newaxis]
+  data['f1'] = index
+
 def get_buffer_data(mesh: Mesh, index: int = 0) -> np.array:
     """Return a numpy array of flattened, interleaved vertex position and normal floats.
     Index is useful for storing multiple meshes in a single OpenGL buffer.
     This allows the shader program to distinguish between meshes.
     """
-    data = [
-      ([*vertex, *(facet.normal)], index)
-      for facet in mesh.facets
-      for vertex in facet.vertices
-    ]
+    triangles = get_triangles(mesh)
+
+    data = np.empty(3 * len(triangles), dtype=MESH_BUFFER_DTYPE)
+    fill_buffer_data(data, triangles, get_normals(mesh), index)
+
+    return data
+
+def get_indexed_buffer_data(meshes: Iterable[Mesh], tolerance: float = 1e-4, crease_angle: float = math.radians(30)) -> tuple:
+  """Return welded MESH_BUFFER_DTYPE vertices and uint32 element indices for a collection of Meshes (see `weld`)."""
+  data, indices = [], []
+  number_of_vertices = 0
+  for mesh_index, mesh in enumerate(meshes):
+    indexed = weld(get_triangles(mesh), tolerance, crease_angle)
 
-    return np.array(data, dtype=[('', np.float32, 6),('', np.int32)])
+    mesh_data = np.empty(len(indexed.positions), dtype=MESH_BUFFER_DTYPE)
+    mesh_data['f0'] = np.hstack((indexed.positions, indexed.normals))
+    mesh_data['f1'] = mesh_index
 
+    data.append(mesh_data)
+    indices.append(indexed.indices.ravel() + number_of_vertices)
+    number_of_vertices += len(mesh_data)
+
+  if not data:
+    return np.array([], dtype=MESH_BUFFER_DTYPE), np.array([], dtype=np.uint32)
+
+  return np.concatenate(data), np.concatenate(indices).astype(np.uint32)
 
 class Buffer():
   """OpenGL Buffer instance."""
-  def __init__(self, data: np.array = None, attributes: dict = None, size: int = None) -> None:
+  def __init__(self, data: np.array = None, attributes: dict = None, size: int = None, indices: np.array = None) -> None:
     self.vao = glGenVertexArrays(1)
+    # Element indices into data (drawn with glDrawElements) or None to draw the data in order
+    self.indices = indices
+    # (first index, count) of each level of detail in the indices and each level's error (see `from_mesh_lods`)
+    self.levels     = None
+    self.lod_errors = None
 
     if data is not None:
       if len(data) == 0 or attributes is None:
@@ -69,21 +121,70 @@ class Buffer():
   @classmethod
   def from_mesh(cls, mesh: Mesh) -> 'Buffer':
     """Create a Buffer from a Mesh."""
-    data = np.array(get_buffer_data(mesh), dtype=[('', np.float32, 6),('', np.int32)])
+    data = get_buffer_data(mesh)
     # TODO: Maybe there is something better than a deepcopy
     return cls(data, deepcopy(MESH_BUFFER_ATTRS))
 
   @classmethod
   def from_meshes(cls, meshes: Iterable[Mesh]) -> 'Buffer':
     """Create one Buffer for a collection of Meshes."""
-    data = np.array([], dtype=[('', np.float32, 6),('', np.int32)])
-    for mesh_index, mesh in enumerate(meshes):
-      mesh_data = get_buffer_data(mesh, mesh_index)
-      data = np.concatenate((data, mesh_data), axis=0)
+    meshes = list(meshes)
+    triangles = [get_triangles(mesh) for mesh in meshes]
+    ends = np.cumsum([3 * len(mesh_triangles) for mesh_triangles in triangles], dtype=int)
+
+    # Fill one preallocated array in place rather than concatenating per Mesh
+    data = np.empty(ends[-1] if meshes else 0, dtype=MESH_BUFFER_DTYPE)
+    for mesh_index, (mesh, mesh_triangles, end) in enumerate(zip(meshes, triangles, ends)):
+      fill_buffer_data(data[end - 3 * len(mesh_triangles):end], mesh_triangles, get_normals(mesh), mesh_index)
 
     # TODO: Maybe there is something better than a deepcopy
     return cls(data, deepcopy(MESH_BUFFER_ATTRS))
 
+  @classmethod
+  def from_meshes_indexed(cls, meshes: Iterable[Mesh], tolerance: float = 1e-4, crease_angle: float = math.radians(30)) -> 'Buffer':
+    """Create one indexed Buffer for a collection of Meshes with duplicate vertices welded together.
+
+    Vertex normals are smoothed across edges sharper than the crease angle (see `weld`).
+    """
+    data, indices = get_indexed_buffer_data(meshes, tolerance, crease_angle)
+
+    # TODO: Maybe there is something better than a deepcopy
+    return cls(data, deepcopy(MESH_BUFFER_ATTRS), indices=indices if len(data) else None)
+
+  @classmethod
+  def from_mesh_lods(cls, lods: Iterable['MeshLODs'], tolerance: float = 1e-4, crease_angle: float = math.radians(30)) -> 'Buffer':
+    """Create one indexed Buffer holding every level of detail of a collection of Meshes (e.g., a Serial's Links).
+
+    Level k draws level k of every Mesh (or the Mesh's coarsest level if it has fewer levels), so its error is the
+    largest of the Meshes' errors. Draw a level with `draw(mode, instances, level)`.
+    """
+    lods = list(lods)
+    number_of_levels = max((len(mesh_lods) for mesh_lods in lods), default=1)
+
+    data, indices, levels, errors = [], [], [], []
+    number_of_vertices = number_of_indices = 0
+    for level in range(number_of_levels):
+      chosen = [min(level, len(mesh_lods) - 1) for mesh_lods in lods]
+
+      level_data, level_indices = get_indexed_buffer_data(
+        [mesh_lods.levels[index] for mesh_lods, index in zip(lods, chosen)], tolerance, crease_angle
+      )
+
+      data.append(level_data)
+      indices.append(level_indices + number_of_vertices)
+      levels.append((number_of_indices, len(level_indices)))
+      errors.append(max((mesh_lods.errors[index] for mesh_lods, index in zip(lods, chosen)), default=0.0))
+
+      number_of_vertices += len(level_data)
+      number_of_indices  += len(level_indices)
+
+    # TODO: Maybe there is something better than a deepcopy
+    buffer = cls(np.concatenate(data), deepcopy(MESH_BUFFER_ATTRS), indices=np.concatenate(indices).astype(np.uint32))
+    buffer.levels     = levels
+    buffer.lod_errors = np.maximum.accumulate(errors)
+
+    return buffer
+
   @classmethod
   def from_points(cls, points: Iterable[Vector3]) -> 'Buffer':
     """Create one Buffer for a collection of Vector3 points."""
@@ -103,6 +204,10 @@ class Buffer():
   def is_procedural(self) -> bool:
     return not (hasattr(self, 'data') and hasattr(self, 'attributes'))
 
+  @property
+  def is_indexed(self) -> bool:
+    return self.indices is not None
+
   @property
   def stride(self) -> int:
     # np.itemsize gets the size of one element (read: vertex) in the data array
@@ -162,5 +267,35 @@ class Buffer():
 
       glEnableVertexAttribArray(parameters['location'])
 
-    glBindBuffer(GL_ARRAY_BUFFER, 0)
+    if self.is_indexed:
+      # The element buffer binding is part of the vertex array state
+      self.ebo = glGenBuffers(1)
+      glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ebo)
+      glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
+
     glBindVertexArray(0)
+    glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+  def count(self, level: int = 0) -> int:
+    """Return the number of vertices drawn (of a level of detail)."""
+    if self.levels is not None:
+      return self.levels[level][1]
+
+    return len(self.indices) if self.is_indexed else len(self)
+
+  def draw(self, mode: int, instances: int = None, level: int = 0, first_instance: int = 0) -> None:
+    """Draw the buffer (which must be bound), optionally as `instances` instances in one call and at a level of detail.
+
+    Instanced draws start at `first_instance` (the base instance) so that one call can draw a range of packed instances.
+    """
+    offset = None if self.levels is None else c_void_p(4 * self.levels[level][0])
+
+    if instances is not None:
+      if self.is_indexed:
+        glDrawElementsInstancedBaseInstance(mode, self.count(level), GL_UNSIGNED_INT, offset, instances, first_instance)
+      else:
+        glDrawArraysInstancedBaseInstance(mode, 0, len(self), instances, first_instance)
+    elif self.is_indexed:
+      glDrawElements(mode, self.count(level), GL_UNSIGNED_INT, offset)
+    else:
+      glDrawArrays(mode, 0, len(self))
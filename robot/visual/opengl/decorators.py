@@ -1,11 +1,20 @@
-from numbers import Number
-from typing  import Callable, Iterable, Union
+import numpy as np
 
-from robot.utils import raise_if
-from spatial     import Matrix4, Transform, Vector3
+from collections import namedtuple
+from numbers     import Number
+from typing      import Callable, Iterable, Union
+
+from robot.mech.kinematics import column_major, transform_matrices
+from robot.utils           import raise_if
+from spatial               import Matrix4, Transform, Vector3
 
 from .exceptions import UniformArraySizeError, UniformSizeError, UniformTypeError
 
+# Uniform setters are split so that the packed data can be compared before anything is uploaded
+#   pack(values) -> np.ndarray validates and flattens the values
+#   upload(location, data) calls the glUniform* function
+Setter = namedtuple('Setter', 'pack upload')
+
 def flatten_elements(element) -> Iterable[Number]:
   if isinstance(element, Vector3):
     return element.xyz
@@ -45,8 +54,10 @@ def flatten(iterable: Iterable, iterable_size: int, element_size: int, acceptabl
   return numbers
 
 def primative(gl_function: int, acceptable_type: type) -> Callable:
-  def array_wrapper(array_size: int) -> Callable:
-    def wrapper(location: int, values: Iterable) -> None:
+  dtype = np.float32 if acceptable_type is float else np.int32
+
+  def array_wrapper(array_size: int) -> Setter:
+    def pack(values: Iterable) -> np.ndarray:
       if isinstance(values, acceptable_type):
         values = [values]
       elif isinstance(values, (list, tuple)):
@@ -61,8 +72,11 @@ def primative(gl_function: int, acceptable_type: type) -> Callable:
         UniformArraySizeError(len(values), array_size, acceptable_type)
       )
 
-      gl_function(location, array_size, values)
-    return wrapper
+      return np.array(values, dtype=dtype)
+
+    def upload(location: int, data: np.ndarray) -> None:
+      gl_function(location, array_size, data)
+    return Setter(pack, upload)
   return array_wrapper
 
 def vector(gl_function: int, vector_size: int) -> Callable:
@@ -71,11 +85,13 @@ def vector(gl_function: int, vector_size: int) -> Callable:
 
   acceptable_types = (Vector3,)
 
-  def array_wrapper(array_size: int) -> Callable:
-    def wrapper(location: int, values: Union[Vector3, Iterable]) -> None:
-      numbers = flatten(values, array_size, vector_size, acceptable_types)
-      gl_function(location, array_size, numbers)
-    return wrapper
+  def array_wrapper(array_size: int) -> Setter:
+    def pack(values: Union[Vector3, Iterable]) -> np.ndarray:
+      return np.array(flatten(values, array_size, vector_size, acceptable_types), dtype=np.float32)
+
+    def upload(location: int, data: np.ndarray) -> None:
+      gl_function(location, array_size, data)
+    return Setter(pack, upload)
   return array_wrapper
 
 def matrix(gl_function: int, matrix_size: int) -> Callable:
@@ -85,10 +101,25 @@ def matrix(gl_function: int, matrix_size: int) -> Callable:
 
   acceptable_types = (Matrix4, Transform)
 
-  def array_wrapper(array_size: int) -> Callable:
-    def wrapper(location: int, values: Union[Iterable, Matrix4, Transform]) -> None:
-      elements = flatten(values, array_size, matrix_size ** 2, acceptable_types)
+  def array_wrapper(array_size: int) -> Setter:
+    def pack(values: Union[Iterable, Matrix4, Transform, np.ndarray]) -> np.ndarray:
+      if isinstance(values, np.ndarray):
+        # Already column-major floats (e.g., from kinematics.column_major)
+        raise_if(values.size != array_size * matrix_size ** 2, UniformSizeError)
+        return values.astype(np.float32).ravel()
+
+      if isinstance(values, (list, tuple)) and values and all(isinstance(value, Transform) for value in values):
+        raise_if(
+          len(values) != array_size,
+          UniformArraySizeError(len(values), array_size, acceptable_types)
+        )
+        # Convert all of the Transforms at once rather than one Matrix4 at a time
+        return column_major(transform_matrices(values)).ravel()
+
+      return np.array(flatten(values, array_size, matrix_size ** 2, acceptable_types), dtype=np.float32)
+
+    def upload(location: int, data: np.ndarray) -> None:
       # Matrix4 stores elements column-major so transposing is never necessary for OpenGL
-      gl_function(location, array_size, False, elements)
-    return wrapper
+      gl_function(location, array_size, False, data)
+    return Setter(pack, upload)
   return array_wrapper
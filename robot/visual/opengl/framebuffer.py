@@ -0,0 +1,68 @@
+import numpy as np
+
+from OpenGL.GL import *
+
+class Framebuffer():
+  """Offscreen OpenGL framebuffer with (multisampled) color and depth renderbuffers."""
+  def __init__(self, width: int, height: int, samples: int = 4) -> None:
+    self.width   = width
+    self.height  = height
+    self.samples = samples
+
+    self.id = glGenFramebuffers(1)
+    self.renderbuffers = self.attach(self.id, samples)
+
+    # Multisampled pixels cannot be read directly so they are resolved into a second framebuffer
+    self.resolve_id = None
+    if samples > 1:
+      self.resolve_id = glGenFramebuffers(1)
+      self.renderbuffers += self.attach(self.resolve_id, 0)
+
+    glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+  def attach(self, framebuffer: int, samples: int) -> list:
+    glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+
+    renderbuffers = list(glGenRenderbuffers(2))
+    for renderbuffer, (internal_format, attachment) in zip(renderbuffers, [(GL_RGBA8, GL_COLOR_ATTACHMENT0), (GL_DEPTH_COMPONENT24, GL_DEPTH_ATTACHMENT)]):
+      glBindRenderbuffer(GL_RENDERBUFFER, renderbuffer)
+      glRenderbufferStorageMultisample(GL_RENDERBUFFER, samples, internal_format, self.width, self.height)
+      glFramebufferRenderbuffer(GL_FRAMEBUFFER, attachment, GL_RENDERBUFFER, renderbuffer)
+
+    status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+    if status != GL_FRAMEBUFFER_COMPLETE:
+      raise RuntimeError(f'Framebuffer incomplete (status {status})')
+
+    return renderbuffers
+
+  def bind(self) -> None:
+    glBindFramebuffer(GL_FRAMEBUFFER, self.id)
+
+  def resolve(self) -> None:
+    """Make the rendered pixels readable: resolve multisampling and bind the result as the read framebuffer."""
+    read_id = self.id
+    if self.resolve_id is not None:
+      glBindFramebuffer(GL_READ_FRAMEBUFFER, self.id)
+      glBindFramebuffer(GL_DRAW_FRAMEBUFFER, self.resolve_id)
+      glBlitFramebuffer(0, 0, self.width, self.height, 0, 0, self.width, self.height, GL_COLOR_BUFFER_BIT, GL_NEAREST)
+      read_id = self.resolve_id
+
+    glBindFramebuffer(GL_DRAW_FRAMEBUFFER, self.id)
+    glBindFramebuffer(GL_READ_FRAMEBUFFER, read_id)
+
+  def read(self, resolve: bool = True) -> np.ndarray:
+    """Return the rendered (height, width, 4) RGBA pixels (top row first). Skip `resolve` if it was already called."""
+    if resolve:
+      self.resolve()
+
+    glPixelStorei(GL_PACK_ALIGNMENT, 1)
+    pixels = glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE)
+
+    self.bind()
+
+    # OpenGL rows start at the bottom of the image
+    return np.frombuffer(pixels, dtype=np.uint8).reshape(self.height, self.width, 4)[::-1]
+
+  def delete(self) -> None:
+    glDeleteRenderbuffers(len(self.renderbuffers), self.renderbuffers)
+    glDeleteFramebuffers(2 if self.resolve_id is not None else 1, [self.id] + ([self.resolve_id] if self.resolve_id is not None else []))
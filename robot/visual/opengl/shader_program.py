@@ -5,6 +5,7 @@ from typing import Iterable
 from robot.common    import FrozenDict, logger
 from robot.utils     import raise_if
 from .shader         import Shader, ShaderType
+from .storage_buffer import StorageBuffer
 from .uniform        import Uniform
 from .uniform_buffer import UniformBuffer
 
@@ -29,6 +30,16 @@ class UniformDict():
   def __getattr__(self, name):
     return getattr(self._uniforms, name)
 
+  @property
+  def stats(self) -> dict:
+    """Return the uploads and skipped (unchanged) sets summed over the uniforms."""
+    uniforms = vars(self._uniforms).values()
+
+    return {
+      key: sum(uniform.stats[key] for uniform in uniforms)
+      for key in ('uploads', 'skipped')
+    }
+
   def __setattr__(self, name, value):
     try:
       uniform = getattr(self._uniforms, name)
@@ -109,6 +120,16 @@ class ShaderProgram():
     if block_index != GL_INVALID_INDEX:
       glUniformBlockBinding(self.id, block_index, ubo.binding_index)
 
+  def bind_storage_buffer(self, buffer: StorageBuffer) -> None:
+    """Set the ShaderProgram's storage block to the binding index provided by the Storage Buffer.
+
+    If the ShaderProgram doesn't use the StorageBuffer, just ignore it.
+    """
+    block_index = glGetProgramResourceIndex(self.id, GL_SHADER_STORAGE_BLOCK, buffer.name)
+
+    if block_index != GL_INVALID_INDEX:
+      glShaderStorageBlockBinding(self.id, block_index, buffer.binding_index)
+
   def attribute_location(self, name: str) -> int:
     result = glGetAttribLocation(self.id, name)
 
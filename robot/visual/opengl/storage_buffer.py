@@ -0,0 +1,29 @@
+import numpy as np
+
+from OpenGL.GL import *
+
+class StorageBuffer():
+  """OpenGL Shader Storage Buffer Object (e.g., per instance data for instanced draws)."""
+  def __init__(self, name: str, binding_index: int) -> None:
+    self.id            = glGenBuffers(1)  # OpenGL buffer ID
+    self.name          = name
+    self.binding_index = binding_index
+    self.nbytes        = 0
+
+  def load(self, data: np.ndarray) -> None:
+    """Upload the data and bind the buffer to its binding index."""
+    glBindBuffer(GL_SHADER_STORAGE_BUFFER, self.id)
+
+    # Reuse the existing storage when the size is unchanged (e.g., the same instances every frame)
+    if data.nbytes == self.nbytes:
+      glBufferSubData(GL_SHADER_STORAGE_BUFFER, 0, data.nbytes, data)
+    else:
+      glBufferData(GL_SHADER_STORAGE_BUFFER, data.nbytes, data, GL_DYNAMIC_DRAW)
+      self.nbytes = data.nbytes
+
+    glBindBuffer(GL_SHADER_STORAGE_BUFFER, 0)
+    self.bind()
+
+  def bind(self) -> None:
+    """Bind the buffer to its binding index (e.g., again after another buffer used the same index)."""
+    glBindBufferBase(GL_SHADER_STORAGE_BUFFER, self.binding_index, self.id)
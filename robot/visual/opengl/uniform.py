@@ -1,3 +1,5 @@
+import numpy as np
+
 from typing  import Callable
 
 from OpenGL.GL import *
@@ -15,6 +17,13 @@ GL_TYPE_UNIFORM_FN = {
   GL_SAMPLER_2D: None
 }
 
+def resource_values(result):
+  """Return the values of a glGetProgramResource* call (PyOpenGL 3.1.7 and later return (length, values))."""
+  if len(result) == 2 and not np.isscalar(result[1]):
+    return result[1]
+
+  return result
+
 def setter_factory(gl_type: int, array_size: int) -> Callable:
   array_decorator = GL_TYPE_UNIFORM_FN.get(gl_type, None)
 
@@ -29,25 +38,31 @@ class Uniform:
     self.location     = location
     self.set_value    = set_value
     self._value       = None
+    # Bytes of the last uploaded data (the program keeps a uniform's value until it is set again)
+    self._uploaded    = None
 
     self.logged = {}
+    self.stats = {
+      'uploads': 0,
+      'skipped': 0
+    }
 
   @classmethod
   def from_program_index(cls, program_id: int, index: int) -> 'Uniform':
     """Construct a Uniform from the shader program id and the Uniform index."""
     properties = [GL_TYPE, GL_NAME_LENGTH, GL_LOCATION, GL_ARRAY_SIZE]
 
-    gl_type, name_length, location, array_size = glGetProgramResourceiv(
+    gl_type, name_length, location, array_size = resource_values(glGetProgramResourceiv(
       program_id,
       GL_UNIFORM,
       index,
       len(properties),
       properties,
       len(properties)
-    )
+    ))
 
     # Returns a list of ascii values including NUL terminator and [0] for uniform arrays
-    name_ascii = glGetProgramResourceName(program_id, GL_UNIFORM, index, name_length)
+    name_ascii = resource_values(glGetProgramResourceName(program_id, GL_UNIFORM, index, name_length))
 
     # Format the name as a useful string
     name = ''.join(chr(c) for c in name_ascii).strip('\x00').strip('[0]')
@@ -70,7 +85,16 @@ class Uniform:
 
     self._value = value
     try:
-      self.set_value(self.location, value)
+      data = self.set_value.pack(value)
+
+      packed = data.tobytes()
+      if packed == self._uploaded:
+        self.stats['skipped'] += 1
+        return
+
+      self.set_value.upload(self.location, data)
+      self._uploaded = packed
+      self.stats['uploads'] += 1
     except (UniformArraySizeError, UniformSizeError, UniformTypeError) as e:
       if self.logged.get(type(e), None) is None:
         self.logged[type(e)] = True
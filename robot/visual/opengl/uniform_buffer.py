@@ -1,10 +1,12 @@
 from collections import namedtuple
 from OpenGL.GL   import *
-from typing      import Iterable
+from operator    import attrgetter
+from typing      import Iterable, Optional, Tuple
 
 import numpy as np
 
-from spatial import Matrix4, Transform, Vector3
+from robot.mech.kinematics import column_major, transform_matrices
+from spatial               import Matrix4, Transform, Vector3
 
 Mapping = namedtuple('Mapping', 'object fields')
 Field   = namedtuple('Field', 'underlying_type alignment size_in_bytes')
@@ -34,17 +36,10 @@ class UniformBuffer():
 
     glBindBufferBase(GL_UNIFORM_BUFFER, self.binding_index, self.id)
 
-  def resolve_dot_notation(self, start_object, field):
-    current = start_object
-    for attr in field.split('.'):
-      current = getattr(current, attr)
-
-    return current
-
   def fields(self, mapping: Mapping):
     fields = []
     for field in mapping.fields:
-      underlying_type = type(self.resolve_dot_notation(mapping.object, field))
+      underlying_type = type(attrgetter(field)(mapping.object))
       fields.append(Field(underlying_type, alignments[underlying_type], sizes[underlying_type]))
 
       assert fields[-1].size_in_bytes % 4 == 0, "Field size must be divisible by 4 since we're only padding with 4-byte floats"
@@ -70,31 +65,70 @@ class UniformBuffer():
     return paddings
 
   def bind(self, mapping: Mapping):
-    def fetcher():
-      return [self.resolve_dot_notation(mapping.object, field) for field in mapping.fields]
-
-    paddings = self.calculate_padding(self.fields(mapping))
-
-    def builder():
-      values = []
-      for padding, value in zip(paddings, fetcher()):
-        values += [0] * (padding // 4)
-        if isinstance(value, Vector3):
-          values += [*value]
-        elif isinstance(value, Matrix4):
-          values += [*(value.elements)]
-        elif isinstance(value, Transform):
-          matrix = Matrix4.from_transform(value)
-          values += [*(matrix.elements)]
-        elif isinstance(value, (int, float)):
-          values += [value]
-      return values
-
-    self.builder = builder
+    """Lay out the mapped fields (std140) in a staging array that `load` fills and uploads."""
+    fields = self.fields(mapping)
+    paddings = self.calculate_padding(fields)
+
+    # Offsets and sizes in floats
+    self.offsets, self.sizes = [], []
+    current = 0
+    for field, padding in zip(fields, paddings):
+      current += padding
+      self.offsets.append(current // 4)
+      self.sizes.append(field.size_in_bytes // 4)
+      current += field.size_in_bytes
+
+    self.object  = mapping.object
+    self.getters = [attrgetter(field) for field in mapping.fields]
+
+    # Uniform blocks are a multiple of a vec4 in size
+    self.staging = np.zeros(-(-current // 16) * 4, dtype=np.float32)
+    self.allocated = False
+
+    self.stats = {
+      'uploads': 0,
+      'skipped': 0
+    }
+
+  def stage(self) -> Optional[Tuple[int, int]]:
+    """Write the mapped values into the staging array and return the (start, end) floats that changed (None if none)."""
+    start, end = None, None
+    for getter, offset, size in zip(self.getters, self.offsets, self.sizes):
+      value = getter(self.object)
+
+      if isinstance(value, Vector3):
+        values = value.xyz
+      elif isinstance(value, Matrix4):
+        values = value.elements
+      elif isinstance(value, Transform):
+        values = column_major(transform_matrices([value]))
+      else:
+        values = value
+
+      staged = self.staging[offset:offset + size]
+      values = np.asarray(values, dtype=np.float32).reshape(-1)
+      if not self.allocated or not np.array_equal(staged, values):
+        staged[:] = values
+        start = offset if start is None else start
+        end = offset + size
+
+    return None if start is None else (start, end)
 
   def load(self):
-    data_buffer = np.array(self.builder(), dtype=np.float32)
+    changed = self.stage()
+    if changed is None:
+      self.stats['skipped'] += 1
+      return
 
     glBindBuffer(GL_UNIFORM_BUFFER, self.id)
-    glBufferData(GL_UNIFORM_BUFFER, data_buffer.nbytes, data_buffer, GL_DYNAMIC_DRAW)
+
+    if not self.allocated:
+      # Storage is allocated once and then only the changed fields are updated in place
+      glBufferData(GL_UNIFORM_BUFFER, self.staging.nbytes, self.staging, GL_DYNAMIC_DRAW)
+      self.allocated = True
+    else:
+      start, end = changed
+      glBufferSubData(GL_UNIFORM_BUFFER, 4 * start, 4 * (end - start), self.staging[start:end])
+
     glBindBuffer(GL_UNIFORM_BUFFER, 0)
+    self.stats['uploads'] += 1
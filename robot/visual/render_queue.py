@@ -0,0 +1,141 @@
+import math
+
+from collections import namedtuple
+from typing      import Iterable
+
+from OpenGL.GL import *
+
+# One draw: either one instance of a per instance entity or all (visible) instances of an instanced entity at one level
+# `first` is the index of an instanced packet's first instance in the entity's packed instances
+DrawPacket = namedtuple('DrawPacket', 'key entity instances level first', defaults=(0, 0))
+
+def packet_key(transparent: bool, program: int, vao: int, depth: float, sequence: int = 0) -> tuple:
+  """Return the sort key of a packet.
+
+  Opaque packets come first, grouped by program then VAO and drawn front-to-back within a group (for early depth
+  rejection). Transparent packets follow back-to-front since blending depends on order.
+  Packets at equal depths are drawn in the order they were added (`sequence`).
+  """
+  if transparent:
+    return (1, -depth, sequence)
+
+  return (0, program, vao, depth, sequence)
+
+class RenderQueue():
+  """Draw packets of a frame, sorted and submitted with the fewest program, VAO and blend state changes."""
+  def __init__(self) -> None:
+    self.packets = []
+    # (instance, kwargs) pairs of each instanced entity ordered by level, packed once per frame
+    self.instanced = {}
+
+    self.stats = {
+      'packets':          0,
+      'program_binds':    0,
+      'vao_binds':        0,
+      'blend_changes':    0,
+      'instance_uploads': 0,
+      'triangles':        0
+    }
+
+  def clear(self) -> None:
+    self.packets   = []
+    self.instanced = {}
+
+  def add(self, entity: 'Entity', instances: list, depths: Iterable[float] = None, levels: Iterable[int] = None) -> None:
+    """Add packets for an entity's (instance, kwargs) pairs.
+
+    `depths` are the instances' view space distances from the camera. Instances without them (or with infinite depths)
+    sort as infinitely far: transparent ones are drawn before the others, in the order they were added.
+    `levels` are the instances' levels of detail in the entity's buffer (see Buffer.from_mesh_lods).
+    Instanced entities are packed once with their instances ordered by level, and each level draws its own range.
+    """
+    if len(instances) == 0:
+      return
+
+    depths = [math.inf] * len(instances) if depths is None else list(depths)
+    levels = [0] * len(instances) if levels is None else list(levels)
+
+    # The number of packets added so far is the sequence number of the next packet
+    key = lambda depth: packet_key(entity.transparent, entity.shader.id, entity.buffer.vao, depth, len(self.packets))
+
+    if entity.pack_instances is not None:
+      packed = self.instanced.setdefault(entity.name, [])
+
+      # One instanced draw per level of detail over a contiguous range of the packed instances
+      for level in sorted(set(levels)):
+        chosen = [index for index, instance_level in enumerate(levels) if instance_level == level]
+        first = len(packed)
+        packed.extend(instances[index] for index in chosen)
+
+        self.packets.append(DrawPacket(key(min(depths[index] for index in chosen)), entity, packed[first:], level, first))
+    else:
+      for pair, depth, level in zip(instances, depths, levels):
+        self.packets.append(DrawPacket(key(depth), entity, [pair], level))
+
+  def submit(self, instance_buffers: dict) -> None:
+    """Sort the packets and draw them, only binding programs, VAOs and blend state when they change."""
+    self.packets.sort(key=lambda packet: packet.key)
+
+    stats = dict.fromkeys(self.stats, 0)
+    stats['packets'] = len(self.packets)
+
+    program = vao = transparent = bound = None
+    loaded = set()
+    for packet in self.packets:
+      entity = packet.entity
+
+      if entity.transparent != transparent:
+        transparent = entity.transparent
+        self.set_blending(transparent)
+        stats['blend_changes'] += 1
+
+      if entity.shader.id != program:
+        program = entity.shader.id
+        glUseProgram(program)
+        stats['program_binds'] += 1
+
+      if entity.buffer.vao != vao:
+        vao = entity.buffer.vao
+        glBindVertexArray(vao)
+        stats['vao_binds'] += 1
+
+      if entity.pack_instances is not None:
+        # Instance buffers share a binding index so they are bound again after another entity's
+        if entity.name != bound:
+          if entity.name in loaded:
+            instance_buffers[entity.name].bind()
+          else:
+            instance_buffers[entity.name].load(entity.pack_instances(self.instanced[entity.name]))
+            stats['instance_uploads'] += 1
+            loaded.add(entity.name)
+
+          bound = entity.name
+
+        # Shaders without gl_BaseInstance offset gl_InstanceID themselves
+        entity.shader.uniforms.base_instance = packet.first
+        entity.buffer.draw(entity.draw_mode, len(packet.instances), packet.level, packet.first)
+      else:
+        for instance, kwargs in packet.instances:
+          entity.per_instance(instance, entity.shader, **kwargs)
+          entity.buffer.draw(entity.draw_mode, level=packet.level)
+
+      if entity.draw_mode == GL_TRIANGLES:
+        stats['triangles'] += entity.buffer.count(packet.level) // 3 * len(packet.instances)
+
+    # Restore the defaults (see Renderer.configure_opengl): depth writes must be on for the next glClear
+    glBindVertexArray(0)
+    glUseProgram(0)
+    glEnable(GL_BLEND)
+    glDepthMask(GL_TRUE)
+
+    self.stats = stats
+
+  @staticmethod
+  def set_blending(transparent: bool) -> None:
+    # Transparent surfaces blend and are depth tested but do not hide each other
+    if transparent:
+      glEnable(GL_BLEND)
+    else:
+      glDisable(GL_BLEND)
+
+    glDepthMask(GL_FALSE if transparent else GL_TRUE)
@@ -1,17 +1,33 @@
+import numpy as np
+
 from collections import namedtuple
-from typing      import Callable, Iterable
+from typing      import Callable, Iterable, Optional, Tuple
 
 from OpenGL.GL import *
 
 from robot.common                    import logger, Timer
 from robot.visual.messaging.listener import listen, listener
 from robot.visual.messaging.event    import Event
+from spatial                         import Vector3
 
+from .capture               import FrameCapture
+from .filetypes.lod         import stable_levels
+from .frustum               import aabb_bounds, camera_frustum, visible
+from .projection            import OrthoProjection
+from .render_queue          import RenderQueue
 from .opengl.buffer         import Buffer
 from .opengl.shader_program import ShaderProgram
 from .opengl.shader         import ShaderType
+from .opengl.storage_buffer import StorageBuffer
+
+# Entities with `pack_instances` draw all of their instances in one call (see RenderQueue.submit)
+# Instances of entities with `cull` are skipped when their world `aabb` is outside of the camera frustum
+# Entities with `transparent` are blended and drawn after opaque entities (see RenderQueue)
+Entity = namedtuple('Entity', 'name shader draw_mode buffer instances per_instance add_children pack_instances cull transparent', defaults=(None, False, False))
 
-Entity = namedtuple('Entity', 'name shader draw_mode buffer instances per_instance add_children')
+# Storage block name and binding index of per instance data in instanced shaders
+INSTANCE_BLOCK   = 'Instances'
+INSTANCE_BINDING = 0
 
 @listener
 class Renderer():
@@ -21,6 +37,25 @@ class Renderer():
     self.entities = {}
     self.shaders  = {}
     self.ubos     = []
+    # Per instance data of instanced entities by entity name
+    self.instance_buffers = {}
+    # Asynchronous readback of drawn frames (see start_capture)
+    self.capture  = None
+    self.viewport = (0, 0)
+    # Draw packets of the current frame
+    self.queue = RenderQueue()
+    # Frustum culling of entities registered with `cull`
+    self.cull  = True
+    self.stats = {
+      'drawn':  0,
+      'culled': 0
+    }
+    # Level of detail selection for culled entities with level of detail buffers (see detail_levels)
+    self.lod             = True
+    self.pixel_tolerance = 1.0
+    self.lod_hysteresis  = 0.25
+    # Levels of detail drawn last frame by entity name, then by id of each visible instance
+    self.lod_levels      = {}
 
   @listen(Event.START_RENDERER)
   def start(self) -> None:
@@ -53,6 +88,10 @@ class Renderer():
         entity.buffer.set_attribute_locations(entity.shader)
         entity.buffer.load()
 
+      if entity.pack_instances is not None:
+        self.instance_buffers[entity.name] = StorageBuffer(INSTANCE_BLOCK, INSTANCE_BINDING)
+        entity.shader.bind_storage_buffer(self.instance_buffers[entity.name])
+
   @listen(Event.START_FRAME)
   def frame(self):
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
@@ -67,15 +106,123 @@ class Renderer():
   def draw(self):
     self.update_environment()
 
+    planes = camera_frustum(self.camera) if self.cull else None
+    self.stats = dict.fromkeys(self.stats, 0)
+
+    self.queue.clear()
     for entity in self.entities.values():
-      with entity.shader as sp, entity.buffer:
-        for instance, kwargs in entity.instances:
-          entity.per_instance(instance, sp, **kwargs)
+      instances, bounds = self.visible_instances(entity, planes)
+      self.stats['drawn'] += len(instances)
+
+      depths = levels = None
+      if bounds is not None:
+        depths = self.view_depths(bounds.mean(axis=1))
+        levels = self.detail_levels(entity, instances, bounds, depths)
+      elif entity.transparent:
+        # Blending order depends on depth whether or not the entity is culled
+        depths = self.instance_depths(instances)
+
+      self.queue.add(entity, instances, depths, levels)
+
+    self.queue.submit(self.instance_buffers)
+
+  def visible_instances(self, entity: Entity, planes: np.ndarray = None) -> Tuple[list, Optional[np.ndarray]]:
+    """Return the entity's (instance, kwargs) pairs whose world AABBs intersect the frustum `planes` and their (N, 2, 3) AABBs.
+
+    Only entities registered with `cull` have AABBs (otherwise all instances and None are returned).
+    """
+    if not entity.cull or len(entity.instances) == 0:
+      return entity.instances, None
+
+    bounds = aabb_bounds(instance.aabb for instance, _ in entity.instances)
+    instances = entity.instances
+
+    if planes is not None:
+      mask = visible(planes, bounds)
+      self.stats['culled'] += len(mask) - np.count_nonzero(mask)
+
+      instances = [pair for pair, keep in zip(instances, mask) if keep]
+      bounds = bounds[mask]
+
+    return instances, bounds
+
+  def detail_levels(self, entity: Entity, instances: list, bounds: np.ndarray, depths: np.ndarray) -> Optional[np.ndarray]:
+    """Return the coarsest levels of detail whose error projects to at most `pixel_tolerance` pixels (with hysteresis).
+
+    Only entities whose buffer has levels of detail (see Buffer.from_mesh_lods) are given levels.
+    """
+    errors = entity.buffer.lod_errors
+    if not self.lod or errors is None or not all(self.viewport):
+      return None
+
+    projection = self.camera.projection
+    # Pixels per world unit at a distance of one (or at any distance for orthographic projections)
+    pixels_per_unit = self.viewport[1] * projection.matrix.elements[5] / 2
+
+    if isinstance(projection, OrthoProjection):
+      distances = np.ones(len(instances))
+    else:
+      # The nearest any part of the box may be (but not closer than the near plane)
+      radii = np.linalg.norm(bounds[:, 1] - bounds[:, 0], axis=1) / 2
+      distances = np.maximum(depths - radii, projection.near_clip)
 
-          glDrawArrays(entity.draw_mode, 0, len(entity.buffer))
+    previous = self.lod_levels.get(entity.name, {})
+    keys = [id(instance) for instance, _ in instances]
+    current = np.array([previous.get(key, 0) for key in keys], dtype=int)
+
+    levels = stable_levels(errors, current, self.pixel_tolerance * distances / pixels_per_unit, self.lod_hysteresis)
+
+    # Only this frame's instances are kept so that culled or removed instances (whose ids may be reused) are forgotten
+    self.lod_levels[entity.name] = dict(zip(keys, levels.tolist()))
+
+    return levels
+
+  def instance_depths(self, instances: list) -> np.ndarray:
+    """Return the view depths of the centers of the (instance, kwargs) pairs' world `aabb`s (infinite for instances without one)."""
+    aabbs = [getattr(instance, 'aabb', None) for instance, _ in instances]
+    depths = np.full(len(instances), np.inf)
+
+    bounded = [index for index, aabb in enumerate(aabbs) if aabb is not None]
+    if bounded:
+      depths[bounded] = self.view_depths(aabb_bounds(aabbs[index] for index in bounded).mean(axis=1))
+
+    return depths
+
+  def view_depths(self, points: np.ndarray) -> np.ndarray:
+    """Return the distances of (N, 3) world space points in front of the camera (along its line of sight)."""
+    backward = self.camera.camera_to_world(Vector3.Z(), as_type="vector")
+
+    return (np.array([*self.camera.position]) - points) @ np.array([*backward])
+
+  @listen(Event.END_FRAME)
+  def end_frame(self) -> None:
+    if self.capture is not None and all(self.viewport):
+      self.capture.capture(*self.viewport)
+
+  def start_capture(self, sink: Callable, ring_size: int = 3, queue_size: int = 8) -> FrameCapture:
+    """Capture every following frame: `sink(pixels, index)` is called on a background thread with (height, width, 4) RGBA pixels.
+
+    Readback is asynchronous so frames reach the sink a few frames late (and are dropped rather than stalling drawing).
+    """
+    self.stop_capture()
+    self.capture = FrameCapture(sink, ring_size, queue_size)
+
+    return self.capture
+
+  def stop_capture(self) -> dict:
+    """Finish writing the captured frames and return the capture statistics."""
+    if self.capture is None:
+      return {}
+
+    capture, self.capture = self.capture, None
+    capture.close()
+
+    return capture.stats
 
   @listen(Event.WINDOW_RESIZE)
   def window_resize(self, width, height):
+    self.viewport = (width, height)
+
     if width and height:
       glViewport(0, 0, width, height)
 
@@ -100,7 +247,17 @@ class Renderer():
         logger.error(f'Shader program `{shader_name}` not found')
         raise
 
-  def register_entity_type(self, name: str, buffer: Buffer, per_instance: Callable, add_children: Callable = None, shader_name: str = None, draw_mode: int = None) -> None:
+  def register_entity_type(self, name: str, buffer: Buffer, per_instance: Callable, add_children: Callable = None, shader_name: str = None, draw_mode: int = None, pack_instances: Callable = None, cull: bool = False, transparent: bool = False) -> None:
+    """Register a type of entity drawn with a shader and buffer.
+
+    Each instance is drawn separately after `per_instance` sets its uniforms, unless `pack_instances` is provided.
+    Then `pack_instances` packs all (instance, kwargs) pairs into one array for the shader's `Instances` storage block
+    and all instances are drawn in one call.
+    With `cull`, instances (which must have a world space `aabb`) outside of the camera frustum are not drawn.
+    If the buffer also has levels of detail (see Buffer.from_mesh_lods), each instance is drawn at a level chosen from
+    its projected size (see detail_levels).
+    Entity types sharing a shader or buffer are drawn together (see RenderQueue); `transparent` ones are blended last.
+    """
     if self.entities.get(name, None) is not None:
       return logger.warn(f'Entity type `{name}` already registered. Keeping original values')
 
@@ -113,13 +270,16 @@ class Renderer():
       return logger.error(f'Entity type `{name}` creation failed')
 
     self.entities[name] = Entity(
-      name         = name,
-      shader       = self.shaders.get(shader_name),
-      draw_mode    = draw_mode or GL_TRIANGLES,
-      buffer       = buffer,
-      instances    = [],
-      per_instance = per_instance,
-      add_children = add_children
+      name           = name,
+      shader         = self.shaders.get(shader_name),
+      draw_mode      = draw_mode or GL_TRIANGLES,
+      buffer         = buffer,
+      instances      = [],
+      per_instance   = per_instance,
+      add_children   = add_children,
+      pack_instances = pack_instances,
+      cull           = cull,
+      transparent    = transparent
     )
 
   def add(self, entity_type: str, instance, parent = None, **kwargs) -> None:
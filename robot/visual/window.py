@@ -108,6 +108,7 @@ class Window():
         if frame.ready:
           self.emit(Event.START_FRAME)
           self.emit(Event.DRAW)
+          self.emit(Event.END_FRAME)
 
           glfw.swap_buffers(self.window)
           glfw.poll_events()
@@ -0,0 +1,71 @@
+import math, unittest
+
+import numpy as np
+
+from unittest.mock import patch
+
+from robot.collision       import ContinuousChecker, SphereClearance, motion_radii
+from robot.mech.robots     import ABB_IRB_120
+from robot.traj.exceptions import EmptyTrajectoryError, UnreachableWaypointError
+from robot.traj.linear_js  import LinearJS
+from robot.traj.linear_os  import LinearOS
+from spatial               import AABB, Vector3
+
+class TestContinuousChecker(unittest.TestCase):
+  def setUp(self):
+    self.robot = ABB_IRB_120
+    self.robot.angles = [0] * 6
+
+    # A thin obstacle in front of the robot, only touched while the waist sweeps through zero
+    self.obstacle = AABB([Vector3(300, -10, 600), Vector3(350, 10, 660)])
+
+    self.sweep = LinearJS([-math.pi / 2, 0, 0, 0, 0, 0], [math.pi / 2, 0, 0, 0, 0, 0], 10)
+
+  def test_motion_radii_do_not_move_the_base(self):
+    radii = motion_radii(self.robot)
+
+    self.assertTrue(np.all(radii[0] == 0))
+    self.assertTrue(np.all(radii[1:, 0] > 0))
+
+  def test_first_contact_returns_none_without_obstacles(self):
+    checker = ContinuousChecker(self.robot, SphereClearance(self.robot.components, []))
+
+    self.assertIsNone(checker.first_contact(self.sweep))
+    self.assertTrue(checker.is_free(self.sweep))
+
+  def test_first_contact_finds_obstacle_between_waypoints(self):
+    checker = ContinuousChecker(self.robot, SphereClearance(self.robot.components, [self.obstacle]))
+
+    with self.subTest('Waypoints are collision free'):
+      for angles in (self.sweep.starts, self.sweep.ends):
+        self.assertTrue(np.all(checker.clearance_at(angles) > 0))
+
+    contact = checker.first_contact(self.sweep)
+
+    self.assertIsNotNone(contact)
+    self.assertTrue(0 < contact.time < self.sweep.duration / 2)
+    self.assertIn(contact.component, self.robot.components)
+
+  def test_first_contact_accepts_joint_angle_arrays(self):
+    checker = ContinuousChecker(self.robot, SphereClearance(self.robot.components, [self.obstacle]))
+
+    angles = np.array([self.sweep.starts, self.sweep.ends])
+    contact = checker.first_contact(angles, times=[0, 10])
+
+    self.assertAlmostEqual(contact.time, checker.first_contact(self.sweep).time)
+
+  def test_empty_trajectory_is_not_certified(self):
+    checker = ContinuousChecker(self.robot, SphereClearance(self.robot.components, []))
+
+    with self.assertRaises(EmptyTrajectoryError):
+      checker.is_free(np.zeros((0, 6)), times=[])
+
+  def test_unreachable_path_is_not_certified(self):
+    checker = ContinuousChecker(self.robot, SphereClearance(self.robot.components, []))
+    path = LinearOS(self.robot, [Vector3(300, 0, 600), Vector3(300, 200, 600), Vector3(300, 200, 400)])
+
+    # Only the last sample of the path is out of reach
+    solutions = lambda target, robot: [] if abs(target.translation.z - 400) < 1e-6 else [[0] * 6]
+    with patch('robot.traj.linear_os.solve_angles', side_effect=solutions):
+      with self.assertRaises(UnreachableWaypointError):
+        checker.is_free(path)
@@ -0,0 +1,98 @@
+import unittest
+
+import numpy as np
+
+from robot.collision.bvh      import segment_triangle_closest
+from robot.collision.distance import DistanceQuery, MeshObstacle, box_corners, capsule_witness, gjk
+from robot.collision.proxy    import Capsule, OrientedBox
+from robot.mech.robots        import ABB_IRB_120
+
+class TestDistance(unittest.TestCase):
+  def setUp(self):
+    self.rng = np.random.default_rng(0)
+    self.box = OrientedBox(np.zeros(3), np.eye(3), np.ones(3))
+
+  def test_gjk_box_distance_and_witness_points(self):
+    other = self.box._replace(center=np.array([4., 3, 5]))
+
+    result = gjk(box_corners(self.box), box_corners(other))
+
+    self.assertAlmostEqual(result.distance, np.linalg.norm([2, 1, 3]))
+    self.assertTrue(np.allclose(result.first, [1, 1, 1]))
+    self.assertTrue(np.allclose(result.second, [3, 2, 4]))
+
+  def test_gjk_intersecting_boxes_have_zero_distance(self):
+    other = self.box._replace(center=np.array([1.5, 0.5, 0]))
+
+    self.assertAlmostEqual(gjk(box_corners(self.box), box_corners(other)).distance, 0)
+
+  def test_gjk_separates_random_hulls(self):
+    for index in range(20):
+      with self.subTest(f'Hull pair {index}'):
+        first  = self.rng.normal(size=(10, 3))
+        second = self.rng.normal(size=(10, 3)) + [6, 0, 0]
+
+        result = gjk(first, second)
+        normal = (result.second - result.first) / result.distance
+
+        self.assertAlmostEqual(np.linalg.norm(result.second - result.first), result.distance)
+        self.assertTrue(np.all(first @ normal <= result.first @ normal + 1e-6))
+        self.assertTrue(np.all(second @ normal >= result.second @ normal - 1e-6))
+
+  def test_capsule_witness_points_lie_on_surfaces(self):
+    first  = Capsule(np.zeros(3), np.array([0., 0, 10]), 1)
+    second = Capsule(np.array([5., 0, 0]), np.array([5., 0, 10]), 2)
+
+    result = capsule_witness(first, second)
+
+    self.assertAlmostEqual(result.distance, 2)
+    self.assertAlmostEqual(result.first[0], 1)
+    self.assertAlmostEqual(result.second[0], 3)
+
+  def test_mesh_obstacle_matches_brute_force(self):
+    triangles = self.rng.normal(size=(300, 3, 3)) * 5
+    capsule = Capsule(np.array([20., 0, 0]), np.array([20., 10, 0]), 0.5)
+
+    on_segment, on_mesh = segment_triangle_closest(capsule.start, capsule.end, triangles)
+    expected = np.linalg.norm(on_segment - on_mesh, axis=1).min() - capsule.radius
+
+    result = MeshObstacle(triangles, leaf_size=8).capsule_distance(capsule)
+
+    self.assertAlmostEqual(result.distance, expected)
+
+class TestDistanceQuery(unittest.TestCase):
+  def setUp(self):
+    self.robot = ABB_IRB_120
+    self.robot.angles = [0] * 6
+    self.query = DistanceQuery()
+
+    obstacle = self.robot.links[3].proxy
+    self.obstacle = obstacle.transform(np.array([
+      [1, 0, 0, 600],
+      [0, 1, 0, 0],
+      [0, 0, 1, 300],
+      [0, 0, 0, 1]
+    ], dtype=float))
+
+  def test_between_uses_component_world_transforms(self):
+    result = self.query.between(self.robot.links[1], self.robot.links[6])
+
+    self.assertGreater(result.distance, 0)
+    self.assertAlmostEqual(np.linalg.norm(result.second - result.first), result.distance)
+
+  def test_batch_matches_single_configuration_queries(self):
+    angles = self.rng_angles()
+    result = self.query.batch(self.robot, angles, [self.obstacle])
+
+    self.assertEqual(result.distance.shape, (len(angles), len(self.robot.components)))
+
+    self.robot.angles = list(angles[3])
+    for index, component in enumerate(self.robot.components):
+      with self.subTest(f'Component {index}'):
+        expected = capsule_witness(self.query.world_proxy(component).capsule, self.obstacle.capsule)
+
+        self.assertAlmostEqual(result.distance[3, index], expected.distance)
+        self.assertTrue(np.allclose(result.first[3, index], expected.first))
+
+  def rng_angles(self):
+    return np.random.default_rng(0).uniform(-1, 1, (10, 6))
@@ -0,0 +1,106 @@
+import math, os, tempfile, unittest
+
+import numpy as np
+
+from robot.collision.occupancy import OccupancyGrid, distance_transform, fill_interior, label_components, sphere_cover
+
+def cube(half_size: float) -> np.ndarray:
+  """Return the 12 triangles of a cube centered on the origin."""
+  vertices = np.array([[x, y, z] for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)], dtype=float) * half_size
+  faces = [
+    (0, 1, 3), (0, 3, 2), (4, 6, 7), (4, 7, 5), (0, 4, 5), (0, 5, 1),
+    (2, 3, 7), (2, 7, 6), (0, 2, 6), (0, 6, 4), (1, 5, 7), (1, 7, 3)
+  ]
+
+  return vertices[np.array(faces)]
+
+class TestOccupancyGrid(unittest.TestCase):
+  def setUp(self):
+    self.grid = OccupancyGrid.from_triangles(cube(50), voxel_size=5)
+
+  def test_contains_surface_and_filled_interior(self):
+    points = np.array([[0, 0, 0], [49, 0, 0], [0, -49, 20], [60, 0, 0], [1000, 0, 0]])
+
+    self.assertEqual(self.grid.contains(points).tolist(), [True, True, True, False, False])
+
+  def test_clearance_is_a_lower_bound(self):
+    centers = np.array([[80, 0, 0], [0, 0, 150]])
+    true_distances = np.array([30, 100])
+
+    clearance = self.grid.clearance(centers)
+
+    self.assertTrue(np.all(clearance <= true_distances))
+    self.assertTrue(np.all(clearance > true_distances - 2 * math.sqrt(3) * self.grid.voxel_size))
+
+  def test_collide_spheres(self):
+    centers = np.array([[80, 0, 0], [80, 0, 0], [0, 0, 0]])
+    radii   = np.array([5, 40, 1])
+
+    self.assertEqual(self.grid.collide(centers, radii).tolist(), [False, True, True])
+
+  def test_save_and_load_round_trip(self):
+    with tempfile.TemporaryDirectory() as directory:
+      file_path = os.path.join(directory, 'grid.npz')
+
+      self.grid.save(file_path)
+      loaded = OccupancyGrid.load(file_path)
+
+    self.assertEqual(loaded.shape, self.grid.shape)
+    self.assertTrue(np.array_equal(loaded.occupied, self.grid.occupied))
+    self.assertTrue(np.array_equal(loaded.distances, self.grid.distances))
+
+  def test_distance_transform_matches_brute_force(self):
+    occupied = np.random.default_rng(0).random((12, 9, 7)) < 0.05
+
+    result = distance_transform(occupied, voxel_size=2)
+
+    cells  = np.indices(occupied.shape).reshape(3, -1).T
+    filled = np.argwhere(occupied)
+    expected = np.linalg.norm((cells[:, np.newaxis] - filled[np.newaxis]) * 2, axis=-1).min(axis=1)
+
+    self.assertTrue(np.allclose(result.ravel(), expected))
+
+  def test_distance_transform_of_empty_rows_and_grids(self):
+    occupied = np.zeros((6, 5, 4), dtype=bool)
+    self.assertTrue(np.all(np.isinf(distance_transform(occupied, voxel_size=1))))
+
+    occupied[5, 4, 3] = True
+    result = distance_transform(occupied, voxel_size=3)
+
+    self.assertAlmostEqual(result[0, 0, 0], 3 * math.sqrt(25 + 16 + 9))
+
+  def test_fill_interior_fills_only_enclosed_volumes(self):
+    surface = np.zeros((11, 11, 11), dtype=bool)
+    # Nested closed shells with a gap between them
+    for low, high in ((1, 9), (3, 7)):
+      surface[low:high + 1, low:high + 1, low:high + 1] = True
+      surface[low + 1:high, low + 1:high, low + 1:high] = False
+
+    filled = fill_interior(surface)
+    self.assertTrue(filled[2, 2, 2] and filled[5, 5, 5])
+    self.assertFalse(filled[0, 0, 0] or filled[10, 5, 5])
+
+    with self.subTest('A hole in the outer shell opens the gap but not the inner shell'):
+      surface[1, 5, 5] = False
+      filled = fill_interior(surface)
+
+      self.assertFalse(filled[2, 2, 2] or filled[1, 5, 5])
+      self.assertTrue(filled[5, 5, 5])
+
+  def test_label_components(self):
+    empty = np.ones((3, 4, 5), dtype=bool)
+    empty[:, 2, :] = False
+
+    labels = label_components(empty).reshape(empty.shape)
+
+    self.assertEqual(np.unique(labels[empty]).tolist(), [0, 15])
+    self.assertTrue(np.all(labels[:, :2] == 0) and np.all(labels[:, 3:] == 15))
+
+  def test_sphere_cover_covers_surface(self):
+    triangles = cube(50)
+    centers = sphere_cover(triangles, radius=10)
+
+    corners = triangles.reshape(-1, 3)
+    distances = np.linalg.norm(corners[:, np.newaxis] - centers[np.newaxis], axis=-1).min(axis=1)
+
+    self.assertTrue(np.all(distances <= 10))
@@ -0,0 +1,93 @@
+import math, unittest
+
+import numpy as np
+
+from robot.collision.proxy import Capsule, OrientedBox, Proxy, ProxyCollider, boxes_overlap, capsule_distance
+from robot.collision.proxy import fit_box, fit_capsule, segment_closest_points, triangles_intersect
+from robot.mech.robots     import ABB_IRB_120
+
+def translation(x, y, z):
+  matrix = np.eye(4)
+  matrix[:3, 3] = [x, y, z]
+  return matrix
+
+class TestProxy(unittest.TestCase):
+  def setUp(self):
+    rng = np.random.default_rng(0)
+    self.points = rng.normal(size=(500, 3)) * [10, 2, 1]
+
+  def test_fit_capsule_encloses_points(self):
+    capsule = fit_capsule(self.points)
+
+    starts = np.broadcast_to(capsule.start, self.points.shape)
+    ends   = np.broadcast_to(capsule.end, self.points.shape)
+    closest, _ = segment_closest_points(starts, ends, self.points, self.points)
+
+    self.assertTrue(np.all(np.linalg.norm(closest - self.points, axis=1) <= capsule.radius + 1e-9))
+
+  def test_fit_box_encloses_points(self):
+    box = fit_box(self.points)
+
+    local = (self.points - box.center) @ box.axes.T
+
+    self.assertTrue(np.all(np.abs(local) <= box.half_extents + 1e-9))
+    self.assertAlmostEqual(np.linalg.det(box.axes), 1)
+
+  def test_segment_closest_points_handles_parallel_and_degenerate_segments(self):
+    with self.subTest('Parallel'):
+      first, second = segment_closest_points(np.zeros(3), np.array([1., 0, 0]), np.array([0.5, 1, 0]), np.array([2., 1, 0]))
+      self.assertAlmostEqual(np.linalg.norm(first - second), 1)
+
+    with self.subTest('Point'):
+      first, second = segment_closest_points(np.zeros(3), np.zeros(3), np.array([-1., 2, 0]), np.array([1., 2, 0]))
+      self.assertAlmostEqual(np.linalg.norm(first - second), 2)
+
+  def test_capsule_distance(self):
+    first  = Capsule(np.zeros(3), np.array([0., 0, 10]), 1)
+    second = Capsule(np.array([5., 0, 0]), np.array([5., 0, 10]), 1)
+
+    self.assertAlmostEqual(capsule_distance(first, second), 3)
+
+  def test_boxes_overlap(self):
+    box = OrientedBox(np.zeros(3), np.eye(3), np.ones(3))
+
+    self.assertTrue(boxes_overlap(box, box._replace(center=np.array([1.9, 0, 0]))))
+    self.assertFalse(boxes_overlap(box, box._replace(center=np.array([2.1, 0, 0]))))
+
+    angle = math.radians(45)
+    rotated = np.array([[math.cos(angle), -math.sin(angle), 0], [math.sin(angle), math.cos(angle), 0], [0, 0, 1]])
+    self.assertTrue(boxes_overlap(box, OrientedBox(np.array([2.3, 0, 0]), rotated, np.ones(3))))
+
+  def test_triangles_intersect(self):
+    first  = np.array([[[0, 0, 0], [1, 0, 0], [0, 1, 0]]], dtype=float)
+    second = np.array([[[0.2, 0.2, -1], [0.2, 0.2, 1], [0.5, 0.5, 1]]], dtype=float)
+
+    self.assertTrue(triangles_intersect(first, second))
+    self.assertFalse(triangles_intersect(first, second + [0, 0, 1.5]))
+
+  def test_proxy_round_trips_through_dict(self):
+    proxy = Proxy.fit(self.points[:498].reshape(-1, 3, 3))
+    result = Proxy.from_dict(proxy.to_dict())
+
+    self.assertTrue(np.allclose(result.capsule.start, proxy.capsule.start))
+    self.assertTrue(np.allclose(result.box.axes, proxy.box.axes))
+
+class TestProxyCollider(unittest.TestCase):
+  def setUp(self):
+    self.collider = ProxyCollider()
+    self.link = ABB_IRB_120.links[3]
+
+  def test_robot_links_are_loaded_with_proxies(self):
+    self.assertTrue(all(link.proxy is not None for link in ABB_IRB_120.links))
+
+  def test_distant_links_are_rejected_by_proxies(self):
+    self.assertFalse(self.collider.collide(self.link, np.eye(4), self.link, translation(2000, 0, 0)))
+    self.assertGreater(self.collider.distance(self.link, np.eye(4), self.link, translation(2000, 0, 0)), 0)
+
+    self.assertEqual(self.collider.stats['proxy_rejects'], 1)
+    self.assertEqual(self.collider.stats['exact_tests'], 0)
+
+  def test_overlapping_links_fall_back_to_exact_meshes(self):
+    self.assertTrue(self.collider.collide(self.link, np.eye(4), self.link, translation(5, 5, 5)))
+
+    self.assertEqual(self.collider.stats['exact_tests'], 1)
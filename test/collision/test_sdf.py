@@ -0,0 +1,105 @@
+import os, tempfile, unittest
+
+import numpy as np
+
+from robot.collision.sdf               import FieldCache, SignedDistanceField, load_fields, save_fields
+from robot.mech.robots                 import ABB_IRB_120
+from robot.visual.filetypes.array_mesh import FACET_DTYPE, ArrayMesh
+from spatial                           import Transform, Vector3
+from .test_occupancy                   import cube
+
+def cube_mesh(half_size):
+  records = np.zeros(12, dtype=FACET_DTYPE)
+  records['vertices'] = cube(half_size)
+
+  return ArrayMesh(0, records)
+
+class TestSignedDistanceField(unittest.TestCase):
+  def setUp(self):
+    self.voxel_size = 2
+    self.field = SignedDistanceField.from_triangles(cube(50), self.voxel_size)
+
+  def test_signed_distances_to_cube(self):
+    points   = np.array([[0, 0, 0], [40, 0, 0], [0, -54, 0], [0, 0, 30]])
+    expected = np.array([-50, -10, 4, -20])
+
+    self.assertTrue(np.allclose(self.field(points), expected, atol=1.5 * self.voxel_size))
+
+  def test_outside_grid_is_lower_bound(self):
+    points = np.array([[200, 0, 0], [0, 0, -500]])
+
+    distances = self.field(points)
+
+    self.assertTrue(np.all(distances <= np.array([150, 450])))
+    self.assertTrue(np.all(distances > 100))
+
+  def test_matrix_transforms_points(self):
+    # Move the cube 100 along x: the matrix maps world points into the cube's frame
+    to_local = np.eye(4)
+    to_local[0, 3] = -100
+
+    self.assertTrue(np.allclose(self.field(np.array([[100, 0, 0]]), to_local), self.field(np.zeros((1, 3)))))
+
+  def test_empty_mesh_is_infinitely_far(self):
+    field = SignedDistanceField.from_triangles(np.zeros((0, 3, 3)), 1)
+
+    self.assertTrue(np.all(np.isinf(field(np.zeros((2, 3))))))
+
+  def test_save_load_and_cache(self):
+    with tempfile.TemporaryDirectory() as directory:
+      file_path = os.path.join(directory, 'fields.npz')
+
+      save_fields(file_path, [self.field])
+      loaded, = load_fields(file_path)
+
+      self.assertTrue(np.array_equal(loaded.values, self.field.values))
+
+      # A cache with a different voxel size rebuilds (and overwrites) the file
+      cache = FieldCache(file_path, [], voxel_size=5)
+      self.assertEqual(len(cache.fields), 0)
+      self.assertEqual(load_fields(file_path), [])
+
+  def test_cache_rebuilds_when_meshes_change(self):
+    with tempfile.TemporaryDirectory() as directory:
+      file_path = os.path.join(directory, 'fields.npz')
+
+      built, = FieldCache(file_path, [cube_mesh(10)], voxel_size=2).fields
+
+      with self.subTest('Unchanged meshes reuse the file'):
+        modified = os.path.getmtime(file_path)
+        cached, = FieldCache(file_path, [cube_mesh(10)], voxel_size=2).fields
+
+        self.assertEqual(os.path.getmtime(file_path), modified)
+        self.assertTrue(np.array_equal(cached.values, built.values))
+
+      with self.subTest('Edited meshes rebuild the fields'):
+        rebuilt, = FieldCache(file_path, [cube_mesh(20)], voxel_size=2).fields
+
+        self.assertFalse(np.array_equal(rebuilt.values, built.values))
+        self.assertAlmostEqual(float(rebuilt(np.zeros((1, 3)))[0]), -20, delta=3)
+
+      with self.subTest('Files without a digest are rebuilt'):
+        save_fields(file_path, [built])
+        rebuilt, = FieldCache(file_path, [cube_mesh(20)], voxel_size=2).fields
+
+        self.assertAlmostEqual(float(rebuilt(np.zeros((1, 3)))[0]), -20, delta=3)
+
+class TestLinkDistance(unittest.TestCase):
+  def setUp(self):
+    self.link = ABB_IRB_120.links[1]
+    self.original = self.link.sdf
+    self.link.sdf = SignedDistanceField.from_triangles(cube(50), 2)
+
+  def tearDown(self):
+    self.link.sdf = self.original
+    ABB_IRB_120.to_world = Transform.from_axis_angle_translation()
+
+  def test_distance_follows_link_pose(self):
+    points = np.array([[0, 0, 0], [30, 40, 290], [-80, 0, 250]])
+    before = self.link.distance(points)
+
+    ABB_IRB_120.to_world = Transform.from_axis_angle_translation(translation=Vector3(1000, 0, 0))
+    after = self.link.distance(points + [1000, 0, 0])
+
+    self.assertTrue(np.allclose(after, before))
+    self.assertFalse(np.allclose(self.link.distance(points), before))
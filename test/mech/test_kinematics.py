@@ -0,0 +1,33 @@
+import math, unittest
+
+import numpy as np
+
+from robot.mech.kinematics import column_major, transform_matrices, transform_matrix
+from spatial               import Transform, Vector3
+
+class TestTransformMatrices(unittest.TestCase):
+  def setUp(self):
+    self.transforms = [
+      Transform.from_axis_angle_translation(Vector3(1, 2, 3), math.radians(40), Vector3(4, -5, 6)),
+      Transform.from_axis_angle_translation(Vector3(0, 1, 0), math.radians(-120), Vector3(100, 0, 0)),
+      Transform.Identity()
+    ]
+
+  def test_matches_transform_matrix(self):
+    matrices = transform_matrices(self.transforms)
+
+    self.assertEqual(matrices.shape, (3, 4, 4))
+    for matrix, transform in zip(matrices, self.transforms):
+      self.assertTrue(np.allclose(matrix, transform_matrix(transform)))
+
+  def test_empty(self):
+    self.assertEqual(transform_matrices([]).shape, (0, 4, 4))
+
+  def test_column_major(self):
+    matrices = transform_matrices(self.transforms)
+    columns = column_major(matrices)
+
+    self.assertEqual((columns.shape, columns.dtype), ((3, 16), np.float32))
+    # Translation is the last column (elements 12 to 14)
+    self.assertTrue(np.allclose(columns[1, 12:15], [100, 0, 0]))
+    self.assertTrue(np.allclose(columns.reshape(3, 4, 4).transpose(0, 2, 1), matrices))
@@ -1,7 +1,9 @@
 import math, unittest
 
-from robot.mech.robots import ABB_IRB_120
-from spatial           import Vector3
+from robot.mech.kinematics import transform_matrix
+from robot.mech.robots     import ABB_IRB_120, serial_dictionary
+from robot.mech.serial     import Serial
+from spatial               import Vector3
 
 class TestSerial(unittest.TestCase):
   def setUp(self):
@@ -36,6 +38,17 @@ class TestSerial(unittest.TestCase):
         result = frame.translation
         self.assertAlmostEqual(result, expected)
 
+  def test_matrices_at_matches_poses(self):
+    angles = [ math.radians(30) ] * 6
+    self.robot.angles = angles
+
+    matrices = self.robot.matrices_at(angles)
+
+    for index, (matrix, pose) in enumerate(zip(matrices, self.robot.poses())):
+      with self.subTest(f"Frame #{index + 1}"):
+        for result, expected in zip(matrix.flatten(), transform_matrix(pose).flatten()):
+          self.assertAlmostEqual(result, expected)
+
   def test_transform_to_robot(self):
     # The last argument accounts for the elbow offset to the wrist
     results = [[ math.radians(45), 0, math.atan(70 / 302) ]]
@@ -57,5 +70,10 @@ class TestSerial(unittest.TestCase):
 
     self.assertAlmostEqual(result, expected)
 
+  def test_from_dict_meshes_attaches_proxies_and_fields(self):
+    proxies, fields = ['proxy'], ['first', 'second']
 
+    serial = Serial.from_dict_meshes(serial_dictionary, [], proxies, fields)
 
+    self.assertEqual([link.proxy for link in serial.links[:2]], ['proxy', None])
+    self.assertEqual([link.sdf for link in serial.links[:3]], ['first', 'second', None])
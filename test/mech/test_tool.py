@@ -0,0 +1,36 @@
+import json, os, tempfile, unittest
+
+from unittest.mock import MagicMock, patch
+
+from robot.mech import tool
+from spatial    import Transform
+
+class TestLoad(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.file_path = os.path.join(self.directory.name, 'tool.json')
+
+    with open(self.file_path, 'w') as file:
+      json.dump({
+        'name':          'Tool',
+        'mesh':          {'file': 'tool.stl', 'proxy_file': 'tool.json', 'scale': 2, 'transform': {}},
+        'tip_transform': {}
+      }, file)
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def load(self, proxies):
+    with patch('robot.mech.tool.from_json', return_value=Transform()), patch('robot.mech.tool.load_proxies', return_value=proxies):
+      return tool.load(self.file_path)
+
+  def test_null_proxy_entry(self):
+    self.assertIsNone(self.load([None]).proxy)
+
+  def test_proxy_is_scaled_like_the_mesh(self):
+    proxy = MagicMock()
+
+    loaded = self.load([proxy])
+
+    proxy.scale.assert_called_once_with(2)
+    self.assertIs(loaded.proxy, proxy.scale.return_value.transform.return_value)
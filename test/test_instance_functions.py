@@ -0,0 +1,24 @@
+import math, unittest
+
+import numpy as np
+
+from robot.instance_functions import serial_instances
+from robot.mech.kinematics    import transform_matrix
+from robot.mech.robots        import ABB_IRB_120
+
+class TestSerialInstances(unittest.TestCase):
+  def test_packs_link_matrices_and_colors(self):
+    serial = ABB_IRB_120
+    serial.angles = [math.radians(30)] * 6
+
+    data = serial_instances([(serial, {'color': [1, 0.5, 0]}), (serial, {})])
+
+    self.assertEqual(data.shape, (2,))
+    # Stored column-major (i.e., transposed) for GLSL
+    for link, matrix in zip(serial.links, data['model_matrices'][0]):
+      self.assertTrue(np.allclose(matrix.T, transform_matrix(link.to_world), atol=1e-3))
+
+    self.assertTrue(np.allclose(data['link_colors'][0, :, :3], [link.color for link in serial.links]))
+    self.assertEqual(data['robot_color'][:, :3].tolist(), [[1, 0.5, 0], [1, 1, 1]])
+    # std430 arrays of this struct have no padding between instances
+    self.assertEqual(data.itemsize, 7 * 64 + 7 * 16 + 16)
@@ -0,0 +1,28 @@
+import unittest
+
+import numpy as np
+
+from robot.visual.filetypes.array_mesh import FACET_DTYPE, ArrayMesh
+from robot.visual.opengl.buffer        import get_buffer_data
+from test.collision.test_occupancy     import cube
+
+class TestGetBufferData(unittest.TestCase):
+  def setUp(self):
+    triangles = cube(1)
+
+    records = np.zeros(len(triangles), dtype=FACET_DTYPE)
+    records['vertices'] = triangles
+    records['normal']   = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]) / 4
+
+    self.mesh = ArrayMesh(0, records)
+
+  def test_interleaves_vertices_and_facet_normals(self):
+    data = get_buffer_data(self.mesh, 3)
+
+    self.assertEqual(len(data), 36)
+    self.assertTrue(np.array_equal(data['f0'][:, :3], self.mesh.triangles.reshape(-1, 3)))
+    self.assertTrue(np.array_equal(data['f0'][:, 3:], np.repeat(self.mesh.normals, 3, axis=0)))
+    self.assertTrue(np.all(data['f1'] == 3))
+
+  def test_spatial_mesh_matches_array_mesh(self):
+    self.assertTrue(np.array_equal(get_buffer_data(self.mesh.mesh), get_buffer_data(self.mesh)))
@@ -0,0 +1,65 @@
+import io, os, tempfile, threading, unittest
+
+import numpy as np
+
+from robot.visual.capture import FrameCapture, PNGSequence, RawVideo
+
+class TestFrameCapture(unittest.TestCase):
+  def test_sink_receives_frames_in_order(self):
+    received = []
+    capture = FrameCapture(lambda pixels, index: received.append((index, pixels[0, 0, 0])))
+
+    for index in range(5):
+      capture.enqueue(np.full((2, 3, 4), index, dtype=np.uint8), index)
+
+    capture.close()
+
+    self.assertEqual(received, [(index, index) for index in range(5)])
+    self.assertEqual(capture.stats, {'captured': 5, 'dropped': 0})
+
+  def test_drops_frames_when_sink_falls_behind(self):
+    release = threading.Event()
+    capture = FrameCapture(lambda pixels, index: release.wait(), queue_size=2)
+
+    # The writer thread takes at most one frame before blocking in the sink, so at most 3 frames are accepted
+    for index in range(6):
+      capture.enqueue(np.zeros((1, 1, 4), dtype=np.uint8), index)
+
+    release.set()
+    capture.close()
+
+    self.assertGreaterEqual(capture.stats['dropped'], 3)
+    self.assertEqual(capture.stats['captured'] + capture.stats['dropped'], 6)
+
+  def test_sink_errors_do_not_stop_capture(self):
+    received = []
+    def sink(pixels, index):
+      if index == 0:
+        raise ValueError
+      received.append(index)
+
+    capture = FrameCapture(sink)
+    for index in range(3):
+      capture.enqueue(np.zeros((1, 1, 4), dtype=np.uint8), index)
+
+    capture.close()
+
+    self.assertEqual(received, [1, 2])
+
+class TestSinks(unittest.TestCase):
+  def test_png_sequence(self):
+    with tempfile.TemporaryDirectory() as directory:
+      sink = PNGSequence(os.path.join(directory, 'frames'))
+      sink(np.zeros((2, 2, 4), dtype=np.uint8), 7)
+
+      self.assertEqual(os.listdir(sink.directory), ['frame_000007.png'])
+
+  def test_raw_video(self):
+    file = io.BytesIO()
+    sink = RawVideo(file)
+
+    frames = [np.full((2, 2, 4), value, dtype=np.uint8) for value in (1, 2)]
+    for index, pixels in enumerate(frames):
+      sink(pixels, index)
+
+    self.assertEqual(file.getvalue(), b''.join(pixels.tobytes() for pixels in frames))
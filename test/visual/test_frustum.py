@@ -0,0 +1,48 @@
+import math, unittest
+
+import numpy as np
+
+from spatial                 import Vector3
+from robot.visual            import Camera
+from robot.visual.frustum    import camera_frustum, frustum_planes, visible
+from robot.visual.projection import OrthoProjection, PerspectiveProjection
+
+def box(center, half_size):
+  center = np.asarray(center, dtype=float)
+  return np.array([center - half_size, center + half_size])
+
+class TestFrustum(unittest.TestCase):
+  def setUp(self):
+    # Looking down the world +y axis from y = -1000
+    projection = PerspectiveProjection(aspect=1, fov=math.radians(60), near_clip=100, far_clip=10000)
+    self.camera = Camera(Vector3(0, -1000, 0), Vector3(), Vector3(0, 0, 1), projection)
+
+  def test_identity_clip_matrix_is_ndc_cube(self):
+    planes = frustum_planes(np.eye(4))
+
+    self.assertEqual(visible(planes, np.array([box([0, 0, 0], 0.5)])).tolist(), [True])
+    self.assertEqual(visible(planes, np.array([box([2, 0, 0], 0.5)])).tolist(), [False])
+    self.assertEqual(visible(planes, np.array([box([1.2, 0, 0], 0.5)])).tolist(), [True])
+
+  def test_perspective_camera(self):
+    bounds = np.array([
+      box([0, 0, 0], 50),          # In front of the camera
+      box([0, -2000, 0], 50),      # Behind the camera
+      box([2000, 0, 0], 50),       # Right of the field of view
+      box([0, 0, -2000], 50),      # Below the field of view
+      box([0, 20000, 0], 50),      # Beyond the far plane
+      box([600, 0, 0], 100),       # Straddles the right plane (tan(30) * 1000 ~ 577)
+      box([0, -950, 0], 10),       # Closer than the near plane
+    ])
+
+    self.assertEqual(
+      visible(camera_frustum(self.camera), bounds).tolist(),
+      [True, False, False, False, False, True, False]
+    )
+
+  def test_orthographic_camera(self):
+    self.camera.projection = OrthoProjection(aspect=1, width=1000)
+
+    bounds = np.array([box([400, 0, 400], 50), box([700, 0, 0], 50), box([0, 2000, 0], 50)])
+
+    self.assertEqual(visible(camera_frustum(self.camera), bounds).tolist(), [True, False, True])
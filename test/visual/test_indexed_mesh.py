@@ -0,0 +1,40 @@
+import math, unittest
+
+import numpy as np
+
+from robot.visual.filetypes.indexed_mesh import weld
+from test.collision.test_occupancy       import cube
+
+class TestWeld(unittest.TestCase):
+  def test_cube_keeps_sharp_edges(self):
+    indexed = weld(cube(1))
+
+    # 8 corners with 3 face normals each
+    self.assertEqual(len(indexed.positions), 24)
+    self.assertTrue(np.allclose(indexed.positions[indexed.indices], cube(1)))
+
+    for position, normal in zip(indexed.positions, indexed.normals):
+      # Every normal is one of the axes and points away from the cube
+      self.assertAlmostEqual(np.abs(normal).max(), 1)
+      self.assertGreater(np.dot(position, normal), 0)
+
+  def test_large_crease_angle_smooths_corners(self):
+    indexed = weld(cube(1), crease_angle=math.radians(100))
+
+    self.assertEqual(len(indexed.positions), 8)
+    # Normals point diagonally away from the cube
+    self.assertTrue(np.all(np.sign(indexed.normals) == np.sign(indexed.positions)))
+
+  def test_tolerance_merges_nearby_corners(self):
+    triangles = np.array([
+      [[0, 0, 0], [1, 0, 0], [0, 1, 0]],
+      [[1 + 1e-6, 0, 0], [1, 1, 0], [0, 1 - 1e-6, 0]]
+    ])
+
+    self.assertEqual(len(weld(triangles, tolerance=1e-3).positions), 4)
+    self.assertEqual(len(weld(triangles, tolerance=1e-8).positions), 6)
+
+  def test_empty(self):
+    indexed = weld(np.zeros((0, 3, 3)))
+
+    self.assertEqual(indexed.indices.shape, (0, 3))
@@ -0,0 +1,34 @@
+import unittest
+
+from robot.visual.filetypes.lazy_mesh import LazyMesh, lazy_meshes
+from spatial                          import Mesh
+
+class TestLazyMesh(unittest.TestCase):
+  def setUp(self):
+    self.calls = 0
+
+  def loader(self) -> list:
+    self.calls += 1
+    return [Mesh('first'), Mesh('second')]
+
+  def test_loads_on_first_access_only(self):
+    mesh = LazyMesh(lambda: self.loader()[0])
+
+    self.assertFalse(mesh.is_loaded)
+    self.assertEqual(self.calls, 0)
+
+    self.assertEqual(mesh.name, 'first')
+    self.assertEqual(mesh.facets, [])
+
+    self.assertTrue(mesh.is_loaded)
+    self.assertEqual(self.calls, 1)
+
+  def test_lazy_meshes_share_one_load(self):
+    meshes = lazy_meshes(self.loader, 3)
+
+    self.assertEqual(self.calls, 0)
+    self.assertEqual([mesh.name for mesh in meshes[:2]], ['first', 'second'])
+    self.assertEqual(self.calls, 1)
+
+    # Past the end of the loaded meshes
+    self.assertEqual(meshes[2].facets, [])
@@ -0,0 +1,77 @@
+import math, os, tempfile, unittest
+
+import numpy as np
+
+from robot.visual.filetypes.array_mesh     import FACET_DTYPE, ArrayMesh
+from robot.visual.filetypes.lod            import MeshLODs, stable_levels
+from robot.visual.filetypes.mesh_cache     import MeshCache
+from robot.visual.filetypes.stl.stl_writer import STLWriter
+
+def sphere(radius: float, segments: int) -> ArrayMesh:
+  """Return a latitude/longitude tessellated sphere."""
+  theta = np.linspace(0, math.pi, segments + 1)
+  phi = np.linspace(0, 2 * math.pi, 2 * segments + 1)
+  t, p = np.meshgrid(theta, phi, indexing='ij')
+  points = radius * np.stack((np.sin(t) * np.cos(p), np.sin(t) * np.sin(p), np.cos(t)), axis=-1)
+
+  a, b = points[:-1, :-1], points[1:, :-1]
+  c, d = points[1:, 1:], points[:-1, 1:]
+  triangles = np.concatenate((np.stack((a, b, c), axis=2), np.stack((a, c, d), axis=2))).reshape(-1, 3, 3)
+
+  records = np.zeros(len(triangles), dtype=FACET_DTYPE)
+  records['vertices'] = triangles
+
+  return ArrayMesh(0, records)
+
+class TestMeshLODs(unittest.TestCase):
+  def setUp(self):
+    self.mesh = sphere(100, 40)
+    self.lods = MeshLODs.build(self.mesh, levels=3)
+
+  def test_levels_get_coarser(self):
+    counts = [len(level) for level in self.lods.levels]
+
+    self.assertIs(self.lods.levels[0], self.mesh)
+    self.assertGreater(len(counts), 2)
+    self.assertTrue(all(finer > coarser for finer, coarser in zip(counts, counts[1:])))
+    self.assertTrue(np.all(np.diff(self.lods.errors) > 0))
+
+  def test_vertices_stay_within_error(self):
+    for level, error in zip(self.lods.levels, self.lods.errors):
+      radii = np.linalg.norm(level.triangles.reshape(-1, 3), axis=1)
+
+      self.assertLessEqual(np.abs(radii - 100).max(), error + 1e-3)
+
+  def test_select_by_tolerance_and_screen_size(self):
+    self.assertEqual(self.lods.level(0), 0)
+    self.assertEqual(self.lods.level(self.lods.errors[1]), 1)
+    self.assertEqual(self.lods.level(np.inf), len(self.lods) - 1)
+
+    # Far away objects get coarser levels
+    near = self.lods.screen_level(distance=100, pixels_per_unit=1000)
+    far  = self.lods.screen_level(distance=100000, pixels_per_unit=1000)
+    self.assertLess(near, far)
+
+  def test_hysteresis(self):
+    errors = np.array([0, 10, 20, 40])
+
+    # Far from a switching point the tolerance alone chooses (the band is [tolerance / 1.25, tolerance * 1.25])
+    self.assertEqual(stable_levels(errors, [0, 3], [25, 25]).tolist(), [2, 2])
+    # Tolerances just past a switching point keep the current level
+    self.assertEqual(stable_levels(errors, [1, 2], [21, 19]).tolist(), [1, 2])
+    # Tolerances well past it switch
+    self.assertEqual(stable_levels(errors, [1, 2], [26, 15]).tolist(), [2, 1])
+
+  def test_cached_lods(self):
+    with tempfile.TemporaryDirectory() as directory:
+      file_path = os.path.join(directory, 'sphere.stl')
+      STLWriter(file_path).write([self.mesh])
+
+      cache = MeshCache(os.path.join(directory, 'cache'))
+      built, = cache.load_lods(file_path, levels=3)
+      cached, = cache.load_lods(file_path, levels=3)
+
+    self.assertEqual(cache.stats['hits'], 1)
+    self.assertTrue(np.allclose(cached.errors, built.errors))
+    for level, expected in zip(cached.levels, built.levels):
+      self.assertTrue(np.array_equal(level.records, expected.records))
@@ -0,0 +1,51 @@
+import os, tempfile, unittest
+
+import numpy as np
+
+from robot.visual.filetypes.mesh_cache import MeshCache
+from spatial                           import Transform, Vector3
+from .test_stl_parser                  import write_binary
+
+class TestMeshCache(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.file_path = os.path.join(self.directory.name, 'meshes.stl')
+    self.cache = MeshCache(os.path.join(self.directory.name, 'cache'))
+
+    triangle = [[0, 0, 0], [1, 0, 0], [0, 1, 0]]
+    write_binary(self.file_path, [((0, 0, 1), triangle, 0), ((0, 0, 1), triangle, 1)])
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def test_second_load_is_memory_mapped_hit(self):
+    parsed = self.cache.load(self.file_path)
+    cached = self.cache.load(self.file_path)
+
+    self.assertEqual(self.cache.stats, {'hits': 1, 'misses': 1})
+    self.assertEqual([mesh.name for mesh in cached], [0, 1])
+    self.assertIsInstance(cached[0].records.base, np.memmap)
+
+    for mesh, expected in zip(cached, parsed):
+      self.assertTrue(np.array_equal(mesh.records, expected.records))
+      self.assertTrue(np.allclose(mesh.bounds[1], [1, 1, 0]))
+
+  def test_changed_source_misses(self):
+    self.cache.load(self.file_path)
+
+    write_binary(self.file_path, [((0, 0, 1), [[0, 0, 0], [2, 0, 0], [0, 2, 0]], 0)])
+    meshes = self.cache.load(self.file_path)
+
+    self.assertEqual(self.cache.stats['misses'], 2)
+    self.assertTrue(np.allclose(meshes[0].triangles[0, 1], [2, 0, 0]))
+
+  def test_processing_parameters_are_part_of_the_key(self):
+    transform = Transform.from_axis_angle_translation(translation=Vector3(0, 0, 5))
+
+    self.cache.load(self.file_path)
+    moved = self.cache.load(self.file_path, scale=2, transform=transform)
+    cached = self.cache.load(self.file_path, scale=2, transform=transform)
+
+    self.assertEqual(self.cache.stats, {'hits': 1, 'misses': 2})
+    self.assertTrue(np.allclose(cached[0].triangles[0], [[0, 0, 5], [2, 0, 5], [0, 2, 5]]))
+    self.assertTrue(np.array_equal(cached[0].records, moved[0].records))
@@ -0,0 +1,53 @@
+import os, tempfile, unittest
+
+import numpy as np
+
+from robot.visual.filetypes.mesh_loader import MeshLoader, MeshSource
+from .test_stl_parser                   import write_binary
+
+class TestMeshLoader(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.cache_directory = os.path.join(self.directory.name, 'cache')
+
+    triangle = [[0, 0, 0], [1, 0, 0], [0, 1, 0]]
+
+    self.file_paths = []
+    for index in range(4):
+      file_path = os.path.join(self.directory.name, f'{index}.stl')
+      write_binary(file_path, [((0, 0, 1), np.add(triangle, index), 0)])
+      self.file_paths.append(file_path)
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def test_load_keeps_source_order(self):
+    with MeshLoader(max_workers=3, cache_directory=self.cache_directory) as loader:
+      results = loader.load(self.file_paths)
+
+    for index, (mesh,) in enumerate(results):
+      self.assertTrue(np.allclose(mesh.triangles[0, 0], [index] * 3))
+
+  def test_as_completed_yields_every_source(self):
+    sources = [MeshSource(file_path, scale=2) for file_path in self.file_paths]
+
+    with MeshLoader(cache_directory=self.cache_directory) as loader:
+      completed = dict(loader.as_completed(sources))
+
+    self.assertEqual(set(completed), set(sources))
+    for source, (mesh,) in completed.items():
+      index = self.file_paths.index(source.file_path)
+      self.assertTrue(np.allclose(mesh.triangles[0, 0], [2 * index] * 3))
+
+  def test_process_pool(self):
+    with MeshLoader(max_workers=2, processes=True, cache_directory=self.cache_directory) as loader:
+      (mesh,), = loader.load(self.file_paths[1:2])
+
+    self.assertTrue(np.allclose(mesh.triangles[0, 0], [1, 1, 1]))
+
+  def test_submit_lods_starts_with_the_original_mesh(self):
+    with MeshLoader(cache_directory=self.cache_directory) as loader:
+      chain, = loader.submit_lods(self.file_paths[2]).result()
+
+    self.assertEqual(chain.errors[0], 0)
+    self.assertTrue(np.allclose(chain.levels[0].triangles[0, 0], [2, 2, 2]))
@@ -0,0 +1,79 @@
+import json, os, tempfile, unittest
+
+import numpy as np
+
+from robot.collision.proxy               import Proxy
+from robot.mech                          import Serial
+from robot.visual.filetypes.array_mesh   import FACET_DTYPE, ArrayMesh
+from robot.visual.filetypes.packed_model import PackedModel, mass_properties, pack_model
+from test.collision.test_occupancy       import cube
+from test.visual.test_lod                import sphere
+
+def cube_mesh(name, offset) -> ArrayMesh:
+  records = np.zeros(12, dtype=FACET_DTYPE)
+  records['vertices'] = cube(1) + offset
+
+  return ArrayMesh(name, records, color=[0.5, 0.25, 1])
+
+class TestPackedModel(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.file_path = os.path.join(self.directory.name, 'model.pack')
+
+    self.meshes = [cube_mesh(0, [3, 0, 0]), sphere(10, 16)]
+    self.proxies = [Proxy.fit(mesh.triangles) for mesh in self.meshes]
+
+    pack_model(self.file_path, {'name': 'Test'}, self.meshes, [self.proxies[0]], lod_levels=2)
+    self.packed = PackedModel(self.file_path)
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def test_round_trip(self):
+    self.assertEqual(self.packed.model, {'name': 'Test'})
+    self.assertEqual(len(self.packed), 2)
+
+    mesh = self.packed.mesh(0)
+    self.assertEqual(mesh.color, [0.5, 0.25, 1])
+    self.assertTrue(np.allclose(np.sort(mesh.triangles.reshape(-1, 9), axis=0), np.sort(self.meshes[0].triangles.reshape(-1, 9), axis=0)))
+
+  def test_arrays_are_aligned_views_of_the_file(self):
+    indexed = self.packed.indexed(1)
+
+    self.assertIsInstance(indexed.positions, np.memmap)
+    self.assertFalse(indexed.positions.flags.writeable)
+    for array in indexed:
+      self.assertEqual((array.ctypes.data - self.packed.buffer.ctypes.data) % 64, 0)
+
+  def test_proxies(self):
+    first, second = self.packed.proxies()
+
+    self.assertTrue(np.allclose(first.capsule.start, self.proxies[0].capsule.start))
+    self.assertTrue(np.allclose(first.box.axes, self.proxies[0].box.axes))
+    self.assertIsNone(second)
+
+  def test_properties(self):
+    properties = self.packed.properties()
+
+    self.assertAlmostEqual(properties[0]['volume'], 8)
+    self.assertTrue(np.allclose(properties[0]['com'], [3, 0, 0]))
+    self.assertEqual(mass_properties(np.zeros((0, 3, 3)))['volume'], 0)
+
+  def test_lods(self):
+    lods = self.packed.lods(1)
+
+    self.assertGreater(len(lods), 1)
+    self.assertLess(len(lods.levels[-1]), len(self.meshes[1]))
+
+  def test_serial_from_packed(self):
+    with open('./robot/mech/robots/abb_irb_120.json') as json_file:
+      serial_dictionary = json.load(json_file)
+
+    pack_model(self.file_path, serial_dictionary, [cube_mesh(index, [0, 0, 0]) for index in range(len(serial_dictionary['links']))])
+
+    serial = Serial.from_dict_meshes(PackedModel(self.file_path))
+
+    self.assertEqual(len(serial.links), len(serial_dictionary['links']))
+    self.assertEqual(len(serial.links[1].mesh), 12)
+    self.assertAlmostEqual(serial.links[0].properties.volume, 8)
+    self.assertIsNone(serial.links[0].lods)
@@ -0,0 +1,105 @@
+import os, tempfile, unittest
+
+import numpy as np
+
+from robot.visual.exceptions                import ParserError
+from robot.visual.filetypes.array_mesh      import FACET_DTYPE, ArrayMesh
+from robot.visual.filetypes.mesh_cache      import MeshCache
+from robot.visual.filetypes.ply.ply_parser import PLYParser
+from robot.visual.filetypes.ply.ply_writer import PLYWriter
+from test.collision.test_occupancy          import cube
+
+def write_quads(file_path, byte_order='<', format_name='binary_little_endian'):
+  """Write a unit square as one quad with an extra per-face property."""
+  header = '\n'.join([
+    'ply',
+    f'format {format_name} 1.0',
+    'comment A quad',
+    'element vertex 4',
+    'property float x', 'property float y', 'property float z',
+    'element face 1',
+    'property uchar flags',
+    'property list uchar int vertex_indices',
+    'end_header', ''
+  ])
+
+  positions = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=byte_order + 'f4')
+  face = np.array([(7, 4, [0, 1, 2, 3])], dtype=[('flags', 'u1'), ('count', 'u1'), ('indices', byte_order + 'i4', (4,))])
+
+  with open(file_path, 'wb') as file:
+    file.write(header.encode('ascii') + positions.tobytes() + face.tobytes())
+
+class TestPLY(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.file_path = os.path.join(self.directory.name, 'test.ply')
+    self.parser = PLYParser()
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def test_round_trip_meshes(self):
+    records = np.zeros(12, dtype=FACET_DTYPE)
+    records['vertices'] = cube(1)
+
+    PLYWriter(self.file_path).write([ArrayMesh(0, records)])
+
+    meshes = self.parser.parse(self.file_path)
+
+    self.assertEqual(len(meshes), 1)
+    self.assertEqual(len(meshes[0]), 12)
+    self.assertEqual(self.parser.stats['vertices'], 8)
+    self.assertTrue(np.allclose(meshes[0].triangles, cube(1)))
+
+    # Facet normals point away from the cube
+    centers = meshes[0].triangles.mean(axis=1)
+    self.assertTrue(np.all(np.einsum('ij,ij->i', centers, meshes[0].normals) > 0))
+
+  def test_round_trip_points_with_colors(self):
+    positions = np.random.default_rng(0).random((1000, 3)).astype(np.float32)
+    colors = np.arange(3000).reshape(-1, 3) % 256
+
+    PLYWriter(self.file_path).write_points(positions, colors=colors)
+
+    data = self.parser.read(self.file_path)
+
+    self.assertTrue(np.array_equal(self.parser.parse_points(self.file_path), positions))
+    self.assertTrue(np.array_equal(data.colors, colors))
+    self.assertIsNone(data.normals)
+    self.assertEqual(data.indices.shape, (0, 3))
+
+  def test_quads_are_triangulated(self):
+    for byte_order, format_name in (('<', 'binary_little_endian'), ('>', 'binary_big_endian')):
+      with self.subTest(format_name):
+        write_quads(self.file_path, byte_order, format_name)
+
+        indexed = self.parser.parse_indexed(self.file_path)
+
+        self.assertEqual(indexed.indices.tolist(), [[0, 1, 2], [0, 2, 3]])
+        self.assertTrue(np.allclose(indexed.positions[3], [0, 1, 0]))
+
+  def test_mixed_polygons(self):
+    PLYWriter(self.file_path).write_indexed(np.eye(3), [[0, 1, 2]])
+
+    # Append a quad to the face element by rewriting the file's face count and data
+    with open(self.file_path, 'rb') as file:
+      contents = file.read().replace(b'element face 1', b'element face 2')
+
+    quad = np.array([(4, [2, 1, 0, 1])], dtype=[('count', 'u1'), ('indices', '<u4', (4,))])
+    with open(self.file_path, 'wb') as file:
+      file.write(contents + quad.tobytes())
+
+    self.assertEqual(self.parser.parse_indexed(self.file_path).indices.tolist(), [[0, 1, 2], [2, 1, 0], [2, 0, 1]])
+
+  def test_ascii_is_not_supported(self):
+    write_quads(self.file_path, format_name='ascii')
+
+    with self.assertRaises(ParserError):
+      self.parser.read(self.file_path)
+
+  def test_mesh_cache_loads_ply(self):
+    write_quads(self.file_path)
+
+    meshes = MeshCache(os.path.join(self.directory.name, 'cache')).load(self.file_path)
+
+    self.assertEqual(len(meshes[0]), 2)
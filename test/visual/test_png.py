@@ -0,0 +1,49 @@
+import os, struct, tempfile, unittest, zlib
+
+import numpy as np
+
+from robot.visual.filetypes.png import PNG_SIGNATURE, write_png
+
+def read_png(file_path):
+  """Return the IHDR fields and the unfiltered rows of a PNG written by write_png."""
+  with open(file_path, 'rb') as file:
+    contents = file.read()
+
+  assert contents.startswith(PNG_SIGNATURE)
+
+  chunks, position = {}, len(PNG_SIGNATURE)
+  while position < len(contents):
+    length, chunk_type = struct.unpack('>I4s', contents[position:position + 8])
+    data = contents[position + 8:position + 8 + length]
+    crc, = struct.unpack('>I', contents[position + 8 + length:position + 12 + length])
+
+    assert crc == zlib.crc32(chunk_type + data)
+    chunks[chunk_type] = data
+    position += 12 + length
+
+  return struct.unpack('>IIBBBBB', chunks[b'IHDR']), zlib.decompress(chunks[b'IDAT'])
+
+class TestWritePNG(unittest.TestCase):
+  def test_rgba(self):
+    pixels = np.arange(2 * 3 * 4, dtype=np.uint8).reshape(2, 3, 4)
+
+    with tempfile.TemporaryDirectory() as directory:
+      file_path = os.path.join(directory, 'frame.png')
+      write_png(file_path, pixels)
+
+      (width, height, depth, color_type, *_), data = read_png(file_path)
+
+    self.assertEqual((width, height, depth, color_type), (3, 2, 8, 6))
+
+    rows = np.frombuffer(data, dtype=np.uint8).reshape(2, -1)
+    self.assertTrue(np.all(rows[:, 0] == 0))
+    self.assertTrue(np.array_equal(rows[:, 1:].reshape(2, 3, 4), pixels))
+
+  def test_grayscale(self):
+    with tempfile.TemporaryDirectory() as directory:
+      file_path = os.path.join(directory, 'frame.png')
+      write_png(file_path, np.zeros((4, 5)))
+
+      (width, height, _, color_type, *_), data = read_png(file_path)
+
+    self.assertEqual((width, height, color_type, len(data)), (5, 4, 0, 4 * 6))
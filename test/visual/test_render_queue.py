@@ -0,0 +1,129 @@
+import math, unittest
+
+from types         import SimpleNamespace
+from unittest.mock import MagicMock, call, patch
+
+from robot.visual.render_queue import RenderQueue, packet_key
+from robot.visual.renderer     import Entity
+
+def entity(name, program, vao, transparent=False, instanced=False):
+  return Entity(
+    name           = name,
+    shader         = SimpleNamespace(id=program, uniforms=SimpleNamespace()),
+    draw_mode      = 0,
+    buffer         = MagicMock(vao=vao),
+    instances      = [],
+    per_instance   = MagicMock(),
+    add_children   = None,
+    pack_instances = MagicMock() if instanced else None,
+    transparent    = transparent
+  )
+
+def pairs(*names):
+  return [(name, {}) for name in names]
+
+class TestRenderQueue(unittest.TestCase):
+  def setUp(self):
+    self.queue = RenderQueue()
+
+  def submit(self, instance_buffers=None):
+    with patch('robot.visual.render_queue.glUseProgram'), patch('robot.visual.render_queue.glBindVertexArray'), \
+         patch('robot.visual.render_queue.glEnable'), patch('robot.visual.render_queue.glDisable'), \
+         patch('robot.visual.render_queue.glDepthMask'):
+      self.queue.submit(instance_buffers or {})
+
+    return [(packet.entity.name, [instance for instance, _ in packet.instances]) for packet in self.queue.packets]
+
+  def test_opaque_packets_are_grouped_by_state_and_front_to_back(self):
+    frame      = entity('frame', 2, 20)
+    trajectory = entity('trajectory', 2, 30)
+    serial     = entity('serial', 1, 10)
+
+    self.queue.add(frame, pairs('f0', 'f1'), [5, 1])
+    self.queue.add(serial, pairs('s0'), [3])
+    self.queue.add(trajectory, pairs('t0'))
+    self.queue.add(frame, pairs('f2'), [0])
+
+    self.assertEqual(self.submit(), [('serial', ['s0']), ('frame', ['f2']), ('frame', ['f1']), ('frame', ['f0']), ('trajectory', ['t0'])])
+    self.assertEqual(self.queue.stats, {'packets': 5, 'program_binds': 2, 'vao_binds': 3, 'blend_changes': 1, 'instance_uploads': 0, 'triangles': 0})
+
+  def test_transparent_packets_are_last_and_back_to_front(self):
+    opaque = entity('opaque', 1, 10)
+    glass  = entity('glass', 1, 10, transparent=True)
+    grid   = entity('grid', 3, 30, transparent=True)
+
+    self.queue.add(glass, pairs('near', 'far'), [1, 10])
+    self.queue.add(grid, pairs('grid'))
+    self.queue.add(opaque, pairs('o'), [20])
+
+    self.assertEqual(self.submit(), [('opaque', ['o']), ('grid', ['grid']), ('glass', ['far']), ('glass', ['near'])])
+    self.assertEqual(self.queue.stats['blend_changes'], 2)
+
+  def test_transparent_packets_at_equal_depths_keep_registration_order(self):
+    grid   = entity('grid', 3, 30, transparent=True)
+    marker = entity('marker', 1, 10, transparent=True)
+
+    self.queue.add(grid, pairs('g0'))
+    self.queue.add(marker, pairs('m0', 'm1'))
+    self.queue.add(grid, pairs('g1'))
+
+    self.assertEqual(self.submit(), [('grid', ['g0']), ('marker', ['m0']), ('marker', ['m1']), ('grid', ['g1'])])
+
+  def test_instanced_entity_is_one_packet(self):
+    serial = entity('serial', 1, 10, instanced=True)
+    instance_buffers = {'serial': MagicMock()}
+
+    self.queue.add(serial, pairs('a', 'b', 'c'), [3, 1, 2])
+    self.assertEqual(self.submit(instance_buffers), [('serial', ['a', 'b', 'c'])])
+
+    serial.pack_instances.assert_called_once()
+    instance_buffers['serial'].load.assert_called_once()
+    serial.buffer.draw.assert_called_once_with(0, 3, 0, 0)
+
+  def test_instanced_entity_draws_each_level_once(self):
+    serial = entity('serial', 1, 10, instanced=True)
+    instance_buffers = {'serial': MagicMock()}
+
+    self.queue.add(serial, pairs('a', 'b', 'c', 'd'), [3, 1, 2, 4], [2, 0, 2, 1])
+    self.assertEqual(self.submit(instance_buffers), [('serial', ['b']), ('serial', ['a', 'c']), ('serial', ['d'])])
+
+    self.assertEqual([packet.level for packet in self.queue.packets], [0, 2, 1])
+    self.assertEqual(self.queue.stats['program_binds'], 1)
+
+    with self.subTest('All levels are packed and uploaded once, ordered by level'):
+      serial.pack_instances.assert_called_once_with(pairs('b', 'd', 'a', 'c'))
+      instance_buffers['serial'].load.assert_called_once()
+      self.assertEqual(self.queue.stats['instance_uploads'], 1)
+
+    with self.subTest('Each level draws its range of the packed instances'):
+      self.assertEqual(serial.buffer.draw.call_args_list, [call(0, 1, 0, 0), call(0, 2, 2, 2), call(0, 1, 1, 1)])
+
+  def test_instance_buffers_are_bound_again_after_another_entity(self):
+    serial = entity('serial', 1, 10, instanced=True)
+    other  = entity('other', 1, 10, instanced=True)
+    instance_buffers = {'serial': MagicMock(), 'other': MagicMock()}
+
+    self.queue.add(serial, pairs('near', 'far'), [1, 9], [0, 1])
+    self.queue.add(other, pairs('middle'), [5])
+    self.submit(instance_buffers)
+
+    # Front-to-back within the program and VAO: serial level 0, other, then serial level 1
+    self.assertEqual([packet.entity.name for packet in self.queue.packets], ['serial', 'other', 'serial'])
+    instance_buffers['serial'].load.assert_called_once()
+    instance_buffers['serial'].bind.assert_called_once()
+
+  def test_per_instance_uniforms_are_set_before_each_draw(self):
+    frame = entity('frame', 2, 20)
+    self.queue.add(frame, [('f0', {'scale': 15})])
+    self.submit()
+
+    frame.per_instance.assert_called_once_with('f0', frame.shader, scale=15)
+    frame.buffer.draw.assert_called_once_with(0, level=0)
+
+  def test_key_without_depth_sorts_as_farthest(self):
+    self.assertLess(packet_key(False, 1, 1, 5), packet_key(False, 1, 1, math.inf))
+    self.assertLess(packet_key(True, 1, 1, math.inf), packet_key(True, 1, 1, 5))
+
+  def test_sequence_breaks_ties_before_state(self):
+    self.assertLess(packet_key(True, 9, 9, 5, 0), packet_key(True, 1, 1, 5, 1))
+    self.assertLess(packet_key(False, 1, 1, 5, 1), packet_key(False, 9, 9, 5, 0))
@@ -0,0 +1,40 @@
+import math, unittest
+
+import numpy as np
+
+from types         import SimpleNamespace
+from unittest.mock import MagicMock
+
+from spatial                 import Vector3
+from robot.visual            import Camera
+from robot.visual.projection import PerspectiveProjection
+from robot.visual.renderer   import Entity, Renderer
+
+def lod_entity():
+  buffer = MagicMock(lod_errors=np.array([0, 10, 20, 40], dtype=float))
+
+  return Entity('serial', None, 0, buffer, [], None, None, MagicMock(), True)
+
+class TestDetailLevels(unittest.TestCase):
+  def setUp(self):
+    projection = PerspectiveProjection(aspect=1, fov=math.radians(90), near_clip=1, far_clip=100000)
+    camera = Camera(Vector3(0, -1000, 0), Vector3(), Vector3(0, 0, 1), projection)
+
+    self.renderer = Renderer(camera, SimpleNamespace())
+    self.renderer.viewport = (100, 100)
+    self.entity = lod_entity()
+
+  def levels(self, instances, depths):
+    bounds = np.zeros((len(instances), 2, 3))
+
+    return self.renderer.detail_levels(self.entity, instances, bounds, np.array(depths, dtype=float)).tolist()
+
+  def test_only_this_frames_instances_are_remembered(self):
+    near, far = object(), object()
+
+    self.assertEqual(self.levels([(near, {}), (far, {})], [100, 100000]), [0, 3])
+    self.assertEqual(self.renderer.lod_levels, {'serial': {id(near): 0, id(far): 3}})
+
+    # `far` is culled (or removed) so its level is dropped
+    self.levels([(near, {})], [100])
+    self.assertEqual(self.renderer.lod_levels, {'serial': {id(near): 0}})
@@ -0,0 +1,238 @@
+import os, struct, tempfile, unittest
+
+import numpy as np
+
+from robot.visual.exceptions               import ParserError, STLFloatError, STLNotATriangle, STLStateError
+from robot.visual.filetypes.array_mesh     import FACET_DTYPE, ArrayMesh, split_records
+from robot.visual.filetypes.stl.stl_parser import STLParser, WarningType
+from robot.visual.filetypes.stl.stl_type   import STLType
+from robot.visual.filetypes.stl.stl_writer import STLWriter
+from spatial                               import Transform, Vector3
+
+def write_binary(file_path: str, facets: list) -> None:
+  """Write (normal, vertices, attribute) facets to a binary STL file."""
+  with open(file_path, 'wb') as file:
+    file.write(bytes(80))
+    file.write(struct.pack('<I', len(facets)))
+
+    for normal, vertices, attribute in facets:
+      file.write(struct.pack('<fff fff fff fff H', *normal, *np.ravel(vertices), attribute))
+
+class TestBinarySTLParser(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.file_path = os.path.join(self.directory.name, 'meshes.stl')
+
+    triangle = [[0, 0, 0], [1, 0, 0], [0, 1, 0]]
+    self.facets = [
+      ((0, 0, 1), triangle, 0),
+      ((0, 0, 1), np.add(triangle, 1), 0),
+      ((0, 0, -1), np.add(triangle, 2), 1),
+    ]
+
+    write_binary(self.file_path, self.facets)
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def test_splits_meshes_by_attribute(self):
+    meshes = STLParser().parse(self.file_path)
+
+    self.assertEqual([mesh.name for mesh in meshes], [0, 1])
+    self.assertEqual([len(mesh.records) for mesh in meshes], [2, 1])
+
+    self.assertTrue(np.allclose(meshes[1].triangles[0], self.facets[2][1]))
+    self.assertTrue(np.allclose(meshes[1].normals[0], [0, 0, -1]))
+
+  def test_facets_are_constructed_lazily(self):
+    mesh, _ = STLParser().parse(self.file_path)
+
+    self.assertIsNone(mesh._mesh)
+
+    facets = mesh.facets
+
+    self.assertEqual(len(facets), 2)
+    self.assertEqual(facets[1].vertices[2], Vector3(1, 2, 1))
+
+  def test_empty_file_has_one_empty_mesh(self):
+    write_binary(self.file_path, [])
+
+    meshes = STLParser().parse(self.file_path)
+
+    self.assertEqual(len(meshes), 1)
+    self.assertEqual(len(meshes[0].records), 0)
+
+class TestArrayMesh(unittest.TestCase):
+  def setUp(self):
+    records = np.zeros(2, dtype=FACET_DTYPE)
+    records['vertices'] = [[[0, 0, 0], [2, 0, 0], [0, 2, 0]], [[0, 0, 0], [0, 2, 0], [0, 0, 2]]]
+    records['normal'] = [[0, 0, 1], [1, 0, 0]]
+
+    self.mesh = ArrayMesh('mesh', records)
+
+  def test_scale_and_transform_copy_records(self):
+    transform = Transform.from_axis_angle_translation(translation=Vector3(1, 2, 3))
+
+    moved = self.mesh.scale(0.5).transform(transform)
+
+    self.assertTrue(np.allclose(moved.triangles[0], [[1, 2, 3], [2, 2, 3], [1, 3, 3]]))
+    self.assertTrue(np.allclose(moved.normals, self.mesh.normals))
+    self.assertTrue(np.allclose(self.mesh.triangles[0, 1], [2, 0, 0]))
+
+  def test_split_records_keeps_leading_mesh_zero(self):
+    self.mesh.records['attribute'] = 3
+
+    meshes = split_records(self.mesh.records)
+
+    self.assertEqual([mesh.name for mesh in meshes], [0, 3])
+    self.assertEqual(len(meshes[0].records), 0)
+
+ASCII_STL = '''solid first
+  color 0.5 0.25 1
+  facet normal 0 0 1
+    outer loop
+      vertex 0 0 0
+      vertex 1 0 0
+      vertex 0 1 0
+    endloop
+  endfacet
+  facet normal 0 0 -1
+    outer loop
+      vertex 1.5e1 0 0
+      vertex 0 -1 0
+      vertex 0 0 0
+    endloop
+  endfacet
+endsolid first
+SOLID Second
+  facet normal 1 0 0
+    outer loop
+      vertex 0 0 0
+      vertex 0 1 0
+      vertex 0 0 1
+    endloop
+  endfacet
+endsolid second
+'''
+
+class TestASCIISTLParser(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.file_path = os.path.join(self.directory.name, 'meshes.stl')
+
+    self.write(ASCII_STL)
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def write(self, contents: str) -> None:
+    with open(self.file_path, 'w') as file:
+      file.write(contents)
+
+  def test_parses_solids_into_array_meshes(self):
+    parser = STLParser()
+    first, second = parser.parse(self.file_path)
+
+    self.assertEqual((first.name, second.name), ('first', 'second'))
+    self.assertEqual(first.color, [0.5, 0.25, 1])
+    self.assertTrue(np.allclose(first.triangles[1, 0], [15, 0, 0]))
+    self.assertTrue(np.allclose(second.normals, [[1, 0, 0]]))
+    self.assertEqual(second.records['attribute'].tolist(), [1])
+    self.assertEqual(parser.stats['facets'], 3)
+
+  def test_small_chunks_match_one_chunk(self):
+    expected = STLParser().parse(self.file_path)
+
+    parser = STLParser()
+    parser.CHUNK_SIZE = 7
+    meshes = parser.parse(self.file_path)
+
+    for mesh, expected_mesh in zip(meshes, expected):
+      self.assertTrue(np.array_equal(mesh.records, expected_mesh.records))
+
+  def test_warnings_path_matches_bulk_path(self):
+    expected = STLParser().parse(self.file_path)
+    meshes = STLParser(warnings=True).parse(self.file_path)
+
+    for mesh, expected_mesh in zip(meshes, expected):
+      self.assertTrue(np.array_equal(mesh.records, expected_mesh.records))
+
+  def test_warnings(self):
+    self.write(ASCII_STL.replace('normal 0 0 -1', 'normal 0 0 -2').replace('endsolid second', 'endsolid other'))
+
+    parser = STLParser(warnings=True)
+    parser.parse(self.file_path)
+
+    self.assertIn(WarningType.NON_UNIT_NORMAL, parser.warnings)
+    self.assertIn(WarningType.END_SOLID_NAME_MISMATCH, parser.warnings)
+
+  def test_errors(self):
+    second_facet = '  facet normal 0 0 -1\n    outer loop\n'
+
+    cases = [
+      (STLNotATriangle, ASCII_STL.replace('      vertex 0 1 0\n    endloop', '    endloop', 1)),
+      (STLFloatError,   ASCII_STL.replace('vertex 1 0 0', 'vertex 1 zero 0')),
+      (ParserError,     ASCII_STL.replace('endloop', 'endlop', 1)),
+      (STLStateError,   ASCII_STL.replace('endsolid second\n', '')),
+      # The first facet has no `outer loop` and the second has two `endloop`s (the keyword counts still match)
+      (STLStateError,   ASCII_STL.replace('    outer loop\n', '', 1).replace(second_facet, second_facet.replace('outer loop', 'endloop'), 1)),
+      (STLStateError,   ASCII_STL.replace('  color 0.5 0.25 1\n', '').replace('      vertex 1 0 0\n', '      vertex 1 0 0\n  color 1 1 1\n', 1)),
+    ]
+
+    for error, contents in cases:
+      lines = set()
+      for warnings in (False, True):
+        with self.subTest(error=error.__name__, warnings=warnings):
+          self.write(contents)
+
+          with self.assertRaises(error) as context:
+            STLParser(warnings=warnings).parse(self.file_path)
+
+          lines.add(context.exception.line)
+
+      if error is STLStateError:
+        with self.subTest('Both paths report the same line', contents=contents):
+          self.assertEqual(len(lines), 1)
+
+  def test_loop_keyword_is_optional(self):
+    self.write(ASCII_STL.replace('outer loop', 'outer'))
+
+    for warnings in (False, True):
+      with self.subTest(warnings=warnings):
+        first, second = STLParser(warnings=warnings).parse(self.file_path)
+        self.assertEqual((len(first.records), len(second.records)), (2, 1))
+
+class TestSTLWriter(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+
+    triangle = [[0, 0, 0], [1, 0, 0], [0, 1, 0]]
+    file_path = os.path.join(self.directory.name, 'source.stl')
+    write_binary(file_path, [((0, 0, 1), triangle, 0), ((0, 0, 1), np.add(triangle, 1), 0), ((0, 0, -1), triangle, 1)])
+
+    self.meshes = STLParser().parse(file_path)
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def test_round_trip(self):
+    for file_type in STLType:
+      with self.subTest(file_type=file_type):
+        file_path = os.path.join(self.directory.name, f'{file_type}.stl')
+
+        STLWriter(file_path, file_type).write(self.meshes)
+        meshes = STLParser().parse(file_path)
+
+        self.assertEqual(len(meshes), 2)
+        for mesh, expected in zip(meshes, self.meshes):
+          self.assertTrue(np.allclose(mesh.triangles, expected.triangles))
+          self.assertTrue(np.allclose(mesh.normals, expected.normals))
+          self.assertTrue(np.array_equal(mesh.records['attribute'], expected.records['attribute']))
+
+  def test_writes_spatial_meshes(self):
+    file_path = os.path.join(self.directory.name, 'facets.stl')
+
+    STLWriter(file_path).write([mesh.mesh for mesh in self.meshes])
+    meshes = STLParser().parse(file_path)
+
+    self.assertTrue(np.allclose(meshes[1].triangles, self.meshes[1].triangles))
@@ -0,0 +1,37 @@
+import unittest
+
+from robot.visual.opengl         import decorators
+from robot.visual.opengl.uniform import Uniform
+from spatial                     import Matrix4
+
+class TestUniform(unittest.TestCase):
+  def setUp(self):
+    self.calls = []
+
+    def record(location, count, *args):
+      self.calls.append((location, count, args[-1].tolist()))
+
+    self.matrix = Uniform('scale_matrix', 3, decorators.matrix(record, 4)(1))
+    self.floats = Uniform('radius', 4, decorators.primative(record, float)(2))
+
+  def test_unchanged_values_are_not_uploaded(self):
+    for _ in range(3):
+      self.matrix.value = Matrix4([2, 0, 0, 0, 0, 2, 0, 0, 0, 0, 2, 0, 0, 0, 0, 1])
+
+    self.assertEqual(len(self.calls), 1)
+    self.assertEqual(self.calls[0][:2], (3, 1))
+    self.assertEqual(self.matrix.stats, {'uploads': 1, 'skipped': 2})
+
+  def test_changed_values_are_uploaded(self):
+    self.floats.value = [1., 2.]
+    self.floats.value = [1., 3.]
+    self.floats.value = [1., 3.]
+
+    self.assertEqual([call[2] for call in self.calls], [[1, 2], [1, 3]])
+    self.assertEqual(self.floats.stats, {'uploads': 2, 'skipped': 1})
+
+  def test_invalid_values_are_not_uploaded(self):
+    with self.assertLogs(level='ERROR'):
+      self.floats.value = [1.]
+
+    self.assertEqual(self.calls, [])
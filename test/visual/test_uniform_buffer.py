@@ -0,0 +1,43 @@
+import unittest
+
+from types         import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+from robot.visual.opengl.uniform_buffer import Mapping, UniformBuffer
+from spatial                            import Vector3
+
+class TestUniformBuffer(unittest.TestCase):
+  def setUp(self):
+    with patch('robot.visual.opengl.uniform_buffer.glGenBuffers'), patch('robot.visual.opengl.uniform_buffer.glBindBufferBase'):
+      self.ubo = UniformBuffer('Light', 2)
+
+    self.light = SimpleNamespace(position=Vector3(1, 2, 3), color=SimpleNamespace(rgb=Vector3(4, 5, 6)), intensity=0.5)
+    self.ubo.bind(Mapping(self.light, ['position', 'color.rgb', 'intensity']))
+
+  def test_std140_layout(self):
+    self.assertEqual(self.ubo.offsets, [0, 4, 7])
+    self.assertEqual(len(self.ubo.staging), 8)
+
+    self.assertEqual(self.ubo.stage(), (0, 8))
+    self.assertEqual(self.ubo.staging.tolist(), [1, 2, 3, 0, 4, 5, 6, 0.5])
+
+  def test_only_changed_fields_are_uploaded(self):
+    with patch('robot.visual.opengl.uniform_buffer.glBufferData') as buffer_data, \
+         patch('robot.visual.opengl.uniform_buffer.glBufferSubData') as buffer_sub_data, \
+         patch('robot.visual.opengl.uniform_buffer.glBindBuffer'):
+      self.ubo.load()
+      self.ubo.load()
+
+      self.light.color.rgb = Vector3(0, 0, 1)
+      self.ubo.load()
+
+    buffer_data.assert_called_once()
+
+    # Floats 4 to 7 (the color) in bytes
+    (_, offset, size, data), _ = buffer_sub_data.call_args
+    self.assertEqual((offset, size), (16, 12))
+    self.assertTrue(np.array_equal(data, [0, 0, 1]))
+
+    self.assertEqual(self.ubo.stats, {'uploads': 2, 'skipped': 1})